@@ -232,8 +232,15 @@ function onAssignmentLocked(_e, data: IWebsocketMessageData['ITEM_LOCKED']) {
  * @param {object} _e - Event object
  * @param {object} data - Planning and User IDs
  */
-function onAssignmentUnlocked(_e, data: IWebsocketMessageData['ITEM_UNLOCKED']) {
+function onAssignmentUnlocked(
+    _e,
+    data: IWebsocketMessageData['ITEM_UNLOCKED'] | IWebsocketMessageData['ITEMS_UNLOCKED']
+) {
     return (dispatch, getState) => {
+        if (data != null && 'items' in data) {
+            return Promise.all(data.items.map((item) => dispatch(onAssignmentUnlocked(_e, item))));
+        }
+
         if (get(data, 'item')) {
             planningApi.locks.setItemAsUnlocked(data);
             return dispatch(assignments.api.fetchAssignmentById(data.item, false))
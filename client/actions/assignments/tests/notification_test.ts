@@ -308,6 +308,30 @@ describe('actions.assignments.notification', () => {
                 })
                 .catch(done.fail);
         });
+
+        it('calls UNLOCK_ASSIGNMENT action for each of the `items` unlocked', (done) => {
+            let payload = {
+                items: [
+                    {item: 'as1', user: 'ident1', lock_session: 'session1', etag: 'etag1', type: 'assignment'},
+                    {item: 'as2', user: 'ident1', lock_session: 'session1', etag: 'etag2', type: 'assignment'},
+                ],
+                user: 'ident1',
+                lock_session: 'session1',
+            };
+
+            return store.test(done, assignmentNotifications.onAssignmentUnlocked({}, payload))
+                .then(() => {
+                    expect(planningApi.locks.setItemAsUnlocked.callCount).toBe(2);
+                    expect(assignmentsApi.fetchAssignmentById.args.map((args) => args[0])).toEqual(['as1', 'as2']);
+                    expect(
+                        store.dispatch.args
+                            .filter((args) => args[0].type === 'UNLOCK_ASSIGNMENT')
+                            .map((args) => [args[0].payload.assignment._id, args[0].payload.assignment._etag])
+                    ).toEqual([['as1', 'etag1'], ['as2', 'etag2']]);
+                    done();
+                })
+                .catch(done.fail);
+        });
     });
 
     describe('`assignment:completed`', () => {
@@ -31,8 +31,15 @@ const onEventCreated = (_e, data) => (
  * @param _e
  * @param {object} data - Event and User IDs
  */
-function onEventUnlocked(_e: {}, data: IWebsocketMessageData['ITEM_UNLOCKED']) {
+function onEventUnlocked(
+    _e: {},
+    data: IWebsocketMessageData['ITEM_UNLOCKED'] | IWebsocketMessageData['ITEMS_UNLOCKED']
+) {
     return (dispatch, getState) => {
+        if (data != null && 'items' in data) {
+            return Promise.all(data.items.map((item) => dispatch(onEventUnlocked(_e, item))));
+        }
+
         if (data?.item != null) {
             const state = getState();
             const events = selectors.events.storedEvents(state);
@@ -613,6 +613,34 @@ describe('actions.events.notifications', () => {
                     done();
                 })
         ).catch(done.fail));
+
+        it('dispatches `UNLOCK_EVENT` for each of the `items` unlocked', (done) => {
+            store.initialState.events.events.e2.lock_user = 'ident1';
+            store.initialState.events.events.e2.lock_session = 'session1';
+
+            store.test(done, eventsNotifications.onEventUnlocked(
+                {},
+                {
+                    items: [
+                        {item: 'e1', user: 'ident2', lock_session: 'session1', etag: 'e123', type: 'event'},
+                        {item: 'e2', user: 'ident2', lock_session: 'session1', etag: 'e456', type: 'event'},
+                    ],
+                    user: 'ident2',
+                    lock_session: 'session1',
+                }
+            ))
+                .then(() => {
+                    expect(planningApi.locks.setItemAsUnlocked.callCount).toBe(2);
+                    expect(
+                        store.dispatch.args
+                            .filter((args) => args[0].type === EVENTS.ACTIONS.UNLOCK_EVENT)
+                            .map((args) => [args[0].payload.event._id, args[0].payload.event._etag])
+                    ).toEqual([['e1', 'e123'], ['e2', 'e456']]);
+
+                    done();
+                })
+                .catch(done.fail);
+        });
     });
 
     describe('onEventSpiked/onEventUnspiked', () => {
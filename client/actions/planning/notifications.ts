@@ -144,8 +144,15 @@ const onPlanningLocked = (e, data) => (
  * @param {object} _e - Event object
  * @param {object} data - Planning and User IDs
  */
-function onPlanningUnlocked(_e: {}, data: IWebsocketMessageData['ITEM_UNLOCKED']) {
+function onPlanningUnlocked(
+    _e: {},
+    data: IWebsocketMessageData['ITEM_UNLOCKED'] | IWebsocketMessageData['ITEMS_UNLOCKED']
+) {
     return (dispatch, getState) => {
+        if (data != null && 'items' in data) {
+            return Promise.all(data.items.map((item) => dispatch(onPlanningUnlocked(_e, item))));
+        }
+
         if (data?.item != null) {
             const state = getState();
             let planningItem = selectors.planning.storedPlannings(state)[data.item];
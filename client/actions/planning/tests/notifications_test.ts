@@ -331,6 +331,32 @@ describe('actions.planning.notifications', () => {
                     done();
                 })
         ).catch(done.fail));
+
+        it('dispatches `UNLOCK_PLANNING` for each of the `items` unlocked', (done) => {
+            store.initialState.planning.plannings.p2.lock_user = 'ident1';
+            store.initialState.planning.plannings.p2.lock_session = 'session1';
+
+            store.test(done, planningNotifications.onPlanningUnlocked({},
+                {
+                    items: [
+                        {item: 'p1', user: 'ident2', lock_session: 'session1', etag: 'e123', type: 'planning'},
+                        {item: 'p2', user: 'ident2', lock_session: 'session1', etag: 'e456', type: 'planning'},
+                    ],
+                    user: 'ident2',
+                    lock_session: 'session1',
+                }))
+                .then(() => {
+                    expect(planningApi.locks.setItemAsUnlocked.callCount).toBe(2);
+                    expect(
+                        store.dispatch.args
+                            .filter((args) => args[0].type === PLANNING.ACTIONS.UNLOCK_PLANNING)
+                            .map((args) => [args[0].payload.plan._id, args[0].payload.plan._etag])
+                    ).toEqual([['p1', 'e123'], ['p2', 'e456']]);
+
+                    done();
+                })
+                .catch(done.fail);
+        });
     });
 
     describe('onPlanningPosted', () => {
@@ -2055,6 +2055,12 @@ export interface IWebsocketMessageData {
         event_item?: IEventItem['_id'];
         type: IEventOrPlanningItem['type'] | IAssignmentItem['type'];
     };
+    ITEMS_UNLOCKED: {
+        // Sent when all items of a session are unlocked at once (such as when the session ends)
+        items: Array<IWebsocketMessageData['ITEM_UNLOCKED']>;
+        user?: IEventOrPlanningItem['lock_user'];
+        lock_session?: IEventOrPlanningItem['lock_session'];
+    };
     ITEM_LOCKED: {
         item: IEventOrPlanningItem['_id'];
         etag: IEventOrPlanningItem['_etag'];
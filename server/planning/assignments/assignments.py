@@ -41,7 +41,8 @@ from planning.planning import coverage_schema
 from planning.planning.planning import planning_schema
 from superdesk import get_resource_service
 from apps.common.components.utils import get_component
-from planning.item_lock import LockService, LOCK_USER, LOCK_ACTION, LOCK_SESSION
+from planning.item_lock import LockService, LOCK_USER, LOCK_ACTION, LOCK_SESSION, RELATED_LOCK_FIELDS
+from planning.bulk import get_collection
 from superdesk.users.services import current_user_has_privilege
 from planning.common import (
     ASSIGNMENT_WORKFLOW_STATE,
@@ -106,10 +107,13 @@ class AssignmentsService(superdesk.Service):
 
     def _enhance_assignments(self, docs):
         """Populate `item_ids` with ids for all linked Archive items for an Assignment"""
-        items = list(self.get_archive_items_for_assignments([str(doc.get(config.ID_FIELD)) for doc in docs]))
+        item_ids = {}
+        for item in self.get_archive_items_for_assignments([str(doc.get(config.ID_FIELD)) for doc in docs]):
+            item_ids.setdefault(str(item.get("assignment_id")), []).append(str(item.get("_id")))
+
         for doc in docs:
-            ids = [str(item.get("_id")) for item in items if str(item.get("assignment_id")) == str(doc.get("_id"))]
-            if len(ids):
+            ids = item_ids.get(str(doc.get("_id")))
+            if ids:
                 doc["item_ids"] = ids
 
             self.set_type(doc, doc)
@@ -1180,7 +1184,7 @@ class AssignmentsService(superdesk.Service):
         if not associated_event:
             return False
 
-        event = get_resource_service("events").find_one(req=None, _id=associated_event)
+        event = get_collection("events").find_one({config.ID_FIELD: associated_event}, projection=RELATED_LOCK_FIELDS)
         if not planning_item.get("recurrence_id"):
             return is_locked_in_this_session(event)
         else:
@@ -1523,6 +1527,8 @@ class AssignmentsResource(superdesk.Resource):
         "coverage_item_1": ([("coverage_item", 1)], {"background": True}),
         "planning_item_1": ([("planning_item", 1)], {"background": True}),
         "published_state_1": ([("published_state", 1)], {"background": True}),
+        "lock_session_1": ([("lock_session", 1)], {"background": True}),
+        "lock_time_1": ([("lock_time", 1)], {"background": True}),
     }
 
     datasource = {"source": "assignments", "search_backend": "elastic"}
@@ -0,0 +1,124 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Planning - Bulk Mongo/Elastic writes
+
+Helpers used when actioning a large number of items at once (such as a series of recurring Events),
+so that the items are written using a single round-trip per datastore, instead of one per item.
+
+These bypass the per-item service hooks, so it is up to the caller to record history
+and send notifications for the items written here.
+"""
+
+from typing import Dict, Any, List, Iterable, Tuple
+import logging
+
+from flask import current_app as app
+from eve.utils import config
+from eve.methods.common import resolve_document_etag
+from pymongo import UpdateOne
+
+import superdesk
+from superdesk.utc import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def get_collection(resource: str):
+    """Returns the pymongo collection for the provided resource
+
+    The collection is resolved from the ``datasource`` of the resource, same as Eve,
+    so endpoints such as ``events_spike`` use the collection of their ``source`` (i.e. ``events``).
+    """
+
+    source = app.data.mongo._datasource(resource)[0]
+    return app.data.mongo.pymongo(resource=resource).db[source]
+
+
+def mongotize(resource: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts ObjectId strings to ObjectIds, as Eve does when writing through the service layer"""
+
+    return app.data.mongo._mongotize(doc, resource)
+
+
+def index_items(resource: str, docs: List[Dict[str, Any]]):
+    """(Re)Index the provided documents in Elastic using a single bulk request"""
+
+    if not docs:
+        return
+
+    # ``bulk_insert`` adds Elastic specific fields to the documents, so pass in copies
+    app.data.elastic.bulk_insert(resource, [doc.copy() for doc in docs])
+
+
+def reindex_items(resource: str, ids: Iterable[Any]):
+    """Load the latest version of the items from Mongo and index them in Elastic"""
+
+    ids = list(ids)
+    if not ids:
+        return
+
+    index_items(resource, list(get_collection(resource).find({config.ID_FIELD: {"$in": ids}})))
+
+
+def bulk_insert(resource: str, docs: List[Dict[str, Any]]) -> List[Any]:
+    """Insert the documents using one ``insert_many`` in Mongo and one bulk request in Elastic"""
+
+    if not docs:
+        return []
+
+    for doc in docs:
+        doc.pop("_type", None)
+
+    ids = superdesk.get_backend().create_in_mongo(resource, docs)
+    index_items(resource, docs)
+
+    return ids
+
+
+def bulk_update(resource: str, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Apply a list of ``(updates, original)`` pairs using a single ``bulk_write`` and bulk index
+
+    ``_updated`` and ``_etag`` are set on each of the ``updates`` provided (if not already supplied),
+    so the caller can use them when recording history and sending notifications.
+
+    :return: The list of updates that were applied
+    """
+
+    if not items:
+        return []
+
+    now = utcnow()
+    operations = []
+    ids = []
+
+    for updates, original in items:
+        item_id = original[config.ID_FIELD]
+        updates.setdefault(config.LAST_UPDATED, now)
+        if config.ETAG not in updates:
+            # Same as the service layer, so ``etag_ignore_fields`` of the resource are applied
+            updated = original.copy()
+            updated.update(updates)
+            resolve_document_etag(updated, resource)
+            updates[config.ETAG] = updated[config.ETAG]
+
+        operations.append(UpdateOne({config.ID_FIELD: item_id}, {"$set": mongotize(resource, updates.copy())}))
+        ids.append(item_id)
+
+    result = get_collection(resource).bulk_write(operations, ordered=False)
+    if result.matched_count != len(operations):
+        logger.warning(
+            "Bulk update of {} items in {} only matched {} items".format(
+                len(operations), resource, result.matched_count
+            )
+        )
+
+    reindex_items(resource, ids)
+    return [updates for updates, _original in items]
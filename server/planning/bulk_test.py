@@ -0,0 +1,47 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from eve.utils import config
+
+from superdesk.utc import utcnow
+from planning.tests import TestCase
+
+from .bulk import bulk_update, get_collection
+
+
+class BulkTestCase(TestCase):
+    def test_bulk_update_etag_ignores_fields(self):
+        with self.app.app_context():
+            now = utcnow()
+            self.app.data.insert("planning", [{"_id": "plan1", "planning_date": now, "slugline": "test"}])
+            original = self.app.data.find_one("planning", req=None, _id="plan1")
+
+            def get_etag(updates):
+                updates[config.LAST_UPDATED] = now
+                return bulk_update("planning", [(updates, original.copy())])[0][config.ETAG]
+
+            # ``_planning_schedule`` is in the ``etag_ignore_fields`` of the planning resource
+            self.assertEqual(
+                get_etag({"_planning_schedule": [{"scheduled": now}]}),
+                get_etag({"_planning_schedule": []}),
+            )
+            self.assertNotEqual(get_etag({"slugline": "other"}), get_etag({"slugline": "test"}))
+
+    def test_bulk_update_aliased_resource(self):
+        with self.app.app_context():
+            self.app.data.insert("events", [{"_id": "event1", "name": "test", "state": "draft"}])
+            original = self.app.data.find_one("events", req=None, _id="event1")
+
+            # ``events_spike`` is an endpoint using the ``events`` collection
+            self.assertEqual("events", get_collection("events_spike").name)
+            bulk_update("events_spike", [({"state": "spiked"}, original)])
+
+            self.assertEqual("spiked", get_collection("events").find_one({"_id": "event1"})["state"])
+            self.assertEqual("spiked", self.app.data.find_one("events", req=None, _id="event1")["state"])
@@ -4,3 +4,5 @@ from .delete_marked_assignments import DeleteMarkedAssignments  # noqa
 from .export_to_newsroom import ExportToNewsroom  # noqa
 from .export_scheduled_filters import ExportScheduledFilters  # noqa
 from .purge_expired_locks import PurgeExpiredLocks  # noqa
+from .set_combined_id import SetCombinedId  # noqa
+from .set_schedule_days import SetScheduleDays  # noqa
@@ -9,17 +9,18 @@
 # at https://www.sourcefabric.org/superdesk/license
 
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional
 
 from flask import current_app as app
-from eve.utils import date_to_str
 
 from superdesk import Command, command, get_resource_service, Option
 from superdesk.utc import utcnow
 from superdesk.lock import lock, unlock
 from superdesk.celery_task_utils import get_lock_id
 from planning.item_lock import LOCK_ACTION, LOCK_SESSION, LOCK_TIME, LOCK_USER
-from planning.utils import try_cast_object_id
+from planning.bulk import get_collection, bulk_update
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +29,12 @@ class PurgeExpiredLocks(Command):
     """
     Purge item locks that are linked to a non-existing session
 
+    Expired locks are streamed from Mongo using the ``lock_time`` index, and are purged in batches
+    (one bulk write, re-index and autosave delete per batch), so this can be run frequently.
+
     --resource, -r: The name of the resource to purge item locks for
     --expire-hours, -e: Purges locks that are older than this many hours
+    --batch-size, -b: The number of items to purge per batch (defaults to ``MAX_EXPIRY_QUERY_LIMIT``)
 
     Example:
     ::
@@ -39,14 +44,16 @@ class PurgeExpiredLocks(Command):
         $ python manage.py planning:purge_expired_locks -r assignments
         $ python manage.py planning:purge_expired_locks -r all
         $ python manage.py planning:purge_expired_locks -r all -e 48
+        $ python manage.py planning:purge_expired_locks -r all -e 1 -b 500
     """
 
     option_list = [
         Option("--resource", "-r", required=True),
         Option("--expire-hours", "-e", dest="expire_hours", required=False, type=int, default=24),
+        Option("--batch-size", "-b", dest="batch_size", required=False, type=int),
     ]
 
-    def run(self, resource: str, expire_hours: int = 24) -> None:
+    def run(self, resource: str, expire_hours: int = 24, batch_size: Optional[int] = None) -> None:
         logger.info("Starting to purge expired item locks")
 
         if resource == "all":
@@ -61,19 +68,19 @@ class PurgeExpiredLocks(Command):
             logger.info("purge expired locks task is already running")
             return
 
-        expiry_datetime = date_to_str(utcnow() - timedelta(hours=expire_hours))
+        expiry_datetime = utcnow() - timedelta(hours=expire_hours)
+        batch_size = batch_size or app.config["MAX_EXPIRY_QUERY_LIMIT"]
         for resource_name in resources:
             try:
-                self._purge_item_locks(resource_name, expiry_datetime)
+                self._purge_item_locks(resource_name, expiry_datetime, batch_size)
             except Exception as err:
                 logger.exception(f"Failed to purge item locks ({err})")
 
         unlock(lock_name)
         logger.info("Completed purging expired item locks")
 
-    def _purge_item_locks(self, resource: str, expiry_datetime: str):
+    def _purge_item_locks(self, resource: str, expiry_datetime: datetime, batch_size: int):
         logger.info(f"Purging expired locks for {resource}")
-        resource_service = get_resource_service(resource)
         try:
             autosave_service = get_resource_service(
                 "event_autosave" if resource == "events" else f"{resource}_autosave"
@@ -81,68 +88,66 @@ class PurgeExpiredLocks(Command):
         except KeyError:
             autosave_service = None
 
-        for items in self.get_locked_items(resource, expiry_datetime):
-            failed_ids = []
-            for item in items:
-                try:
-                    item_id = try_cast_object_id(item["_id"])
-                except KeyError:
-                    logger.exception("Item ID not found, unable to purge its lock")
-                    continue
+        start = time.monotonic()
+        num_purged = 0
+        num_failed = 0
 
-                try:
-                    # Remove all lock information from this item
-                    resource_service.system_update(
-                        item_id,
-                        {
-                            LOCK_USER: None,
-                            LOCK_ACTION: None,
-                            LOCK_SESSION: None,
-                            LOCK_TIME: None,
-                        },
-                        item,
-                        push_notification=False,
-                    )
-                except Exception as err:
-                    logger.exception(f"Failed to purge item lock ({err})")
-                    failed_ids.append(item_id)
-                    continue
+        for items in self.get_locked_items(resource, expiry_datetime, batch_size):
+            item_ids = [item["_id"] for item in items]
 
-                if autosave_service is None:
-                    continue
+            try:
+                # Remove all lock information from these items
+                bulk_update(
+                    resource,
+                    [
+                        ({LOCK_USER: None, LOCK_ACTION: None, LOCK_SESSION: None, LOCK_TIME: None}, item)
+                        for item in items
+                    ],
+                )
+            except Exception as err:
+                logger.exception(f"Failed to purge item locks ({err}). Failed IDs: {item_ids}")
+                num_failed += len(items)
+                continue
 
+            num_purged += len(items)
+
+            if autosave_service is not None:
                 try:
-                    # Delete any autosave items associated with this item
-                    autosave_service.delete_action(lookup={"_id": item_id})
+                    # Delete any autosave items associated with these items
+                    autosave_service.delete_action(lookup={"_id": {"$in": item_ids}})
                 except Exception as err:
                     logger.exception(f"Failed to delete autosave item(s) ({err})")
 
-            num_items = len(items)
-            num_success = num_items - len(failed_ids)
-            if num_success != num_items:
-                logger.warning(f"{num_success}/{num_items} {resource} locks purged. Failed IDs: {failed_ids}")
-            else:
-                logger.info(f"{num_items} {resource} locks purged")
-
-    def get_locked_items(self, resource: str, expiry_datetime: str):
-        service = get_resource_service(resource)
-        total_received = 0
-        query = {
-            "query": {"bool": {"filter": [{"range": {LOCK_TIME: {"lt": expiry_datetime}}}]}},
-            "size": app.config["MAX_EXPIRY_QUERY_LIMIT"],
-            "sort": [{LOCK_TIME: "asc"}],
-        }
-
-        for i in range(app.config["MAX_EXPIRY_LOOPS"]):
-            query["from"] = total_received
-            results = list(service.search(query))
-            num_results = len(results)
-
-            if not num_results:
-                break
-
-            total_received += num_results
-            yield results
+            elapsed = time.monotonic() - start
+            logger.info(
+                f"{num_purged} {resource} locks purged in {elapsed:.2f}s "
+                f"({num_purged / elapsed if elapsed else 0:.0f} items/s)"
+            )
+
+        if num_failed:
+            logger.warning(f"{num_purged}/{num_purged + num_failed} {resource} locks purged")
+        else:
+            logger.info(f"{num_purged} {resource} locks purged")
+
+    def get_locked_items(
+        self, resource: str, expiry_datetime: datetime, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the items with expired locks from Mongo, in batches of ``batch_size``
+
+        Purged items no longer match the ``lock_time`` range, so are not returned by the cursor again
+        """
+
+        cursor = get_collection(resource).find({LOCK_TIME: {"$lt": expiry_datetime}}, batch_size=batch_size)
+        items = []
+
+        for item in cursor:
+            items.append(item)
+            if len(items) >= batch_size:
+                yield items
+                items = []
+
+        if items:
+            yield items
 
 
 command("planning:purge_expired_locks", PurgeExpiredLocks())
@@ -180,3 +180,36 @@ class PurgeExpiredLocksTest(TestCase):
                 ("assignments", assignment_2_id, False),
             ]
         )
+
+    def test_purge_locks_in_batches(self):
+        self.app.data.insert(
+            "events",
+            [
+                {
+                    "_id": "expired_event_2",
+                    "dates": {"start": now, "end": now + timedelta(days=1)},
+                    "lock_user": "user2",
+                    "lock_session": "session2",
+                    "lock_time": now - timedelta(hours=26),
+                    "lock_action": "edit",
+                },
+            ],
+        )
+        self.app.data.insert(
+            "event_autosave",
+            [
+                {"_id": "expired_event_1", "lock_user": "user2", "lock_session": "session2"},
+                {"_id": "active_event_1", "lock_user": "user1", "lock_session": "session1"},
+            ],
+        )
+
+        PurgeExpiredLocks().run("events", batch_size=1)
+        self.assertLockState(
+            [
+                ("events", "active_event_1", True),
+                ("events", "expired_event_1", False),
+                ("events", "expired_event_2", False),
+            ]
+        )
+        self.assertIsNone(self.app.data.find_one("event_autosave", req=None, _id="expired_event_1"))
+        self.assertIsNotNone(self.app.data.find_one("event_autosave", req=None, _id="active_event_1"))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+import logging
+
+from eve.utils import config
+from pymongo import UpdateOne
+from superdesk import Command, command, Option
+
+from planning.bulk import get_collection, reindex_items
+
+logger = logging.getLogger(__name__)
+
+
+def get_combined_id(resource, item):
+    """Returns the ID used to group the item in the combined view
+
+    Planning items are grouped under their Event, if they have one.
+    """
+
+    if resource == "planning":
+        return item.get("event_item") or item[config.ID_FIELD]
+
+    return item[config.ID_FIELD]
+
+
+class SetCombinedId(Command):
+    """
+    Populate the ``_combined_id`` field of existing Events and Planning items
+
+    This field is used to group Planning items under their Event in the combined view,
+    and must be populated before enabling ``PLANNING_COMBINED_VIEW_COLLAPSE``.
+    Items are updated in Mongo and re-indexed in Elastic in batches.
+
+    --page-size, -p: The number of items to update per batch
+
+    Example:
+    ::
+
+        $ python manage.py planning:set_combined_id
+        $ python manage.py planning:set_combined_id -p 1000
+    """
+
+    option_list = [
+        Option("--page-size", "-p", dest="page_size", required=False, type=int, default=500),
+    ]
+
+    def run(self, page_size: int = 500):
+        for resource in ["events", "planning"]:
+            total = self._set_combined_id(resource, page_size)
+            logger.info("Updated {} {} items".format(total, resource))
+
+    @staticmethod
+    def _set_combined_id(resource, page_size):
+        collection = get_collection(resource)
+        total = 0
+
+        while True:
+            items = list(
+                collection.find({"_combined_id": {"$exists": False}}, projection={"event_item": 1}).limit(page_size)
+            )
+            if not items:
+                break
+
+            collection.bulk_write(
+                [
+                    UpdateOne(
+                        {config.ID_FIELD: item[config.ID_FIELD]},
+                        {"$set": {"_combined_id": get_combined_id(resource, item)}},
+                    )
+                    for item in items
+                ],
+                ordered=False,
+            )
+            reindex_items(resource, [item[config.ID_FIELD] for item in items])
+
+            total += len(items)
+            logger.info("Updated the _combined_id of {} {} items".format(total, resource))
+
+        return total
+
+
+command("planning:set_combined_id", SetCombinedId())
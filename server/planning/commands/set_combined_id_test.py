@@ -0,0 +1,41 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from datetime import timedelta
+
+from superdesk.utc import utcnow
+from planning.tests import TestCase
+from planning.bulk import get_collection
+
+from .set_combined_id import SetCombinedId
+
+now = utcnow()
+
+
+class SetCombinedIdTest(TestCase):
+    def test_set_combined_id(self):
+        with self.app.app_context():
+            self.app.data.insert(
+                "events",
+                [{"_id": "event1", "dates": {"start": now, "end": now + timedelta(days=1)}}],
+            )
+            self.app.data.insert(
+                "planning",
+                [
+                    {"_id": "plan1", "planning_date": now, "event_item": "event1"},
+                    {"_id": "plan2", "planning_date": now},
+                ],
+            )
+
+            SetCombinedId().run(page_size=1)
+
+            self.assertEqual(get_collection("events").find_one({"_id": "event1"})["_combined_id"], "event1")
+            self.assertEqual(get_collection("planning").find_one({"_id": "plan1"})["_combined_id"], "event1")
+            self.assertEqual(get_collection("planning").find_one({"_id": "plan2"})["_combined_id"], "plan2")
@@ -0,0 +1,116 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+import logging
+
+from eve.utils import config
+from pymongo import UpdateOne
+from superdesk import Command, command, Option
+
+from planning.common import get_schedule_days, get_schedule_range
+from planning.bulk import get_collection, reindex_items
+
+logger = logging.getLogger(__name__)
+
+
+def get_schedule_updates(resource, item):
+    """Returns the denormalised schedule fields of a stored Event or Planning item"""
+
+    if resource == "events":
+        dates = item.get("dates") or {}
+        return {"_schedule_days": get_schedule_days([(dates.get("start"), dates.get("end"))])}
+
+    planning_schedule = item.get("_planning_schedule") or []
+    updates_schedule = item.get("_updates_schedule") or []
+    updates = {
+        "_schedule_days": get_schedule_days([(schedule.get("scheduled"), None) for schedule in planning_schedule])
+    }
+    updates["_planning_schedule_min"], updates["_planning_schedule_max"] = get_schedule_range(planning_schedule)
+    updates["_updates_schedule_min"], updates["_updates_schedule_max"] = get_schedule_range(updates_schedule)
+    return updates
+
+
+class SetScheduleDays(Command):
+    """
+    Populate the denormalised schedule fields of existing Events and Planning items
+
+    ``_schedule_days`` is used to search the common date filters (today, tomorrow, this week & next week)
+    using a terms query, and must be populated before enabling ``PLANNING_SCHEDULE_DAYS_SEARCH``.
+    The days are stored in the ``DEFAULT_TIMEZONE``, so this must be run with ``--all``
+    if the ``DEFAULT_TIMEZONE`` is changed.
+
+    The first/last scheduled dates of Planning items (``_planning_schedule_min/max`` and
+    ``_updates_schedule_min/max``) are used to search the schedule without nested queries,
+    and must be populated before enabling ``PLANNING_SCHEDULE_RANGE_SEARCH``.
+    Items are updated in Mongo and re-indexed in Elastic in batches.
+
+    --page-size, -p: The number of items to update per batch
+    --all, -a: Update all items, not only the ones without these fields
+
+    Example:
+    ::
+
+        $ python manage.py planning:set_schedule_days
+        $ python manage.py planning:set_schedule_days -p 1000 --all
+    """
+
+    option_list = [
+        Option("--page-size", "-p", dest="page_size", required=False, type=int, default=500),
+        Option("--all", "-a", dest="update_all", required=False, action="store_true", default=False),
+    ]
+
+    def run(self, page_size: int = 500, update_all: bool = False):
+        for resource in ["events", "planning"]:
+            total = self._set_schedule_days(resource, page_size, update_all)
+            logger.info("Updated {} {} items".format(total, resource))
+
+    @staticmethod
+    def _set_schedule_days(resource, page_size, update_all):
+        collection = get_collection(resource)
+        if update_all:
+            lookup = {}
+        elif resource == "events":
+            lookup = {"_schedule_days": {"$exists": False}}
+        else:
+            lookup = {"$or": [{"_schedule_days": {"$exists": False}}, {"_planning_schedule_min": {"$exists": False}}]}
+
+        last_id = None
+        total = 0
+
+        while True:
+            page_lookup = lookup if last_id is None else {"$and": [lookup, {config.ID_FIELD: {"$gt": last_id}}]}
+            items = list(
+                collection.find(page_lookup, projection={"dates": 1, "_planning_schedule": 1, "_updates_schedule": 1})
+                .sort(config.ID_FIELD, 1)
+                .limit(page_size)
+            )
+            if not items:
+                break
+
+            collection.bulk_write(
+                [
+                    UpdateOne(
+                        {config.ID_FIELD: item[config.ID_FIELD]},
+                        {"$set": get_schedule_updates(resource, item)},
+                    )
+                    for item in items
+                ],
+                ordered=False,
+            )
+            reindex_items(resource, [item[config.ID_FIELD] for item in items])
+
+            last_id = items[-1][config.ID_FIELD]
+            total += len(items)
+            logger.info("Updated the schedule fields of {} {} items".format(total, resource))
+
+        return total
+
+
+command("planning:set_schedule_days", SetScheduleDays())
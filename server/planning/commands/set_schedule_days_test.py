@@ -0,0 +1,65 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from datetime import datetime
+
+import pytz
+from planning.tests import TestCase
+from planning.bulk import get_collection
+
+from .set_schedule_days import SetScheduleDays
+
+
+class SetScheduleDaysTest(TestCase):
+    def test_set_schedule_days(self):
+        with self.app.app_context():
+            self.app.config["DEFAULT_TIMEZONE"] = "Australia/Sydney"
+            self.app.data.insert(
+                "events",
+                [
+                    {
+                        "_id": "event1",
+                        "dates": {
+                            # 2024-03-01 22:00 to 2024-03-04 09:00 in Sydney
+                            "start": datetime(2024, 3, 1, 11, tzinfo=pytz.utc),
+                            "end": datetime(2024, 3, 3, 22, tzinfo=pytz.utc),
+                        },
+                    }
+                ],
+            )
+            get_collection("planning").insert_many(
+                [
+                    {
+                        "_id": "plan1",
+                        "_planning_schedule": [
+                            {"scheduled": datetime(2024, 3, 1, 14, tzinfo=pytz.utc)},
+                            {"scheduled": datetime(2024, 3, 2, 1, tzinfo=pytz.utc)},
+                            {"scheduled": None},
+                        ],
+                    },
+                    {"_id": "plan2"},
+                ]
+            )
+
+            SetScheduleDays().run(page_size=1)
+
+            self.assertEqual(
+                get_collection("events").find_one({"_id": "event1"})["_schedule_days"],
+                ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04"],
+            )
+            plan = get_collection("planning").find_one({"_id": "plan1"})
+            self.assertEqual(plan["_schedule_days"], ["2024-03-02"])
+            self.assertEqual(plan["_planning_schedule_min"], datetime(2024, 3, 1, 14, tzinfo=pytz.utc))
+            self.assertEqual(plan["_planning_schedule_max"], datetime(2024, 3, 2, 1, tzinfo=pytz.utc))
+            self.assertIsNone(plan["_updates_schedule_min"])
+
+            plan = get_collection("planning").find_one({"_id": "plan2"})
+            self.assertEqual(plan["_schedule_days"], [])
+            self.assertIsNone(plan["_planning_schedule_max"])
@@ -8,10 +8,12 @@
 # AUTHORS and LICENSE files distributed with this source code, or
 # at https://www.sourcefabric.org/superdesk/license
 
-from typing import NamedTuple, Dict, Any, Set, Optional
+from typing import NamedTuple, Dict, Any, Set, Optional, List, Tuple, Iterable
 
 import re
 import time
+import arrow
+import pytz
 from flask import current_app as app
 from collections import namedtuple
 from datetime import timedelta, datetime
@@ -157,6 +159,7 @@ DUPLICATE_EVENT_IGNORED_FIELDS = {
     "_reschedule_from_schedule",
     "expired",
     "state_reason",
+    "virtual_series",
 }
 
 
@@ -174,6 +177,42 @@ def get_max_recurrent_events(current_app=None):
     return int(app.config.get("MAX_RECURRENT_EVENTS", 200))
 
 
+def get_recurring_bulk_writes_enabled(current_app=None) -> bool:
+    return bool((current_app or app).config.get("PLANNING_RECURRING_BULK_WRITES", True))
+
+
+def get_virtual_recurring_series_enabled(current_app=None) -> bool:
+    return bool((current_app or app).config.get("PLANNING_VIRTUAL_RECURRING_SERIES", False))
+
+
+def get_combined_view_collapse_enabled(current_app=None) -> bool:
+    return bool((current_app or app).config.get("PLANNING_COMBINED_VIEW_COLLAPSE", False))
+
+
+def get_search_query_cache_size(current_app=None) -> int:
+    return int((current_app or app).config.get("PLANNING_SEARCH_QUERY_CACHE_SIZE", 500))
+
+
+def get_search_result_cache_ttl(current_app=None) -> int:
+    return int((current_app or app).config.get("PLANNING_SEARCH_RESULT_CACHE_TTL", 0))
+
+
+def get_autocomplete_cache_ttl(current_app=None) -> int:
+    return int((current_app or app).config.get("PLANNING_AUTOCOMPLETE_CACHE_TTL", 0))
+
+
+def get_schedule_range_search_enabled(current_app=None) -> bool:
+    return bool((current_app or app).config.get("PLANNING_SCHEDULE_RANGE_SEARCH", False))
+
+
+def get_schedule_days_search_enabled(current_app=None) -> bool:
+    return bool((current_app or app).config.get("PLANNING_SCHEDULE_DAYS_SEARCH", False))
+
+
+def get_search_point_in_time_keep_alive(current_app=None) -> str:
+    return (current_app or app).config.get("PLANNING_SEARCH_POINT_IN_TIME_KEEP_ALIVE", "2m")
+
+
 def planning_auto_assign_to_workflow(current_app=None):
     if current_app is not None:
         return current_app.config.get("PLANNING_AUTO_ASSIGN_TO_WORKFLOW", False)
@@ -448,6 +487,18 @@ def enqueue_planning_item(id):
         logger.error("Failed to retrieve planning item from planning versions with id: {}".format(id))
 
 
+@celery.task(soft_time_limit=600)
+def enqueue_planning_items(ids):
+    """
+    Enqueue a batch of items from the planning versions collection, using a single task
+
+    :param ids: The IDs of the planning versions to enqueue
+    :return:
+    """
+    for id in ids or []:
+        enqueue_planning_item(id)
+
+
 def sanitize_query_text(text):
     """Sanitize the query text"""
     if text:
@@ -469,6 +520,51 @@ def get_start_of_next_week(date=None, start_of_week=0):
     return current_date + timedelta(days=diff)
 
 
+def get_schedule_days(schedule: Iterable[Tuple[Any, Optional[Any]]]) -> List[str]:
+    """Returns the local dates spanned by the provided ``(start, end)`` pairs, in ``DEFAULT_TIMEZONE``
+
+    Used to populate the ``_schedule_days`` field, so that the common date filters
+    (today, tomorrow, this week & next week) can be searched using a ``terms`` query.
+    ``end`` is optional, in which case only the date of ``start`` is used.
+    """
+
+    tz = pytz.timezone(app.config["DEFAULT_TIMEZONE"])
+    days: Set[str] = set()
+
+    for start, end in schedule:
+        if not start:
+            continue
+
+        day = _to_local_date(start, tz)
+        last_day = _to_local_date(end, tz) if end else day
+        while day <= last_day:
+            days.add(day.isoformat())
+            day += timedelta(days=1)
+
+    return sorted(days)
+
+
+def get_schedule_range(schedule: List[Dict[str, Any]]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Returns the first and last ``scheduled`` dates of a Planning item's ``_planning_schedule``/``_updates_schedule``
+
+    Used to populate the ``_planning_schedule_min/max`` and ``_updates_schedule_min/max`` fields,
+    so that the schedule can be searched and sorted without a nested query.
+    """
+
+    dates = [item["scheduled"] for item in schedule if item.get("scheduled")]
+    if not dates:
+        return None, None
+
+    return min(dates), max(dates)
+
+
+def _to_local_date(value, tz):
+    date = arrow.get(value).datetime if isinstance(value, str) else value
+    if not date.tzinfo:
+        date = pytz.utc.localize(date)
+    return date.astimezone(tz).date()
+
+
 def get_event_max_multi_day_duration(current_app=None):
     """Get the max multi day duration"""
     if current_app is not None:
@@ -757,53 +853,68 @@ def is_content_link_to_coverage_allowed(archive_item):
     return True if not len(allowed_coverage_link_types) else archive_item["type"] in allowed_coverage_link_types
 
 
-def _sync_coverage_assigned_to(coverages, lookup_field, id_field):
-    if not coverages:
+def _sync_coverage_assigned_to(coverage, assignments):
+    if not coverage.get("assigned_to"):
+        coverage["assigned_to"] = {}
         return
 
-    assignments = {
-        str(assignment[config.ID_FIELD]): assignment
-        for assignment in get_resource_service("assignments").get_from_mongo(
-            req=None,
-            lookup={lookup_field: {"$in": [coverage[id_field] for coverage in coverages]}},
-        )
-    }
+    assignment = assignments.get(str(coverage["assigned_to"].get("assignment_id")))
 
-    for coverage in coverages:
-        if not coverage.get("assigned_to"):
-            coverage["assigned_to"] = {}
-            continue
+    if not assignment:
+        return
 
-        assignment = assignments.get(str(coverage["assigned_to"].get("assignment_id")))
+    assignment.setdefault("assigned_to", {})
+    coverage["assigned_to"]["assignment_id"] = assignment[config.ID_FIELD]
+    coverage["assigned_to"]["desk"] = assignment["assigned_to"].get("desk")
+    coverage["assigned_to"]["user"] = assignment["assigned_to"].get("user")
+    coverage["assigned_to"]["contact"] = assignment["assigned_to"].get("contact")
+    coverage["assigned_to"]["state"] = assignment["assigned_to"].get("state")
+    coverage["assigned_to"]["assignor_user"] = assignment["assigned_to"].get("assignor_user")
+    coverage["assigned_to"]["assignor_desk"] = assignment["assigned_to"].get("assignor_desk")
+    coverage["assigned_to"]["assigned_date_desk"] = assignment["assigned_to"].get("assigned_date_desk")
+    coverage["assigned_to"]["assigned_date_user"] = assignment["assigned_to"].get("assigned_date_user")
+    coverage["assigned_to"]["coverage_provider"] = assignment["assigned_to"].get("coverage_provider")
+    coverage["assigned_to"]["priority"] = assignment.get("priority")
+
+
+def sync_assignment_details_to_planning_items(docs):
+    """Sync the details of the Assignments to the coverages (and scheduled updates) of the Planning items
+
+    The Assignments of all the provided Planning items are loaded using a single query,
+    regardless of the number of items or coverages.
+    """
 
-        if not assignment:
-            continue
+    coverages = []
+    scheduled_updates = []
+    for doc in docs:
+        doc.setdefault("coverages", [])
+        for coverage in doc["coverages"]:
+            coverage.setdefault("scheduled_updates", [])
+            coverages.append(coverage)
+            scheduled_updates.extend(coverage["scheduled_updates"])
+
+    lookups = []
+    if coverages:
+        lookups.append({"coverage_item": {"$in": [coverage["coverage_id"] for coverage in coverages]}})
+    if scheduled_updates:
+        lookups.append(
+            {"scheduled_update_id": {"$in": [update["scheduled_update_id"] for update in scheduled_updates]}}
+        )
 
-        assignment.setdefault("assigned_to", {})
-        coverage["assigned_to"]["assignment_id"] = assignment[config.ID_FIELD]
-        coverage["assigned_to"]["desk"] = assignment["assigned_to"].get("desk")
-        coverage["assigned_to"]["user"] = assignment["assigned_to"].get("user")
-        coverage["assigned_to"]["contact"] = assignment["assigned_to"].get("contact")
-        coverage["assigned_to"]["state"] = assignment["assigned_to"].get("state")
-        coverage["assigned_to"]["assignor_user"] = assignment["assigned_to"].get("assignor_user")
-        coverage["assigned_to"]["assignor_desk"] = assignment["assigned_to"].get("assignor_desk")
-        coverage["assigned_to"]["assigned_date_desk"] = assignment["assigned_to"].get("assigned_date_desk")
-        coverage["assigned_to"]["assigned_date_user"] = assignment["assigned_to"].get("assigned_date_user")
-        coverage["assigned_to"]["coverage_provider"] = assignment["assigned_to"].get("coverage_provider")
-        coverage["assigned_to"]["priority"] = assignment.get("priority")
+    if not lookups:
+        return
+
+    assignments = {
+        str(assignment[config.ID_FIELD]): assignment
+        for assignment in get_resource_service("assignments").get_from_mongo(req=None, lookup={"$or": lookups})
+    }
+
+    for coverage in coverages + scheduled_updates:
+        _sync_coverage_assigned_to(coverage, assignments)
 
 
 def sync_assignment_details_to_coverages(doc):
-    doc.setdefault("coverages", [])
-    _sync_coverage_assigned_to(doc["coverages"], lookup_field="coverage_item", id_field="coverage_id")
-
-    for coverage in doc["coverages"]:
-        coverage.setdefault("scheduled_updates", [])
-        _sync_coverage_assigned_to(
-            coverage["scheduled_updates"],
-            lookup_field="scheduled_update_id",
-            id_field="scheduled_update_id",
-        )
+    sync_assignment_details_to_planning_items([doc])
 
 
 def get_assginment_name(assignment):
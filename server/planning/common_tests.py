@@ -1,5 +1,9 @@
 from planning.tests import TestCase
-from .common import set_actioned_date_to_event, get_coverage_status_from_cv
+from .common import (
+    set_actioned_date_to_event,
+    get_coverage_status_from_cv,
+    sync_assignment_details_to_planning_items,
+)
 from datetime import datetime, timedelta
 from superdesk.utc import utcnow
 
@@ -89,3 +93,53 @@ class CommonTestCase(TestCase):
             self.assertEqual(get_coverage_status_from_cv("ncostat:notdec")["label"], "Coverage on merit")
             self.assertEqual(get_coverage_status_from_cv("ncostat:notint")["label"], "Coverage not planned")
             self.assertEqual(get_coverage_status_from_cv("ncostat:onreq")["label"], "Coverage on request")
+
+    def test_sync_assignment_details_to_planning_items(self):
+        with self.app.app_context():
+            self.app.data.insert(
+                "assignments",
+                [
+                    {
+                        "_id": "as1",
+                        "coverage_item": "cov1",
+                        "priority": 2,
+                        "assigned_to": {"desk": "desk1", "user": "user1", "state": "assigned"},
+                    },
+                    {
+                        "_id": "as2",
+                        "coverage_item": "cov2",
+                        "scheduled_update_id": "update1",
+                        "assigned_to": {"desk": "desk2", "state": "in_progress"},
+                    },
+                ],
+            )
+            docs = [
+                {"_id": "plan1", "coverages": [{"coverage_id": "cov1", "assigned_to": {"assignment_id": "as1"}}]},
+                {
+                    "_id": "plan2",
+                    "coverages": [
+                        {
+                            "coverage_id": "cov2",
+                            "scheduled_updates": [
+                                {"scheduled_update_id": "update1", "assigned_to": {"assignment_id": "as2"}},
+                            ],
+                        }
+                    ],
+                },
+                {"_id": "plan3"},
+            ]
+
+            sync_assignment_details_to_planning_items(docs)
+
+            assigned_to = docs[0]["coverages"][0]["assigned_to"]
+            self.assertEqual(assigned_to["desk"], "desk1")
+            self.assertEqual(assigned_to["user"], "user1")
+            self.assertEqual(assigned_to["state"], "assigned")
+            self.assertEqual(assigned_to["priority"], 2)
+
+            self.assertEqual(docs[1]["coverages"][0]["assigned_to"], {})
+            assigned_to = docs[1]["coverages"][0]["scheduled_updates"][0]["assigned_to"]
+            self.assertEqual(assigned_to["desk"], "desk2")
+            self.assertEqual(assigned_to["state"], "in_progress")
+
+            self.assertEqual(docs[2]["coverages"], [])
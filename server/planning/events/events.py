@@ -15,27 +15,11 @@ import superdesk
 import logging
 import itertools
 import copy
-import pytz
-import re
 from datetime import timedelta
 from eve.methods.common import resolve_document_etag
 from eve.utils import config, date_to_str
 from flask import current_app as app
 from copy import deepcopy
-from dateutil.rrule import (
-    rrule,
-    YEARLY,
-    MONTHLY,
-    WEEKLY,
-    DAILY,
-    MO,
-    TU,
-    WE,
-    TH,
-    FR,
-    SA,
-    SU,
-)
 
 from superdesk import get_resource_service
 from superdesk.errors import SuperdeskApiError
@@ -52,6 +36,7 @@ from planning.common import (
     UPDATE_SINGLE,
     UPDATE_FUTURE,
     get_max_recurrent_events,
+    get_schedule_days,
     WORKFLOW_STATE,
     ITEM_STATE,
     remove_lock_information,
@@ -68,15 +53,18 @@ from planning.common import (
     is_new_version,
     update_ingest_on_patch,
     TEMP_ID_PREFIX,
+    get_recurring_bulk_writes_enabled,
+    get_virtual_recurring_series_enabled,
 )
+from planning.bulk import bulk_insert, bulk_update
 from .events_base_service import EventsBaseService
+from .events_virtual_series import create_virtual_series, get_virtual_occurrence
 from .events_schema import events_schema
+from .recurrence import get_recurring_dates, get_recurring_rule_params
 from .events_sync import sync_event_metadata_with_planning_items
 
 logger = logging.getLogger(__name__)
 
-FREQUENCIES = {"DAILY": DAILY, "WEEKLY": WEEKLY, "MONTHLY": MONTHLY, "YEARLY": YEARLY}
-DAYS = {"MO": MO, "TU": TU, "WE": WE, "TH": TH, "FR": FR, "SA": SA, "SU": SU}
 
 organizer_roles = {
     "eorol:artAgent": "Artistic agent",
@@ -103,6 +91,16 @@ def get_events_embedded_planning(event: Event) -> List[EmbeddedPlanning]:
     ]
 
 
+def is_recurring_series(events: List[Event]) -> bool:
+    """Returns ``True`` if the list contains more than one Event, all from the same recurring series"""
+
+    return (
+        len(events) > 1
+        and bool(events[0].get("recurrence_id"))
+        and all(event.get("recurrence_id") == events[0]["recurrence_id"] for event in events)
+    )
+
+
 def get_subject_str(subject: Dict[str, str]) -> str:
     return ":".join(
         [
@@ -155,6 +153,15 @@ class EventsService(superdesk.Service):
 
         pass
 
+    def find_one(self, req, **lookup):
+        item = super().find_one(req=req, **lookup)
+
+        if item is None and list(lookup.keys()) == [config.ID_FIELD]:
+            # The ID may be for an occurrence of a virtual series that hasn't been saved yet
+            item = get_virtual_occurrence(lookup[config.ID_FIELD])
+
+        return item
+
     def on_fetched(self, docs):
         for doc in docs["_items"]:
             self._enhance_event_item(doc)
@@ -262,6 +269,9 @@ class EventsService(superdesk.Service):
                 event["dates"]["start"] = get_date(event["dates"]["start"])
                 event["dates"]["end"] = get_date(event["dates"]["end"])
                 recurring_events = generate_recurring_events(event)
+                if get_virtual_recurring_series_enabled():
+                    # Only save the first Event, the rest of the series is expanded from it when read
+                    recurring_events = [create_virtual_series(recurring_events)]
                 generated_events.extend(recurring_events)
                 # remove the event that contains the recurring rule. We don't need it anymore
                 docs.remove(event)  # todo: why we remove that event and not update it?
@@ -298,7 +308,12 @@ class EventsService(superdesk.Service):
             if len(embedded_planning):
                 embedded_planning_lists.append((event, embedded_planning))
 
-        ids = self.backend.create(self.datasource, docs, **kwargs)
+        if is_recurring_series(docs) and get_recurring_bulk_writes_enabled():
+            # Insert the series using a single insert in Mongo and bulk index in Elastic
+            # The ``events:created:recurring`` notification is sent once for the series in ``on_created``
+            ids = bulk_insert(self.datasource, docs)
+        else:
+            ids = self.backend.create(self.datasource, docs, **kwargs)
 
         if len(embedded_planning_lists):
             for event, embedded_planning in embedded_planning_lists:
@@ -614,10 +629,10 @@ class EventsService(superdesk.Service):
         updates.pop("dates", None)
 
         if update_method == UPDATE_FUTURE:
-            historic, past, future = self.get_recurring_timeline(original)
+            historic, past, future = self.get_recurring_timeline(original, for_update=True, slices=["future"])
             events = future
         else:
-            historic, past, future = self.get_recurring_timeline(original)
+            historic, past, future = self.get_recurring_timeline(original, for_update=True)
             events = historic + past + future
 
         events_post_service = get_resource_service("events_post")
@@ -640,20 +655,23 @@ class EventsService(superdesk.Service):
 
         mark_completed = original.get("lock_action") == "mark_completed" and updates.get("actioned_date")
         mark_complete_validated = False
-        for e in events:
-            event_id = e[config.ID_FIELD]
+        bulk_writes = get_recurring_bulk_writes_enabled()
 
-            new_updates = deepcopy(updates)
-            new_updates["skip_on_update"] = True
-            new_updates[config.ID_FIELD] = event_id
+        # Remove ``embedded_planning`` before updating the events, as this should only be handled
+        # by the event provided to this update request
+        series_updates = deepcopy(updates)
+        series_updates.pop("embedded_planning", None)
+
+        items = []
+        for e in events:
+            # The same diff is applied to all events in the series, so only copy it when patching one at a time
+            new_updates = series_updates.copy() if bulk_writes else deepcopy(series_updates)
 
             if only_calendars:
-                # Get the original for this item, and add new calendars to it
-                # Skipping calendars already assigned to this item
-                original_event = self.find_one(req=None, _id=event_id)
-                original_qcodes = [calendar["qcode"] for calendar in original_event.get("calendars") or []]
+                # Add new calendars to this item, skipping calendars already assigned to it
+                original_qcodes = [calendar["qcode"] for calendar in e.get("calendars") or []]
 
-                new_updates["calendars"] = deepcopy(original_event.get("calendars") or [])
+                new_updates["calendars"] = deepcopy(e.get("calendars") or [])
                 new_updates["calendars"].extend(
                     [calendar for calendar in updated_calendars if calendar["qcode"] not in original_qcodes]
                 )
@@ -662,11 +680,17 @@ class EventsService(superdesk.Service):
                 # It is validated if the previous funciton did not raise an error
                 mark_complete_validated = True
 
-            # Remove ``embedded_planning`` before updating this event, as this should only be handled
-            # by the event provided to this update request
-            new_updates.pop("embedded_planning", None)
-            self.patch(event_id, new_updates)
-            app.on_updated_events(new_updates, {"_id": event_id})
+            items.append((new_updates, e))
+
+        if bulk_writes:
+            self._bulk_update_recurring_events(items)
+        else:
+            for new_updates, e in items:
+                event_id = e[config.ID_FIELD]
+                new_updates["skip_on_update"] = True
+                new_updates[config.ID_FIELD] = event_id
+                self.patch(event_id, new_updates)
+                app.on_updated_events(new_updates, {"_id": event_id})
 
         # And finally push a notification to connected clients
         push_notification(
@@ -676,6 +700,51 @@ class EventsService(superdesk.Service):
             user=str(updates.get("version_creator", "")),
         )
 
+    def _bulk_update_recurring_events(self, items):
+        """Apply the ``(updates, original)`` pairs of a series using bulk Mongo/Elastic writes
+
+        This replaces calling ``patch`` for each Event, so the per-item hooks are only run
+        for the Events that require them (i.e. Events with Planning items, posted Events or file changes).
+        History is written using a single insert, and the caller sends one notification for the series.
+        """
+
+        if not items:
+            return
+
+        now = utcnow()
+        for new_updates, _original in items:
+            new_updates.setdefault("versioncreated", now)
+
+        bulk_update(self.datasource, items)
+
+        event_ids = [original[config.ID_FIELD] for _updates, original in items]
+        event_ids_with_planning = set(
+            plan["event_item"]
+            for plan in get_resource_service("planning").get_from_mongo(
+                req=None,
+                lookup={"event_item": {"$in": event_ids}},
+                projection={"event_item": 1},
+            )
+        )
+
+        history_service = get_resource_service("events_history")
+        with history_service.batch():
+            for new_updates, original in items:
+                event_id = original[config.ID_FIELD]
+
+                if event_id in event_ids_with_planning:
+                    sync_event_metadata_with_planning_items(original, new_updates, [])
+                    app.on_updated_events(new_updates, {"_id": event_id})
+                else:
+                    # The other ``on_updated_events`` listeners only act on Events with Planning items
+                    history_service.on_item_updated(new_updates, {"_id": event_id})
+
+                if "files" in new_updates:
+                    self.delete_event_files(new_updates, original)
+
+                if new_updates.get("pubstatus") or original.get("pubstatus") == POST_STATE.USABLE:
+                    update_post_item(new_updates, original)
+
     def mark_event_complete(self, original, updates, event, mark_complete_validated):
         # If the entire series is in future, raise an error
         if event.get("recurrence_id"):
@@ -739,9 +808,11 @@ class EventsService(superdesk.Service):
         app.on_inserted_events(generated_events)
         return generated_events
 
-    def get_recurring_timeline(self, selected, spiked=False):
+    def get_recurring_timeline(self, selected, spiked=False, for_update=False, slices=None, projection=None):
         events_base_service = EventsBaseService("events", backend=superdesk.get_backend())
-        return events_base_service.get_recurring_timeline(selected, postponed=True, spiked=spiked)
+        return events_base_service.get_recurring_timeline(
+            selected, postponed=True, spiked=spiked, for_update=for_update, slices=slices, projection=projection
+        )
 
     @staticmethod
     def _link_to_planning(event):
@@ -843,10 +914,16 @@ class EventsResource(superdesk.Resource):
     item_methods = ["GET", "PATCH"]
     mongo_indexes = {
         "recurrence_id_1": ([("recurrence_id", 1)], {"background": True}),
+        "recurrence_id_state_dates_start": (
+            [("recurrence_id", 1), ("state", 1), ("dates.start", 1)],
+            {"background": True},
+        ),
         "state": ([("state", 1)], {"background": True}),
         "dates_start_1": ([("dates.start", 1)], {"background": True}),
         "dates_end_1": ([("dates.end", 1)], {"background": True}),
         "template": [("template", 1)],
+        "lock_session_1": ([("lock_session", 1)], {"background": True}),
+        "lock_time_1": ([("lock_time", 1)], {"background": True}),
     }
     privileges = {
         "POST": "planning_event_management",
@@ -867,6 +944,9 @@ def generate_recurring_dates(
     tz=None,
     date_only=False,
     _created_externally=False,
+    ex_date=None,
+    ex_rule=None,
+    r_date=None,
 ):
     """
 
@@ -878,67 +958,26 @@ def generate_recurring_dates(
     :param until datetime: date after which the recurrence rule expires
     :param byday str or list: "MO TU"
     :param count int: number of occurrences of the rule
+    :param ex_date list: dates to exclude from the series
+    :param ex_rule dict: rule of the dates to exclude from the series
+    :param r_date list: dates to add to the series
     :return list: list of datetime
 
     """
-    # if tz is given, respect the timzone by starting from the local time
-    # NOTE: rrule uses only naive datetime
-    if tz:
-        try:
-            # start can already be localized
-            start = pytz.UTC.localize(start)
-        except ValueError:
-            pass
-        start = start.astimezone(tz).replace(tzinfo=None)
-        if until:
-            until = get_date(until).astimezone(tz).replace(tzinfo=None)
-
-    if frequency == "DAILY":
-        byday = None
-
-    # check format of the recurring_rule byday value
-    if byday and re.match(r"^-?[1-5]+.*", byday):
-        # byday uses monthly or yearly frequency rule with day of week and
-        # preceding day of month integer by day value
-        # examples:
-        # 1FR - first friday of the month
-        # -2MON - second to last monday of the month
-        if byday[:1] == "-":
-            day_of_month = int(byday[:2])
-            day_of_week = byday[2:]
-        else:
-            day_of_month = int(byday[:1])
-            day_of_week = byday[1:]
-
-        byweekday = DAYS.get(day_of_week)(day_of_month)
-    else:
-        # byday uses DAYS constants
-        byweekday = byday and [DAYS.get(d) for d in byday.split()] or None
-
-    # Convert count of repeats to count of events
-    if count:
-        count = count * (len(byday.split()) if byday else 1)
-
-    # TODO: use dateutil.rrule.rruleset to incude ex_date and ex_rule
-    dates = rrule(
-        FREQUENCIES.get(frequency),
-        dtstart=start,
+    return get_recurring_dates(
+        start=start,
+        frequency=frequency,
+        interval=interval,
+        endRepeatMode=endRepeatMode,
         until=until,
-        byweekday=byweekday,
+        byday=byday,
         count=count,
-        interval=interval,
+        tz=tz,
+        date_only=date_only,
+        ex_date=ex_date,
+        ex_rule=ex_rule,
+        r_date=r_date,
     )
-    # if a timezone has been applied, returns UTC
-    if tz:
-        if date_only:
-            return (tz.localize(dt).astimezone(pytz.UTC).replace(tzinfo=None).date() for dt in dates)
-        else:
-            return (tz.localize(dt).astimezone(pytz.UTC).replace(tzinfo=None) for dt in dates)
-    else:
-        if date_only:
-            return (date.date() for date in dates)
-        else:
-            return (date for date in dates)
 
 
 def setRecurringMode(event):
@@ -955,57 +994,67 @@ def overwrite_event_expiry_date(event):
         event["expiry"] = event["dates"]["end"] + timedelta(minutes=expiry_minutes or 0)
 
 
+def get_recurring_event_template(event):
+    """Returns a copy of the Event, without the fields not required by the Events in the series"""
+
+    return copy.deepcopy(
+        {
+            key: value
+            for key, value in event.items()
+            if not key.startswith("_")
+            and not key.startswith("lock_")
+            and key not in {"embedded_planning", "pubstatus", "reschedule_from", "virtual_series"}
+        }
+    )
+
+
+def get_recurring_event_occurrence(template, start, time_delta, recurrence_id, guid):
+    """Returns a new Event in the series, stamping the per-occurrence fields onto a shallow copy of the template"""
+
+    new_event = copy.copy(template)
+    new_event["dates"] = copy.deepcopy(template["dates"])
+    new_event["dates"]["start"] = start
+    new_event["dates"]["end"] = start + time_delta
+    new_event["guid"] = guid
+    new_event["_id"] = guid
+    new_event["recurrence_id"] = recurrence_id
+
+    # set expiry date
+    overwrite_event_expiry_date(new_event)
+    # the _planning_schedule
+    set_planning_schedule(new_event)
+
+    return new_event
+
+
 def generate_recurring_events(event, recurrence_id=None):
     generated_events = []
     setRecurringMode(event)
-    embedded_planning_added = False
+
+    # Copy the Event once, then only stamp the fields that differ between each
+    # Event in the series (dates, guid, expiry & _planning_schedule) onto a shallow copy of it
+    template = get_recurring_event_template(event)
 
     # compute the difference between start and end in the original event
     time_delta = event["dates"]["end"] - event["dates"]["start"]
     # for all the dates based on the recurring rules:
     for date in itertools.islice(
-        generate_recurring_dates(
-            start=event["dates"]["start"],
-            tz=event["dates"].get("tz") and pytz.timezone(event["dates"]["tz"] or None),
-            **event["dates"]["recurring_rule"],
-        ),
+        generate_recurring_dates(start=event["dates"]["start"], **get_recurring_rule_params(event["dates"])),
         0,
         get_max_recurrent_events(),
     ):  # set a limit to prevent too many events to be created
         # create event with the new dates
-        new_event = copy.deepcopy(event)
-
-        # Remove fields not required by the new events
-        for key in list(new_event.keys()):
-            if key.startswith("_") or key.startswith("lock_"):
-                new_event.pop(key)
-            elif key == "embedded_planning":
-                if not embedded_planning_added:
-                    # If this is the first Event in the series, then keep
-                    # the ``embedded_planning`` field for processing later
-                    embedded_planning_added = True
-                else:
-                    # Otherwise remove the ``embedded_planning`` from all other Events
-                    # in the series
-                    new_event.pop("embedded_planning")
-
-        new_event.pop("pubstatus", None)
-        new_event.pop("reschedule_from", None)
-
-        new_event["dates"]["start"] = date
-        new_event["dates"]["end"] = date + time_delta
-        # set a unique guid
-        new_event["guid"] = generate_guid(type=GUID_NEWSML)
-        new_event["_id"] = new_event["guid"]
+        guid = generate_guid(type=GUID_NEWSML)
         # set the recurrence id
         if not recurrence_id:
-            recurrence_id = new_event["guid"]
-        new_event["recurrence_id"] = recurrence_id
+            recurrence_id = guid
+        new_event = get_recurring_event_occurrence(template, date, time_delta, recurrence_id, guid)
+
+        if not generated_events and "embedded_planning" in event:
+            # If this is the first Event in the series, then keep
+            # the ``embedded_planning`` field for processing later
+            new_event["embedded_planning"] = copy.deepcopy(event["embedded_planning"])
 
-        # set expiry date
-        overwrite_event_expiry_date(new_event)
-        # the _planning_schedule
-        set_planning_schedule(new_event)
         generated_events.append(new_event)
 
     return generated_events
@@ -1014,3 +1063,7 @@ def generate_recurring_events(event, recurrence_id=None):
 def set_planning_schedule(event):
     if event and event.get("dates") and event["dates"].get("start"):
         event["_planning_schedule"] = [{"scheduled": event["dates"]["start"]}]
+        event["_schedule_days"] = get_schedule_days([(event["dates"]["start"], event["dates"].get("end"))])
+
+    if event and event.get(config.ID_FIELD):
+        event["_combined_id"] = event[config.ID_FIELD]
@@ -8,6 +8,7 @@
 # AUTHORS and LICENSE files distributed with this source code, or
 # at https://www.sourcefabric.org/superdesk/license
 import json
+import itertools
 from datetime import datetime
 from flask import request
 from eve.utils import config, ParsedRequest
@@ -22,13 +23,52 @@ from apps.archive.common import get_auth
 
 from planning.common import (
     UPDATE_SINGLE,
+    UPDATE_FUTURE,
     WORKFLOW_STATE,
     get_max_recurrent_events,
+    get_schedule_days,
     update_post_item,
     set_ingested_event_state,
     is_valid_event_planning_reason,
+    get_virtual_recurring_series_enabled,
 )
 from planning.item_lock import LOCK_USER, LOCK_SESSION, LOCK_ACTION
+from planning.bulk import bulk_update
+from .events_virtual_series import expand_virtual_series, get_series_master, save_virtual_series
+
+TIMELINE_SLICES = ("historic", "past", "future")
+
+
+def get_recurring_timeline_query(selected, excluded_states, slices, selected_start, now):
+    """Returns the Mongo query for the slices of the series timeline
+
+    The query uses the (recurrence_id, state, dates.start) index on the ``events`` collection.
+    """
+
+    query = {
+        "recurrence_id": selected["recurrence_id"],
+        config.ID_FIELD: {"$ne": selected[config.ID_FIELD]},
+    }
+    if excluded_states:
+        query["state"] = {"$nin": excluded_states}
+
+    if set(TIMELINE_SLICES).issubset(slices):
+        return query
+
+    conditions = []
+    if "historic" in slices:
+        conditions.append({"dates.end": {"$lt": now}})
+    if "past" in slices:
+        conditions.append({"dates.end": {"$gte": now}, "dates.start": {"$lt": selected_start}})
+    if "future" in slices:
+        conditions.append({"dates.end": {"$gte": now}, "dates.start": {"$gt": selected_start}})
+
+    if len(conditions) == 1:
+        query.update(conditions[0])
+    else:
+        query["$or"] = conditions
+
+    return query
 
 
 class EventsBaseService(BaseService):
@@ -169,6 +209,10 @@ class EventsBaseService(BaseService):
     def set_planning_schedule(event):
         if event and event.get("dates") and event["dates"].get("start"):
             event["_planning_schedule"] = [{"scheduled": event["dates"]["start"]}]
+            event["_schedule_days"] = get_schedule_days([(event["dates"]["start"], event["dates"].get("end"))])
+
+        if event and event.get(config.ID_FIELD):
+            event["_combined_id"] = event[config.ID_FIELD]
 
     @staticmethod
     def push_notification(name, updates, original):
@@ -215,6 +259,9 @@ class EventsBaseService(BaseService):
         rescheduled=False,
         cancelled=False,
         postponed=False,
+        for_update=False,
+        slices=None,
+        projection=None,
     ):
         """Utility method to get all events in the series
 
@@ -222,7 +269,22 @@ class EventsBaseService(BaseService):
         Historic: event.dates.start < utcnow()
         Past: utcnow() < event.dates.start < selected.dates.start
         Future: event.dates.start > selected.dates.start
+
+        The split is performed by the database query, so if only some of these are required,
+        provide them in ``slices`` (i.e. ``slices=["future"]``) and the others are returned empty.
+        A Mongo ``projection`` can also be provided, in which case ``dates`` is always included.
+
+        If the series is a virtual series, the occurrences that haven't been saved yet are
+        expanded and returned without being saved. Provide ``for_update=True`` if the caller is going
+        to action the Events, in which case these occurrences are saved first.
         """
+        virtual_events = []
+        if get_virtual_recurring_series_enabled():
+            if for_update:
+                save_virtual_series(selected)
+            else:
+                virtual_events = expand_virtual_series(get_series_master(selected["recurrence_id"]))
+
         excluded_states = []
 
         if not spiked:
@@ -234,41 +296,54 @@ class EventsBaseService(BaseService):
         if not postponed:
             excluded_states.append(WORKFLOW_STATE.POSTPONED)
 
-        query = {
-            "$and": [
-                {"recurrence_id": selected["recurrence_id"]},
-                {"_id": {"$ne": selected[config.ID_FIELD]}},
-            ]
-        }
-
-        if excluded_states:
-            query["$and"].append({"state": {"$nin": excluded_states}})
-
-        sort = '[("dates.start", 1)]'
-        max_results = get_max_recurrent_events()
-        selected_start = selected.get("dates", {}).get("start", utcnow())
+        slices = set(slices or TIMELINE_SLICES)
+        now = utcnow()
+        selected_start = selected.get("dates", {}).get("start", now)
 
         # Make sure we are working with a datetime instance
         if not isinstance(selected_start, datetime):
             selected_start = datetime.strptime(selected_start, "%Y-%m-%dT%H:%M:%S%z")
 
+        query = get_recurring_timeline_query(selected, excluded_states, slices, selected_start, now)
+        if projection:
+            projection = dict(projection)
+            projection.update({"dates": 1, "recurrence_id": 1, "state": 1})
+
         historic = []
         past = []
         future = []
 
-        for event in self.get_series(query, sort, max_results):
+        series = self.get_from_mongo(req=None, lookup=query, projection=projection).sort("dates.start", 1)
+        if virtual_events:
+            series = sorted(
+                itertools.chain(
+                    series,
+                    [
+                        event
+                        for event in virtual_events
+                        if event[config.ID_FIELD] != selected[config.ID_FIELD]
+                        and event.get("state") not in excluded_states
+                    ],
+                ),
+                key=lambda event: event["dates"]["start"],
+            )
+
+        for event in series:
             event["dates"]["end"] = event["dates"]["end"]
             event["dates"]["start"] = event["dates"]["start"]
             for sched in event.get("_planning_schedule", []):
                 sched["scheduled"] = sched["scheduled"]
             end = event["dates"]["end"]
             start = event["dates"]["start"]
-            if end < utcnow():
-                historic.append(event)
+            if end < now:
+                if "historic" in slices:
+                    historic.append(event)
             elif start < selected_start:
-                past.append(event)
+                if "past" in slices:
+                    past.append(event)
             elif start > selected_start:
-                future.append(event)
+                if "future" in slices:
+                    future.append(event)
 
         return historic, past, future
 
@@ -280,6 +355,68 @@ class EventsBaseService(BaseService):
     def has_planning_items(doc):
         return EventsBaseService.get_plannings_for_event(doc).count() > 0
 
+    @staticmethod
+    def get_plannings_for_events(events):
+        """Returns the Planning items for the provided Events using a single query, grouped by Event ID"""
+
+        plannings = {}
+        if not events:
+            return plannings
+
+        for plan in get_resource_service("planning").get_from_mongo(
+            req=None, lookup={"event_item": {"$in": [event[config.ID_FIELD] for event in events]}}
+        ):
+            plannings.setdefault(plan["event_item"], []).append(plan)
+
+        return plannings
+
+    def get_series_action_events(self, original, update_method, **timeline_kwargs):
+        """Returns the Events in the series that the action is to be applied to
+
+        Historic Events, i.e. Events that have already occurred, are not included.
+        If the selected Event is the first one, then this acts as if we're changing future Events.
+        """
+
+        historic, past, future = self.get_recurring_timeline(original, for_update=True, **timeline_kwargs)
+        if len(historic) == 0 and len(past) == 0:
+            update_method = UPDATE_FUTURE
+
+        return future if update_method == UPDATE_FUTURE else past + future
+
+    def apply_series_action(self, items, on_updated=None, update_post=True):
+        """Apply the ``(updates, original)`` pairs of an action against a series using bulk writes
+
+        This replaces patching each Event in the series, so there is one write to Mongo & Elastic
+        for the entire series, and the history is written using a single insert.
+        The caller is responsible for sending the (single) notification for the action.
+
+        :param items: List of ``(updates, original)`` pairs to apply
+        :param on_updated: Called with ``(updates, original)`` of each Event, used to record history
+        :param update_post: If ``True``, re-posts Events that have already been posted
+        :return: The list of ``updates`` applied, with the new ``_etag`` for each
+        """
+
+        if not items:
+            return []
+
+        user_id = get_user_id()
+        for updates, original in items:
+            if user_id:
+                updates["version_creator"] = user_id
+                set_ingested_event_state(updates, original)
+
+        bulk_update("events", items)
+
+        with get_resource_service("events_history").batch():
+            for updates, original in items:
+                if on_updated is not None:
+                    on_updated(updates, original)
+
+                if update_post and original.get("pubstatus"):
+                    update_post_item(updates, original)
+
+        return [updates for updates, _original in items]
+
     @staticmethod
     def is_event_in_use(event):
         return EventsBaseService.has_planning_items(event) or (event.get("pubstatus") or "") != ""
@@ -13,10 +13,10 @@ from superdesk.notification import push_notification
 from eve.utils import config
 from apps.archive.common import get_user, get_auth
 from planning.common import (
-    UPDATE_FUTURE,
     WORKFLOW_STATE,
     remove_lock_information,
     set_actioned_date_to_event,
+    get_recurring_bulk_writes_enabled,
 )
 from copy import deepcopy
 from .events import EventsResource, events_schema
@@ -92,12 +92,13 @@ class EventsCancelService(EventsBaseService):
         pass
 
     @staticmethod
-    def _cancel_event_plannings(updates, original):
+    def _cancel_event_plannings(updates, original, plans=None):
         planning_service = get_resource_service("planning")
         planning_cancel_service = get_resource_service("planning_cancel")
         reason = updates.get("reason", None)
 
-        plans = list(planning_service.find(where={"event_item": original[config.ID_FIELD]}))
+        if plans is None:
+            plans = list(planning_service.find(where={"event_item": original[config.ID_FIELD]}))
         for plan in plans:
             if plan.get("state") != WORKFLOW_STATE.CANCELLED:
                 request.view_args["event_cancellation"] = True
@@ -123,20 +124,35 @@ class EventsCancelService(EventsBaseService):
 
     def update_recurring_events(self, updates, original, update_method):
         occur_cancel_state = self._get_cancel_state()
-        historic, past, future = self.get_recurring_timeline(original, postponed=True)
-
-        # Determine if the selected event is the first one, if so then
-        # act as if we're changing future events
-        if len(historic) == 0 and len(past) == 0:
-            update_method = UPDATE_FUTURE
-
-        if update_method == UPDATE_FUTURE:
-            cancelled_events = future
-        else:
-            cancelled_events = past + future
+        cancelled_events = self.get_series_action_events(original, update_method, postponed=True)
 
         self._set_event_cancelled(updates, original, occur_cancel_state)
 
+        if get_recurring_bulk_writes_enabled():
+            plannings = self.get_plannings_for_events(cancelled_events + [original])
+            items = []
+            with get_resource_service("planning_history").batch():
+                for event in cancelled_events:
+                    new_updates = deepcopy(updates)
+                    if plannings.get(event[config.ID_FIELD]):
+                        # Cancel the planning item also as it is in use
+                        self._cancel_event_plannings(new_updates, event, plannings[event[config.ID_FIELD]])
+
+                    if self.validate_states(event):
+                        new_updates.pop("reason", None)
+                        items.append((new_updates, event))
+
+                events_history = get_resource_service("events_history")
+                self.apply_series_action(items, events_history.on_cancel)
+
+                if plannings.get(original[config.ID_FIELD]) or original.get("pubstatus"):
+                    self._cancel_event_plannings(updates, original, plannings.get(original[config.ID_FIELD]) or [])
+
+            updates["_cancelled_events"] = [
+                {"_id": event[config.ID_FIELD], "_etag": new_updates["_etag"]} for new_updates, event in items
+            ]
+            return
+
         notifications = []
 
         for event in cancelled_events:
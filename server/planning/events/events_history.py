@@ -34,16 +34,27 @@ class EventsHistoryService(HistoryService):
     def on_item_created(self, items, operation=None):
         created_from_planning = []
         regular_events = []
+
+        # Load the Planning items for all Events at once, instead of one query per Event
+        planning_ids = {}
+        if items:
+            planning_items = get_resource_service("planning").get_from_mongo(
+                req=None,
+                lookup={"event_item": {"$in": [item[config.ID_FIELD] for item in items]}},
+            )
+            for plan in planning_items:
+                planning_ids.setdefault(plan["event_item"], plan[config.ID_FIELD])
+
         for item in items:
-            planning_items = get_resource_service("events").get_plannings_for_event(item)
-            if planning_items.count() > 0:
-                item["created_from_planning"] = planning_items[0].get("_id")
+            if planning_ids.get(item[config.ID_FIELD]):
+                item["created_from_planning"] = planning_ids[item[config.ID_FIELD]]
                 created_from_planning.append(item)
             else:
                 regular_events.append((item))
 
-        super().on_item_created(created_from_planning, "created_from_planning")
-        super().on_item_created(regular_events)
+        with self.batch():
+            super().on_item_created(created_from_planning, "created_from_planning")
+            super().on_item_created(regular_events)
 
     def on_item_deleted(self, doc):
         lookup = {"event_id": doc[config.ID_FIELD]}
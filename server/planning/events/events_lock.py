@@ -54,7 +54,7 @@ class EventsLockService(BaseService):
         item = get_resource_service("events").find_one(req=None, _id=item_id)
 
         lock_service.validate_relationship_locks(item, "events")
-        updated_item = lock_service.lock(item, user_id, session_id, lock_action, "events")
+        updated_item = lock_service.lock(item, user_id, session_id, lock_action, "events", validate_relationships=True)
 
         return update_returned_document(doc, updated_item, CUSTOM_HATEOAS_EVENTS)
 
@@ -4,6 +4,7 @@ from eve.utils import config
 from superdesk import get_resource_service, logger
 from superdesk.resource import Resource, not_analyzed
 from superdesk.notification import push_notification
+from superdesk.utc import utcnow
 
 from .events import EventsResource
 from .events_base_service import EventsBaseService
@@ -16,8 +17,11 @@ from planning.common import (
     get_contacts_from_item,
     get_item_post_state,
     enqueue_planning_item,
+    enqueue_planning_items,
     get_version_item_for_post,
+    get_recurring_bulk_writes_enabled,
 )
+from planning.bulk import bulk_update
 from planning.utils import try_cast_object_id
 from planning.content_profiles.utils import is_post_planning_with_event_enabled
 
@@ -111,7 +115,7 @@ class EventsPostService(EventsBaseService):
     def _post_recurring_events(self, doc, original, update_method):
         post_to_state = doc["pubstatus"]
         historic, past, future = self.get_recurring_timeline(
-            original, cancelled=True if post_to_state == POST_STATE.CANCELLED else False
+            original, cancelled=True if post_to_state == POST_STATE.CANCELLED else False, for_update=True
         )
 
         # Determine if the selected event is the first one, if so then
@@ -124,20 +128,31 @@ class EventsPostService(EventsBaseService):
         else:
             posted_events = historic + past + [original] + future
 
-        # First we want to validate that all events can be posted
-        for event in posted_events:
-            self.validate_post_state(post_to_state)
-            self.validate_item(event)
-
-        # Next we perform the actual post
         updated_event = None
         ids = []
         items = []
         failed_planning_ids = []
-        for event in posted_events:
-            updated_event, failed_planning_ids = self.post_event(event, post_to_state, doc.get("repost_on_update"))
-            ids.append(event[config.ID_FIELD])
-            items.append({"id": event[config.ID_FIELD], "etag": updated_event["_etag"]})
+        if get_recurring_bulk_writes_enabled():
+            # Validate and post the entire series at once
+            self.validate_post_state(post_to_state)
+            self.validate_items(posted_events)
+            updated_events, failed_planning_ids = self.post_events(
+                posted_events, post_to_state, doc.get("repost_on_update")
+            )
+            for event, updated_event in zip(posted_events, updated_events):
+                ids.append(event[config.ID_FIELD])
+                items.append({"id": event[config.ID_FIELD], "etag": updated_event["_etag"]})
+        else:
+            # First we want to validate that all events can be posted
+            for event in posted_events:
+                self.validate_post_state(post_to_state)
+                self.validate_item(event)
+
+            # Next we perform the actual post
+            for event in posted_events:
+                updated_event, failed_planning_ids = self.post_event(event, post_to_state, doc.get("repost_on_update"))
+                ids.append(event[config.ID_FIELD])
+                items.append({"id": event[config.ID_FIELD], "etag": updated_event["_etag"]})
 
         # Do not send push-notification if reposting as each event's post state is different
         # The original action's notifications should refetch items
@@ -157,14 +172,26 @@ class EventsPostService(EventsBaseService):
 
         return ids, failed_planning_ids
 
-    def post_event(self, event, new_post_state, repost):
-        # update the event with new state
+    @staticmethod
+    def validate_items(docs):
+        """Validate a list of Events using a single request to the validator"""
+
+        all_errors = get_resource_service("planning_validator").post(
+            [{"validate_on_post": True, "type": "event", "validate": doc} for doc in docs]
+        )
+
+        for errors in all_errors:
+            if errors:
+                abort(400, description=errors)
+
+    @staticmethod
+    def get_post_updates(event, new_post_state, repost):
+        """Returns the updates for posting the Event, setting ``pubstatus`` on the provided Event"""
+
         if repost:
             # same pubstatus or scheduled (for draft events)
             new_post_state = event.get("pubstatus", POST_STATE.USABLE)
 
-        failed_planning_ids = []
-
         new_item_state = get_item_post_state(event, new_post_state, repost)
         updates = {"state": new_item_state, "pubstatus": new_post_state}
 
@@ -175,6 +202,69 @@ class EventsPostService(EventsBaseService):
             if not event.get("completed"):
                 updates["actioned_date"] = None
 
+        return updates
+
+    def post_events(self, events, new_post_state, repost):
+        """Post a series of Events using bulk writes
+
+        The post states are written with a single bulk update, the versions are enqueued using
+        a single task and the related Planning items are loaded using a single query.
+
+        :return: A tuple of the list of updates applied to the Events, and the failed Planning IDs
+        """
+
+        now = utcnow()
+        items = []
+        for event in events:
+            updates = self.get_post_updates(event, new_post_state, repost)
+            updates.setdefault("versioncreated", now)
+            items.append((updates, event))
+
+        bulk_update("events", items)
+
+        plannings = {}
+        for plan in get_resource_service("planning").get_from_mongo(
+            req=None, lookup={"event_item": {"$in": [event[config.ID_FIELD] for event in events]}}
+        ):
+            plannings.setdefault(plan["event_item"], []).append(plan)
+
+        published_items = []
+        events_history = get_resource_service("events_history")
+        with events_history.batch():
+            for updates, event in items:
+                event.update(updates)
+
+                # these fields are set for enqueue process to work. otherwise not needed
+                version, event = get_version_item_for_post(event)
+                history_updates = updates.copy()
+                history_updates["version"] = version
+                events_history._save_history(event, history_updates, "post")
+
+                event["plans"] = [p.get("_id") for p in plannings.get(event[config.ID_FIELD]) or []]
+                published_items.append(self.get_published_item(event, version))
+
+        version_ids = get_resource_service("published_planning").post(published_items)
+        if version_ids:
+            # Asynchronously enqueue the items for publishing.
+            enqueue_planning_items.apply_async(kwargs={"ids": version_ids}, serializer="eve/json")
+        else:
+            logger.error("Failed to save planning versions for recurring events {}".format(events[0]["recurrence_id"]))
+
+        failed_planning_ids = []
+        for updates, event in items:
+            if plannings.get(event[config.ID_FIELD]):
+                failed_planning_ids.extend(
+                    self.post_related_plannings(plannings[event[config.ID_FIELD]], updates["pubstatus"]) or []
+                )
+
+        return [updates for updates, _event in items], failed_planning_ids
+
+    def post_event(self, event, new_post_state, repost):
+        # update the event with new state
+        failed_planning_ids = []
+        updates = self.get_post_updates(event, new_post_state, repost)
+        new_post_state = updates["pubstatus"]
+
         updated_event = get_resource_service("events").update(event["_id"], updates, event)
         event.update(updated_event)
 
@@ -195,21 +285,21 @@ class EventsPostService(EventsBaseService):
 
         return updated_event, failed_planning_ids
 
-    def publish_event(self, event, version):
+    @staticmethod
+    def get_published_item(event, version):
         # check and remove private contacts while posting event, only public contact will be visible
         event["event_contact_info"] = [try_cast_object_id(contact["_id"]) for contact in get_contacts_from_item(event)]
 
+        return {
+            "item_id": event["_id"],
+            "version": version,
+            "type": "event",
+            "published_item": event,
+        }
+
+    def publish_event(self, event, version):
         """Enqueue the items for publish"""
-        version_id = get_resource_service("published_planning").post(
-            [
-                {
-                    "item_id": event["_id"],
-                    "version": version,
-                    "type": "event",
-                    "published_item": event,
-                }
-            ]
-        )
+        version_id = get_resource_service("published_planning").post([self.get_published_item(event, version)])
         if version_id:
             # Asynchronously enqueue the item for publishing.
             enqueue_planning_item.apply_async(kwargs={"id": version_id[0]}, serializer="eve/json")
@@ -13,10 +13,10 @@ from superdesk.notification import push_notification
 from eve.utils import config
 from apps.archive.common import get_user, get_auth
 from planning.common import (
-    UPDATE_FUTURE,
     WORKFLOW_STATE,
     remove_lock_information,
     set_actioned_date_to_event,
+    get_recurring_bulk_writes_enabled,
 )
 from copy import deepcopy
 from .events import EventsResource, events_schema
@@ -83,12 +83,13 @@ class EventsPostponeService(EventsBaseService):
         pass
 
     @staticmethod
-    def _postpone_event_plannings(updates, original):
+    def _postpone_event_plannings(updates, original, plans=None):
         planning_service = get_resource_service("planning")
         planning_postpone_service = get_resource_service("planning_postpone")
         reason = updates.get("reason", None)
 
-        plans = list(planning_service.find(where={"event_item": original[config.ID_FIELD]}))
+        if plans is None:
+            plans = list(planning_service.find(where={"event_item": original[config.ID_FIELD]}))
         for plan in plans:
             if plan.get("state") != WORKFLOW_STATE.CANCELLED:
                 updated_plan = planning_postpone_service.patch(plan[config.ID_FIELD], {"reason": reason})
@@ -102,20 +103,28 @@ class EventsPostponeService(EventsBaseService):
         updates["state_reason"] = reason
 
     def update_recurring_events(self, updates, original, update_method):
-        historic, past, future = self.get_recurring_timeline(original)
-
-        # Determine if the selected event is the first one, if so then
-        # act as if we're changing future events
-        if len(historic) == 0 and len(past) == 0:
-            update_method = UPDATE_FUTURE
-
-        if update_method == UPDATE_FUTURE:
-            postponed_events = future
-        else:
-            postponed_events = past + future
+        postponed_events = self.get_series_action_events(original, update_method)
 
         self._set_event_postponed(updates)
 
+        if get_recurring_bulk_writes_enabled():
+            plannings = self.get_plannings_for_events(postponed_events + [original])
+            items = []
+            with get_resource_service("planning_history").batch():
+                for event in postponed_events:
+                    new_updates = deepcopy(updates)
+
+                    # Mark the Event as being Postponed
+                    self._postpone_event_plannings(new_updates, event, plannings.get(event[config.ID_FIELD]) or [])
+                    new_updates.pop("reason", None)
+                    set_actioned_date_to_event(new_updates, event)
+                    items.append((new_updates, event))
+
+                # Only the selected Event records the postpone history, same as patching each Event
+                self.apply_series_action(items)
+                self._postpone_event_plannings(updates, original, plannings.get(original[config.ID_FIELD]) or [])
+            return
+
         for event in postponed_events:
             new_updates = deepcopy(updates)
 
@@ -19,14 +19,15 @@ from planning.common import (
     remove_lock_information,
     set_original_creator,
     set_actioned_date_to_event,
+    get_recurring_bulk_writes_enabled,
 )
 from copy import deepcopy
 from .events import EventsResource, events_schema, generate_recurring_dates
 from flask import current_app as app
-import pytz
 from datetime import datetime
 from itertools import islice
 from .events_base_service import EventsBaseService
+from .recurrence import get_recurring_rule_params
 
 event_reschedule_schema = deepcopy(events_schema)
 event_reschedule_schema["reason"] = {
@@ -139,6 +140,11 @@ class EventsRescheduleService(EventsBaseService):
         return created_event
 
     def update_recurring_events(self, updates, original, update_method):
+        # Write the history of the Events and Planning items in the series using a single insert each
+        with get_resource_service("events_history").batch(), get_resource_service("planning_history").batch():
+            self._reschedule_recurring_events(updates, original, update_method)
+
+    def _reschedule_recurring_events(self, updates, original, update_method):
         remove_lock_information(updates)
 
         rules_changed = updates["dates"]["recurring_rule"] != original["dates"]["recurring_rule"]
@@ -149,7 +155,7 @@ class EventsRescheduleService(EventsBaseService):
         reason = updates.pop("reason", None)
 
         events_service = get_resource_service("events")
-        historic, past, future = self.get_recurring_timeline(original, postponed=True)
+        historic, past, future = self.get_recurring_timeline(original, postponed=True, for_update=True)
 
         # Determine if the selected event is the first one, if so then
         # act as if we're changing future events
@@ -183,9 +189,8 @@ class EventsRescheduleService(EventsBaseService):
             for date in islice(
                 generate_recurring_dates(
                     start=new_start_date,
-                    tz=updates["dates"].get("tz") and pytz.timezone(updates["dates"]["tz"] or None),
                     date_only=True,
-                    **updated_rule,
+                    **get_recurring_rule_params(updates["dates"], updated_rule),
                 ),
                 0,
                 200,
@@ -198,9 +203,8 @@ class EventsRescheduleService(EventsBaseService):
             for date in islice(
                 generate_recurring_dates(
                     start=original_start_date,
-                    tz=original["dates"].get("tz") and pytz.timezone(original["dates"]["tz"] or None),
                     date_only=True,
-                    **original_rule,
+                    **get_recurring_rule_params(original["dates"], original_rule),
                 ),
                 0,
                 200,
@@ -209,7 +213,15 @@ class EventsRescheduleService(EventsBaseService):
 
         self.set_next_occurrence(updates)
 
-        dates_processed = []
+        bulk_writes = get_recurring_bulk_writes_enabled()
+
+        # Load the Planning items for the entire series using a single query
+        plannings = self.get_plannings_for_events(rescheduled_events)
+
+        new_dates_set = set(new_dates)
+        original_dates = set(original_dates)
+        dates_processed = set()
+        items = []
 
         # Iterate over the current events in the series and delete/spike
         # or update the event accordingly
@@ -221,7 +233,7 @@ class EventsRescheduleService(EventsBaseService):
                 event_date = event["dates"]["start"].replace(tzinfo=None).date()
             # If the event does not occur in the new dates, then we need to either
             # delete or spike this event
-            if event_date not in new_dates:
+            if event_date not in new_dates_set:
                 # Add it to the list of events to delete or spike
                 # This is done later so that we can perform a single
                 # query against mongo, rather than one per deleted event
@@ -231,7 +243,7 @@ class EventsRescheduleService(EventsBaseService):
             # This occurs when the selected Event is being updated to an Event that already exists
             # in another Event in the series.
             # This stops multiple Events to occur on the same day
-            elif event_date in new_dates and event_date in dates_processed:
+            elif event_date in dates_processed:
                 deleted_events[event[config.ID_FIELD]] = event
 
             # Otherwise this Event does occur in the new dates
@@ -239,13 +251,14 @@ class EventsRescheduleService(EventsBaseService):
                 # Because this Event occurs in the new dates, then we are not to set the state to 'rescheduled',
                 # instead we set it to either 'scheduled' (if public) or 'draft' (if not public)
                 new_state = WORKFLOW_STATE.SCHEDULED if event.get("pubstatus") else WORKFLOW_STATE.DRAFT
+                event_plans = plannings.get(event[config.ID_FIELD], [])
 
                 # If this is the selected Event, then simply update the fields and
                 # Reschedule associated Planning items
                 if event[config.ID_FIELD] == original[config.ID_FIELD]:
                     self._mark_event_rescheduled(updates, reason, True)
                     updates["state"] = new_state
-                    self._reschedule_event_plannings(event, reason, state=WORKFLOW_STATE.DRAFT)
+                    self._reschedule_event_plannings(event, reason, event_plans, state=WORKFLOW_STATE.DRAFT)
 
                 else:
                     new_updates = {"reason": reason, "skip_on_update": True}
@@ -255,19 +268,23 @@ class EventsRescheduleService(EventsBaseService):
                     # Update the 'start', 'end' and 'recurring_rule' fields of the Event
                     if rules_changed or times_changed:
                         new_updates["state"] = new_state
-                        new_updates["dates"] = event["dates"]
+                        new_updates["dates"] = deepcopy(event["dates"])
                         new_updates["dates"]["start"] = datetime.combine(event_date, updates["dates"]["start"].time())
                         new_updates["dates"]["end"] = new_updates["dates"]["start"] + time_delta
                         new_updates["dates"]["recurring_rule"] = updates["dates"]["recurring_rule"]
                         self.set_planning_schedule(new_updates)
 
                     # And finally update the Event, and Reschedule associated Planning items
-                    self.patch(event[config.ID_FIELD], new_updates)
-                    self._reschedule_event_plannings(event, reason, state=WORKFLOW_STATE.DRAFT)
-                    app.on_updated_events_reschedule(new_updates, {"_id": event[config.ID_FIELD]})
+                    if bulk_writes:
+                        new_updates.pop("skip_on_update")
+                        items.append((new_updates, event))
+                    else:
+                        self.patch(event[config.ID_FIELD], new_updates)
+                        app.on_updated_events_reschedule(new_updates, {"_id": event[config.ID_FIELD]})
+                    self._reschedule_event_plannings(event, reason, event_plans, state=WORKFLOW_STATE.DRAFT)
 
                 # Mark this date as being already processed
-                dates_processed.append(event_date)
+                dates_processed.add(event_date)
 
         # Create new events that do not fall on the original occurrence dates
         new_events = []
@@ -304,8 +321,11 @@ class EventsRescheduleService(EventsBaseService):
             app.on_inserted_events(new_events)
 
         # Iterate over the events to delete/spike
-        self._set_events_planning(deleted_events)
+        for event_id, event in deleted_events.items():
+            if plannings.get(event_id):
+                event["_plans"] = plannings[event_id]
 
+        removed_events = []
         for event in deleted_events.values():
             event_plans = event.get("_plans", [])
             is_original = event[config.ID_FIELD] == original[config.ID_FIELD]
@@ -317,19 +337,36 @@ class EventsRescheduleService(EventsBaseService):
                     # all Planning items
                     new_updates = {"skip_on_update": True, "reason": reason}
                     self._mark_event_rescheduled(new_updates, reason)
-                    self.patch(event[config.ID_FIELD], new_updates)
+                    if bulk_writes:
+                        new_updates.pop("skip_on_update")
+                        items.append((new_updates, event))
+                    else:
+                        self.patch(event[config.ID_FIELD], new_updates)
 
                 if len(event_plans) > 0:
                     self._reschedule_event_plannings(original, reason, event_plans)
             else:
                 # This event has no Planning items, therefor we can safely
                 # delete this event
-                events_service.delete_action(lookup={"_id": event[config.ID_FIELD]})
-                app.on_deleted_item_events(event)
+                removed_events.append(event)
 
                 if is_original:
                     updates["_deleted"] = True
 
+        if bulk_writes:
+            if removed_events:
+                events_service.delete_action(
+                    lookup={config.ID_FIELD: {"$in": [event[config.ID_FIELD] for event in removed_events]}}
+                )
+                for event in removed_events:
+                    app.on_deleted_item_events(event)
+
+            self.apply_series_action(items, app.on_updated_events_reschedule)
+        else:
+            for event in removed_events:
+                events_service.delete_action(lookup={"_id": event[config.ID_FIELD]})
+                app.on_deleted_item_events(event)
+
     @staticmethod
     def set_next_occurrence(updates):
         new_dates = [
@@ -337,8 +374,7 @@ class EventsRescheduleService(EventsBaseService):
             for date in islice(
                 generate_recurring_dates(
                     start=updates["dates"]["start"],
-                    tz=updates["dates"].get("tz") and pytz.timezone(updates["dates"]["tz"] or None),
-                    **updates["dates"]["recurring_rule"],
+                    **get_recurring_rule_params(updates["dates"]),
                 ),
                 0,
                 10,
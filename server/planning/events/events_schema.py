@@ -52,6 +52,24 @@ events_schema = {
         "mapping": not_analyzed,
         "nullable": True,
     },
+    # The master of a virtual recurring series (see ``PLANNING_VIRTUAL_RECURRING_SERIES``)
+    "virtual_series": {
+        "type": "dict",
+        "nullable": True,
+        "schema": {
+            "start": {"type": "datetime"},
+            "end": {"type": "datetime"},
+            "template": {"type": "dict", "allow_unknown": True},
+        },
+        "mapping": {
+            "type": "object",
+            "dynamic": False,
+            "properties": {
+                "start": {"type": "date"},
+                "end": {"type": "date"},
+            },
+        },
+    },
     # Audit Information
     "original_creator": original_creator_schema,
     "version_creator": metadata_schema["version_creator"],
@@ -148,6 +166,7 @@ events_schema = {
                 },
             },
             "ex_date": {"type": "list", "mapping": {"type": "date"}},
+            "r_date": {"type": "list", "mapping": {"type": "date"}},
             "ex_rule": {
                 "type": "dict",
                 "schema": {
@@ -163,6 +182,12 @@ events_schema = {
             },
         },
     },  # end dates
+    # This is a extra field so that we can group Planning items under their Event in the combined view.
+    # It will store the _id of the event.
+    "_combined_id": {"type": "string", "mapping": not_analyzed},
+    # This is a extra field so that the common date filters can be searched using a terms query.
+    # It will store the local dates (in DEFAULT_TIMEZONE) the event spans.
+    "_schedule_days": {"type": "list", "mapping": not_analyzed},
     # This is a extra field so that we can sort in the combined view of events and planning.
     # It will store the dates.start of the event.
     "_planning_schedule": {
@@ -15,10 +15,10 @@ from planning.common import (
     ITEM_EXPIRY,
     ITEM_STATE,
     set_item_expiry,
-    UPDATE_FUTURE,
     WORKFLOW_STATE,
     remove_lock_information,
     remove_autosave_on_spike,
+    get_recurring_bulk_writes_enabled,
 )
 from superdesk.notification import push_notification
 from apps.auth import get_user, get_user_id, get_auth
@@ -139,22 +139,32 @@ class EventsSpikeService(EventsBaseService):
         # Ensure that no other Event or Planning item is currently locked
         events_with_plans = self._validate_recurring(original, original["recurrence_id"])
 
-        historic, past, future = self.get_recurring_timeline(original, postponed=True, cancelled=True)
+        spiked_events = self.get_series_action_events(original, update_method, postponed=True, cancelled=True)
 
         # Mark item as unlocked directly in order to avoid more queries and notifications
         # coming from lockservice.
         remove_lock_information(updates)
         self._spike_event(updates, original)
 
-        # Determine if the selected event is the first one, if so then
-        # act as if we're changing future events
-        if len(historic) == 0 and len(past) == 0:
-            update_method = UPDATE_FUTURE
-
-        if update_method == UPDATE_FUTURE:
-            spiked_events = future
-        else:
-            spiked_events = past + future
+        if get_recurring_bulk_writes_enabled():
+            items = []
+            for event in spiked_events:
+                if self._can_spike(event, events_with_plans):
+                    new_updates = {}
+                    self._spike_event(new_updates, event)
+                    items.append((new_updates, event))
+
+            # Events with Planning items are not spiked, so there are no Planning items to spike here
+            self.apply_series_action(items, app.on_updated_events_spike, update_post=False)
+            updates["_spiked_items"] = [
+                {
+                    "id": event[config.ID_FIELD],
+                    "etag": new_updates["_etag"],
+                    "revert_state": new_updates["revert_state"],
+                }
+                for new_updates, event in items
+            ]
+            return
 
         notifications = []
         for event in spiked_events:
@@ -255,20 +265,29 @@ class EventsUnspikeService(EventsBaseService):
         self._unspike_event(updates, original)
 
     def update_recurring_events(self, updates, original, update_method):
-        historic, past, future = self.get_recurring_timeline(original, spiked=True)
+        unspiked_events = self.get_series_action_events(original, update_method, spiked=True)
 
         remove_lock_information(updates)
         self._unspike_event(updates, original)
 
-        # Determine if the selected event is the first one, if so then
-        # act as if we're changing future events
-        if len(historic) == 0 and len(past) == 0:
-            update_method = UPDATE_FUTURE
+        if get_recurring_bulk_writes_enabled():
+            items = []
+            for event in unspiked_events:
+                if event.get(ITEM_STATE) == WORKFLOW_STATE.SPIKED:
+                    new_updates = {}
+                    self._unspike_event(new_updates, event)
+                    items.append((new_updates, event))
 
-        if update_method == UPDATE_FUTURE:
-            unspiked_events = future
-        else:
-            unspiked_events = past + future
+            self.apply_series_action(items, app.on_updated_events_unspike, update_post=False)
+            updates["_unspiked_items"] = [
+                {
+                    "id": event[config.ID_FIELD],
+                    "etag": new_updates["_etag"],
+                    "state": event.get("revert_state", WORKFLOW_STATE.DRAFT),
+                }
+                for new_updates, event in items
+            ]
+            return
 
         notifications = []
         for event in unspiked_events:
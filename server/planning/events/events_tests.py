@@ -7,7 +7,15 @@ from superdesk.utc import utcnow
 from planning.tests import TestCase
 from planning.common import format_address, POST_STATE
 from planning.item_lock import LockService
-from planning.events.events import generate_recurring_dates
+from planning.bulk import get_collection
+from planning.events.events import generate_recurring_dates, generate_recurring_events as generate_series
+from planning.events.recurrence import diff_recurring_dates, get_recurrence_cache_info, clear_recurrence_cache
+from planning.events.events_virtual_series import (
+    expand_virtual_series,
+    get_occurrence_id,
+    parse_occurrence_id,
+    save_virtual_series,
+)
 from werkzeug.exceptions import BadRequest
 
 
@@ -104,6 +112,78 @@ class EventTestCase(TestCase):
             ],
         )
 
+    def test_recurring_dates_rruleset(self):
+        # Daily for a week, excluding the 3rd & 5th, and including the 10th
+        self.assertEqual(
+            list(
+                generate_recurring_dates(
+                    start=datetime(2016, 1, 1, 15, 0),
+                    frequency="DAILY",
+                    count=7,
+                    endRepeatMode="count",
+                    ex_date=[datetime(2016, 1, 3, 15, 0), datetime(2016, 1, 5, 15, 0)],
+                    r_date=[datetime(2016, 1, 10, 15, 0)],
+                )
+            ),
+            [
+                datetime(2016, 1, 1, 15, 0),
+                datetime(2016, 1, 2, 15, 0),
+                datetime(2016, 1, 4, 15, 0),
+                datetime(2016, 1, 6, 15, 0),
+                datetime(2016, 1, 7, 15, 0),
+                datetime(2016, 1, 10, 15, 0),
+            ],
+        )
+
+        # Every weekday for 2 weeks, excluding Fridays
+        self.assertEqual(
+            list(
+                generate_recurring_dates(
+                    start=datetime(2016, 1, 4),
+                    frequency="WEEKLY",
+                    byday="MO TU WE TH FR",
+                    count=2,
+                    endRepeatMode="count",
+                    ex_rule={"frequency": "WEEKLY", "interval": "1", "byday": "FR", "count": 2},
+                )
+            ),
+            [
+                datetime(2016, 1, 4),
+                datetime(2016, 1, 5),
+                datetime(2016, 1, 6),
+                datetime(2016, 1, 7),
+                datetime(2016, 1, 11),
+                datetime(2016, 1, 12),
+                datetime(2016, 1, 13),
+                datetime(2016, 1, 14),
+            ],
+        )
+
+    def test_recurring_dates_cache(self):
+        clear_recurrence_cache()
+        rule = dict(start=datetime(2016, 1, 1), frequency="DAILY", count=500, endRepeatMode="count")
+
+        first = list(generate_recurring_dates(**rule))
+        second = list(generate_recurring_dates(**rule))
+        self.assertEqual(first, second)
+        self.assertEqual(500, len(first))
+
+        cache_info = get_recurrence_cache_info()
+        self.assertEqual(1, cache_info.misses)
+        self.assertEqual(1, cache_info.hits)
+
+        # Changing the timezone expands the rule again
+        list(generate_recurring_dates(tz=pytz.timezone("Europe/Berlin"), **rule))
+        self.assertEqual(2, get_recurrence_cache_info().misses)
+
+    def test_diff_recurring_dates(self):
+        original = [datetime(2016, 1, day) for day in range(1, 6)]
+        updated = [datetime(2016, 1, day) for day in range(3, 9)]
+
+        removed, added = diff_recurring_dates(original, updated)
+        self.assertEqual([datetime(2016, 1, 1), datetime(2016, 1, 2)], removed)
+        self.assertEqual([datetime(2016, 1, 6), datetime(2016, 1, 7), datetime(2016, 1, 8)], added)
+
     def test_get_recurring_timeline(self):
         with self.app.app_context():
             generated_events = generate_recurring_events(10)
@@ -135,6 +215,103 @@ class EventTestCase(TestCase):
                 self.assertEquals(e["dates"]["start"], expected_time)
                 expected_time += timedelta(days=1)
 
+            (historic, past, future) = service.get_recurring_timeline(
+                selected, slices=["future"], projection={"name": 1}
+            )
+            self.assertEqual(0, len(historic))
+            self.assertEqual(0, len(past))
+            self.assertEqual(4, len(future))
+            self.assertEqual(["Event 6", "Event 7", "Event 8", "Event 9"], [e["name"] for e in future])
+            self.assertNotIn("calendars", future[0])
+
+    def test_generate_recurring_events_from_template(self):
+        with self.app.app_context():
+            start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+            event = {
+                "name": "Daily Club",
+                "lock_user": "user1",
+                "pubstatus": "usable",
+                "_planning_schedule": [{"scheduled": start}],
+                "embedded_planning": [{"coverages": []}],
+                "dates": {
+                    "start": start,
+                    "end": start + timedelta(hours=2),
+                    "tz": "UTC",
+                    "recurring_rule": {
+                        "frequency": "DAILY",
+                        "interval": 1,
+                        "count": 3,
+                        "endRepeatMode": "count",
+                    },
+                },
+            }
+
+            events = generate_series(event)
+            self.assertEqual(3, len(events))
+            self.assertEqual(3, len({e["_id"] for e in events}))
+            self.assertEqual({events[0]["_id"]}, {e["recurrence_id"] for e in events})
+            self.assertIn("embedded_planning", events[0])
+
+            for index, e in enumerate(events):
+                self.assertNotIn("lock_user", e)
+                self.assertNotIn("pubstatus", e)
+                if index > 0:
+                    self.assertNotIn("embedded_planning", e)
+                self.assertEqual(e["dates"]["start"], (start + timedelta(days=index)).replace(tzinfo=None))
+                self.assertEqual(e["_planning_schedule"], [{"scheduled": e["dates"]["start"]}])
+
+    def test_virtual_recurring_series(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_VIRTUAL_RECURRING_SERIES"] = True
+            start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+            service = get_resource_service("events")
+            service.post(
+                [
+                    {
+                        "guid": "123",
+                        "name": "Daily Club",
+                        "dates": {
+                            "start": start,
+                            "end": start + timedelta(hours=2),
+                            "tz": "UTC",
+                            "recurring_rule": {
+                                "frequency": "DAILY",
+                                "interval": 1,
+                                "count": 5,
+                                "endRepeatMode": "count",
+                            },
+                        },
+                    }
+                ]
+            )
+
+            master = service.find_one(req=None, name="Daily Club")
+            recurrence_id = master["recurrence_id"]
+            self.assertEqual(1, service.find(where={"recurrence_id": recurrence_id}).count())
+            self.assertIsNotNone(master["virtual_series"])
+
+            occurrences = expand_virtual_series(master)
+            self.assertEqual(4, len(occurrences))
+            occurrence_id = get_occurrence_id(recurrence_id, start + timedelta(days=2))
+            self.assertEqual(occurrence_id, occurrences[1]["_id"])
+            self.assertEqual(
+                (recurrence_id, (start + timedelta(days=2)).replace(tzinfo=None)), parse_occurrence_id(occurrence_id)
+            )
+
+            occurrence = service.find_one(req=None, _id=occurrence_id)
+            self.assertEqual("Daily Club", occurrence["name"])
+            self.assertEqual(recurrence_id, occurrence["recurrence_id"])
+            self.assertEqual(start + timedelta(days=2), occurrence["dates"]["start"])
+
+            # Read only timeline includes the virtual occurrences without saving them
+            historic, past, future = service.get_recurring_timeline(master)
+            self.assertEqual([event["_id"] for event in future], [event["_id"] for event in occurrences])
+            self.assertEqual(1, service.find(where={"recurrence_id": recurrence_id}).count())
+
+            save_virtual_series(master)
+            self.assertEqual(5, service.find(where={"recurrence_id": recurrence_id}).count())
+            self.assertIsNone(service.find_one(req=None, _id=master["_id"]).get("virtual_series"))
+
     def test_create_cancelled_event(self):
         with self.app.app_context():
             service = get_resource_service("events")
@@ -308,6 +485,49 @@ class EventPlanningSchedule(TestCase):
             reschedule.is_original_event = is_original_event_func
             reschedule.REQUIRE_LOCK = True
 
+    def test_reschedule_series_history(self):
+        with self.app.app_context():
+            service = get_resource_service("events")
+            start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+            service.post(
+                [
+                    {
+                        "name": "Daily Club",
+                        "dates": {
+                            "start": start,
+                            "end": start + timedelta(hours=2),
+                            "tz": "UTC",
+                            "recurring_rule": {
+                                "frequency": "DAILY",
+                                "interval": 1,
+                                "count": 3,
+                                "endRepeatMode": "count",
+                            },
+                        },
+                    }
+                ]
+            )
+            events = sorted(service.get(req=None, lookup=None), key=lambda event: event["dates"]["start"])
+
+            schedule = deepcopy(events[0]["dates"])
+            schedule["start"] = start + timedelta(hours=2)
+            schedule["end"] = start + timedelta(hours=4)
+
+            reschedule = get_resource_service("events_reschedule")
+            with patch.object(reschedule, "REQUIRE_LOCK", False), patch.object(
+                reschedule, "is_original_event", return_value=False
+            ):
+                reschedule.patch(events[0]["_id"], {"dates": schedule, "update_method": "all"})
+
+            # The history of the other Events in the series records their new dates
+            history = get_resource_service("events_history").find_one(
+                req=None, event_id=events[1]["_id"], operation="reschedule"
+            )
+            self.assertEqual(
+                (start + timedelta(days=1, hours=2)).replace(tzinfo=None),
+                history["update"]["dates"]["start"].replace(tzinfo=None),
+            )
+
     def test_planning_schedule_update_time(self):
         with self.app.app_context():
             service = get_resource_service("events")
@@ -698,3 +918,104 @@ class EventsRelatedPlanningAutoPublish(TestCase):
             planning_item = planning_service.find_one(req=None, _id=planning_id[0])
             self.assertEqual(len([planning_item]), 1)
             self.assertEqual(planning_item.get("state"), "scheduled")
+
+
+class EventSeriesActionsTestCase(TestCase):
+    """Actions on a series of Events are written to the ``events`` collection, not the action endpoint"""
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            self.app.data.insert(
+                "vocabularies",
+                [
+                    {
+                        "_id": "eventoccurstatus",
+                        "items": [
+                            {"is_active": True, "qcode": "eocstat:eos6", "name": "Cancelled", "label": "Cancelled"}
+                        ],
+                    }
+                ],
+            )
+
+    def create_series(self, count=3):
+        service = get_resource_service("events")
+        start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+        service.post(
+            [
+                {
+                    "name": "Daily Club",
+                    "dates": {
+                        "start": start,
+                        "end": start + timedelta(hours=2),
+                        "tz": "UTC",
+                        "recurring_rule": {
+                            "frequency": "DAILY",
+                            "interval": 1,
+                            "count": count,
+                            "endRepeatMode": "count",
+                        },
+                    },
+                }
+            ]
+        )
+        return sorted(service.get(req=None, lookup=None), key=lambda event: event["dates"]["start"])
+
+    def patch_event(self, resource, event_id, updates):
+        service = get_resource_service(resource)
+        with patch.object(service, "REQUIRE_LOCK", False), patch.object(
+            service, "is_original_event", return_value=False
+        ):
+            service.patch(event_id, updates)
+
+    def get_stored_series(self, recurrence_id):
+        return list(get_collection("events").find({"recurrence_id": recurrence_id}).sort("dates.start", 1))
+
+    def action_series(self, resource, updates):
+        events = self.create_series()
+        self.patch_event(resource, events[0]["_id"], updates)
+        return [get_collection("events").find_one({"_id": event["_id"]}) for event in events]
+
+    def test_spike_series(self):
+        with self.app.app_context():
+            for event in self.action_series("events_spike", {"update_method": "all"}):
+                self.assertEqual("spiked", event["state"])
+
+    def test_cancel_series(self):
+        with self.app.app_context():
+            for event in self.action_series("events_cancel", {"update_method": "all", "reason": "Rain"}):
+                self.assertEqual("cancelled", event["state"])
+                self.assertEqual("eocstat:eos6", event["occur_status"]["qcode"])
+
+    def test_postpone_series(self):
+        with self.app.app_context():
+            for event in self.action_series("events_postpone", {"update_method": "all", "reason": "Rain"}):
+                self.assertEqual("postponed", event["state"])
+
+    def test_update_repetitions_series(self):
+        with self.app.app_context():
+            events = self.create_series()
+            dates = deepcopy(events[0]["dates"])
+            dates["recurring_rule"]["count"] = 2
+            self.patch_event("events_update_repetitions", events[0]["_id"], {"dates": dates})
+
+            stored = self.get_stored_series(events[0]["recurrence_id"])
+            self.assertEqual([event["_id"] for event in events[:2]], [event["_id"] for event in stored])
+            for event in stored:
+                self.assertEqual(2, event["dates"]["recurring_rule"]["count"])
+
+    def test_reschedule_series(self):
+        with self.app.app_context():
+            events = self.create_series()
+            dates = deepcopy(events[0]["dates"])
+            dates["start"] += timedelta(hours=2)
+            dates["end"] += timedelta(hours=2)
+            self.patch_event("events_reschedule", events[0]["_id"], {"dates": dates, "update_method": "all"})
+
+            stored = self.get_stored_series(events[0]["recurrence_id"])
+            self.assertEqual([event["_id"] for event in events], [event["_id"] for event in stored])
+            for event, stored_event in zip(events, stored):
+                self.assertEqual(
+                    (event["dates"]["start"] + timedelta(hours=2)).replace(tzinfo=None),
+                    stored_event["dates"]["start"].replace(tzinfo=None),
+                )
@@ -12,6 +12,7 @@ from superdesk import get_resource_service
 from superdesk.errors import SuperdeskApiError
 from superdesk.metadata.utils import generate_guid
 from superdesk.metadata.item import GUID_NEWSML
+from superdesk.notification import push_notification
 from apps.auth import get_user_id
 from planning.common import (
     remove_lock_information,
@@ -19,16 +20,26 @@ from planning.common import (
     POST_STATE,
     get_max_recurrent_events,
     set_original_creator,
+    get_recurring_bulk_writes_enabled,
 )
 from .events import EventsResource, generate_recurring_dates
+from .recurrence import get_recurring_rule_params, diff_recurring_dates
 from .events_base_service import EventsBaseService
 from planning.item_lock import LOCK_ACTION
+from planning.bulk import bulk_update
 
 from eve.utils import config
 from flask import current_app as app
 
 from copy import deepcopy
-import pytz
+
+# The Events in the series that are not reposted, matching the states excluded from the recurring timeline
+REPOST_EXCLUDED_STATES = [
+    WORKFLOW_STATE.SPIKED,
+    WORKFLOW_STATE.RESCHEDULED,
+    WORKFLOW_STATE.CANCELLED,
+    WORKFLOW_STATE.POSTPONED,
+]
 
 
 class EventsUpdateRepetitionsResource(EventsResource):
@@ -67,23 +78,15 @@ class EventsUpdateRepetitionsService(EventsBaseService):
         existing_events = self._get_series(original)
 
         first_event = existing_events[0]
-        new_dates = [
-            date
-            for date in generate_recurring_dates(
-                start=first_event.get("dates", {}).get("start"),
-                tz=updates["dates"].get("tz") and pytz.timezone(updates["dates"]["tz"] or None),
-                **updated_rule,
-            )
-        ]
-
-        original_dates = [
-            date
-            for date in generate_recurring_dates(
-                start=first_event.get("dates", {}).get("start"),
-                tz=original["dates"].get("tz") and pytz.timezone(original["dates"]["tz"] or None),
-                **original_rule,
-            )
-        ]
+        start = first_event.get("dates", {}).get("start")
+        new_dates = list(
+            generate_recurring_dates(start=start, **get_recurring_rule_params(updates["dates"], updated_rule))
+        )
+        original_dates = generate_recurring_dates(
+            start=start, **get_recurring_rule_params(original["dates"], original_rule)
+        )
+        new_dates_set = set(new_dates)
+        _removed_dates, added_dates = diff_recurring_dates(original_dates, new_dates)
 
         # Compute the difference between start and end in the updated event
         time_delta = original["dates"]["end"] - original["dates"]["start"]
@@ -91,7 +94,7 @@ class EventsUpdateRepetitionsService(EventsBaseService):
         events_service = get_resource_service("events")
 
         deleted_events = {}
-        new_events = []
+        updated_events = []
 
         # Update the recurring rules for EVERY event in the series
         # Also if we're decreasing the length of the series, then
@@ -99,18 +102,23 @@ class EventsUpdateRepetitionsService(EventsBaseService):
         for event in existing_events:
             # if the event does not occur in the new dates, then we need to either
             # delete or cancel this event
-            if event["dates"]["start"].replace(tzinfo=None) not in new_dates:
+            if event["dates"]["start"].replace(tzinfo=None) not in new_dates_set:
                 deleted_events[event[config.ID_FIELD]] = event
 
             # Otherwise this Event does occur in the new dates
             # So just update the recurring_rule to match the new series recurring_rule
             else:
-                self._update_event(updated_rule, event)
+                updated_events.append(event)
 
         # Create new events that do not fall on the original series
-        for date in new_dates:
-            if date not in original_dates:
-                new_events.append(self._create_event(date, updates, original, time_delta))
+        new_events = [self._create_event(date, updates, original, time_delta) for date in added_dates]
+
+        if get_recurring_bulk_writes_enabled():
+            self._bulk_update_repetitions(updated_rule, original, updated_events, new_events, deleted_events)
+            return
+
+        for event in updated_events:
+            self._update_event(updated_rule, event)
 
         # Now iterate over the new events and create them
         if new_events:
@@ -149,14 +157,114 @@ class EventsUpdateRepetitionsService(EventsBaseService):
         """
         pass
 
+    def _bulk_update_repetitions(self, updated_rule, original, updated_events, new_events, deleted_events):
+        """Apply the changes to the series using bulk operations
+
+        The updated, created, deleted and cancelled Events are each written using a single operation,
+        and the history for the entire series is written using a single insert.
+        The series loaded for the update is then used to repost the Events, instead of fetching it again.
+        """
+
+        events_service = get_resource_service("events")
+        events_history = get_resource_service("events_history")
+        cancel_service = get_resource_service("events_cancel")
+
+        updated_items = []
+        for event in updated_events:
+            event_updates = self._update_rules(event, updated_rule)
+            self.set_planning_schedule(event_updates)
+            updated_items.append((event_updates, event))
+
+        self._set_events_planning(deleted_events)
+        removed_events = []
+        cancelled_items = []
+        occur_cancel_state = None
+        for event in deleted_events.values():
+            if not len(event.get("_plans", [])) and event.get("pubstatus", None) is None:
+                removed_events.append(event)
+            elif cancel_service.validate_states(event):
+                # If the Event is not in a valid state to Cancel, then we simply ignore this Event
+                if occur_cancel_state is None:
+                    occur_cancel_state = cancel_service._get_cancel_state()
+
+                event_updates = self._update_rules(event, updated_rule)
+                cancel_service._set_event_cancelled(event_updates, event, occur_cancel_state)
+                cancelled_items.append((event_updates, event))
+
+        bulk_update("events", updated_items)
+        if new_events:
+            events_service.create(new_events)
+        if removed_events:
+            events_service.delete_action(
+                lookup={config.ID_FIELD: {"$in": [event[config.ID_FIELD] for event in removed_events]}}
+            )
+
+        with events_history.batch(), get_resource_service("planning_history").batch():
+            for event_updates, event in cancelled_items:
+                cancel_service._cancel_event_plannings(event_updates, event, event.pop("_plans", []))
+            bulk_update("events", cancelled_items)
+
+            for event_updates, event in updated_items:
+                events_history.on_update_repetitions(
+                    event_updates, event[config.ID_FIELD], self._get_update_operation(event)
+                )
+            for event in new_events:
+                events_history.on_update_repetitions(event, event[config.ID_FIELD], "update_repetitions_create")
+            for event in removed_events:
+                app.on_deleted_item_events(event)
+            for event_updates, event in cancelled_items:
+                app.on_updated_events_cancel(event_updates, {"_id": event[config.ID_FIELD]})
+
+        for event_updates, event in updated_items + cancelled_items:
+            event.update(event_updates)
+
+        # If the cancelled events were posted we need to post the cancellations
+        events_post_service = get_resource_service("events_post")
+        for pubstatus in [POST_STATE.CANCELLED, POST_STATE.USABLE]:
+            posted_events = [event for _updates, event in cancelled_items if event.get("pubstatus") == pubstatus]
+            if posted_events:
+                events_post_service.validate_items(posted_events)
+                posted_updates, _failed_planning_ids = events_post_service.post_events(posted_events, pubstatus, False)
+                for post_updates, event in zip(posted_updates, posted_events):
+                    push_notification(
+                        "events:posted" if pubstatus == POST_STATE.USABLE else "events:unposted",
+                        item=event[config.ID_FIELD],
+                        etag=post_updates["_etag"],
+                        pubstatus=post_updates["pubstatus"],
+                        state=post_updates["state"],
+                    )
+
+        # if the original event was "posted" then post the new generated events
+        if original.get("pubstatus") in [POST_STATE.CANCELLED, POST_STATE.USABLE]:
+            # Same Events as posting the series, which includes the Cancelled Events when posting a cancellation
+            excluded_states = [
+                state
+                for state in REPOST_EXCLUDED_STATES
+                if state != WORKFLOW_STATE.CANCELLED or original["pubstatus"] != POST_STATE.CANCELLED
+            ]
+            series = updated_events + [event for _updates, event in cancelled_items]
+            reposted_events = sorted(
+                [
+                    event
+                    for event in series
+                    if event[config.ID_FIELD] == original[config.ID_FIELD] or event.get("state") not in excluded_states
+                ]
+                + new_events,
+                key=lambda event: event["dates"]["start"],
+            )
+            events_post_service.validate_items(reposted_events)
+            events_post_service.post_events(reposted_events, original["pubstatus"], True)
+
+    @staticmethod
+    def _get_update_operation(event):
+        return "update_repetitions" if event.get(LOCK_ACTION) == "update_repetitions" else "update_repetitions_update"
+
     def _update_event(self, updated_rule, original):
         updates = self._update_rules(original, updated_rule)
         self.set_planning_schedule(updates)
         self.backend.update(self.datasource, original[config.ID_FIELD], updates, original)
         get_resource_service("events_history").on_update_repetitions(
-            updates,
-            original[config.ID_FIELD],
-            "update_repetitions" if original.get(LOCK_ACTION) == "update_repetitions" else "update_repetitions_update",
+            updates, original[config.ID_FIELD], self._get_update_operation(original)
         )
 
     def _create_event(self, date, updates, original, time_delta):
@@ -51,7 +51,7 @@ class EventsUpdateTimeService(EventsBaseService):
         self.set_planning_schedule(updates)
 
     def update_recurring_events(self, updates, original, update_method):
-        historic, past, future = self.get_recurring_timeline(original)
+        historic, past, future = self.get_recurring_timeline(original, for_update=True)
 
         # Determine if the selected event is the first one, if so then
         # act as if we're changing future events
@@ -0,0 +1,274 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Events - Virtual recurring series
+
+When ``PLANNING_VIRTUAL_RECURRING_SERIES`` is enabled, only the first Event of a new recurring series
+is saved (the series master). The master stores the template used to generate the rest of the series
+under ``virtual_series``, and the other occurrences are expanded from it when they are read.
+
+An occurrence uses the ID ``<recurrence_id>__<start>``, so it can be referenced before it exists.
+It is only saved as an Event (using that same ID) when it is written to, i.e. when it is edited,
+locked, posted or linked to a Planning item. Actions against the series (such as spiking,
+cancelling or rescheduling) save all remaining occurrences before processing the series.
+"""
+
+from typing import Dict, Any, Optional, List, Set, Tuple
+import logging
+import itertools
+from datetime import datetime
+
+import pytz
+from flask import request, has_request_context
+from eve.utils import config
+
+from superdesk import get_resource_service
+from superdesk.utc import utcnow
+
+from planning.types import Event
+from planning.common import get_max_recurrent_events, get_virtual_recurring_series_enabled
+from planning.bulk import bulk_insert, bulk_update
+from .recurrence import get_recurring_rule_params
+
+logger = logging.getLogger(__name__)
+
+VIRTUAL_ID_SEPARATOR = "__"
+VIRTUAL_ID_DATE_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def get_occurrence_id(recurrence_id: str, start: datetime) -> str:
+    """Returns the ID used for an occurrence of a virtual series"""
+
+    return "{}{}{}".format(recurrence_id, VIRTUAL_ID_SEPARATOR, start.strftime(VIRTUAL_ID_DATE_FORMAT))
+
+
+def parse_occurrence_id(item_id: Any) -> Optional[Tuple[str, datetime]]:
+    """Returns the ``recurrence_id`` and start date of an occurrence ID, or ``None`` if it isn't one"""
+
+    if not isinstance(item_id, str) or VIRTUAL_ID_SEPARATOR not in item_id:
+        return None
+
+    recurrence_id, start = item_id.rsplit(VIRTUAL_ID_SEPARATOR, 1)
+    try:
+        return recurrence_id, datetime.strptime(start, VIRTUAL_ID_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def is_virtual_series_master(event: Optional[Event]) -> bool:
+    return bool((event or {}).get("virtual_series"))
+
+
+def create_virtual_series(events: List[Event]) -> Event:
+    """Convert a list of generated Events into the master of a virtual series
+
+    :param events: The Events generated using ``generate_recurring_events``
+    :return: The first Event in the series, with the ``virtual_series`` attribute populated
+    """
+
+    from .events import get_recurring_event_template
+
+    master = events[0]
+    master["virtual_series"] = {
+        "start": master["dates"]["start"],
+        "end": events[-1]["dates"]["end"],
+        "template": get_recurring_event_template(events[-1]),
+    }
+
+    return master
+
+
+def get_series_master(recurrence_id: str) -> Optional[Event]:
+    if not recurrence_id:
+        return None
+
+    return get_resource_service("events").find_one(req=None, recurrence_id=recurrence_id, virtual_series={"$ne": None})
+
+
+def get_saved_occurrence_ids(recurrence_ids: List[str]) -> Set[str]:
+    """Returns the IDs of all the Events saved for the provided series"""
+
+    return set(
+        event[config.ID_FIELD]
+        for event in get_resource_service("events").get_from_mongo(
+            req=None,
+            lookup={"recurrence_id": {"$in": recurrence_ids}},
+            projection={config.ID_FIELD: 1},
+        )
+    )
+
+
+def get_virtual_occurrence_dates(master: Event) -> List[datetime]:
+    from .events import generate_recurring_dates
+
+    series = master["virtual_series"]
+    dates = series["template"]["dates"]
+
+    return [
+        date if date.tzinfo else pytz.utc.localize(date)
+        for date in itertools.islice(
+            generate_recurring_dates(start=series["start"], **get_recurring_rule_params(dates)),
+            0,
+            get_max_recurrent_events(),
+        )
+    ]
+
+
+def expand_virtual_series(
+    master: Event,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    exclude_ids: Optional[Set[str]] = None,
+) -> List[Event]:
+    """Generate the occurrences of a virtual series that have not been saved yet
+
+    :param master: The master Event of the virtual series
+    :param start: If provided, only return occurrences that end after this date
+    :param end: If provided, only return occurrences that start before this date
+    :param exclude_ids: The IDs of the occurrences already saved,
+        if not provided these will be loaded from the database
+    """
+
+    from .events import get_recurring_event_occurrence
+
+    if not is_virtual_series_master(master):
+        return []
+
+    recurrence_id = master["recurrence_id"]
+    if exclude_ids is None:
+        exclude_ids = get_saved_occurrence_ids([recurrence_id])
+
+    template = master["virtual_series"]["template"]
+    time_delta = template["dates"]["end"] - template["dates"]["start"]
+    series_start = master["virtual_series"]["start"].replace(tzinfo=None)
+    occurrences = []
+
+    for date in get_virtual_occurrence_dates(master):
+        if date.replace(tzinfo=None) == series_start:
+            # The first occurrence of the series is the master itself
+            continue
+        elif start is not None and date + time_delta < start:
+            continue
+        elif end is not None and date > end:
+            break
+
+        occurrence_id = get_occurrence_id(recurrence_id, date)
+        if occurrence_id in exclude_ids:
+            continue
+
+        occurrences.append(get_recurring_event_occurrence(template, date, time_delta, recurrence_id, occurrence_id))
+
+    return occurrences
+
+
+def expand_virtual_occurrence(item_id: str) -> Optional[Event]:
+    """Returns the (unsaved) occurrence of a virtual series for the provided ID"""
+
+    parsed = parse_occurrence_id(item_id)
+    if parsed is None:
+        return None
+
+    recurrence_id, start = parsed
+    master = get_series_master(recurrence_id)
+    if master is None:
+        return None
+
+    start = pytz.utc.localize(start)
+    for occurrence in expand_virtual_series(master, start=start, end=start, exclude_ids=set()):
+        if occurrence[config.ID_FIELD] == item_id:
+            return occurrence
+
+    return None
+
+
+def is_write_request() -> bool:
+    return has_request_context() and request.method not in ("GET", "HEAD", "OPTIONS")
+
+
+def save_virtual_occurrence(item_id: str) -> Optional[Event]:
+    """Save an occurrence of a virtual series as an Event, so it can be written to"""
+
+    occurrence = expand_virtual_occurrence(item_id)
+    if occurrence is None:
+        return None
+
+    events_service = get_resource_service("events")
+    bulk_insert(events_service.datasource, [occurrence])
+    get_resource_service("events_history").on_item_created([occurrence])
+
+    return events_service.find_one(req=None, _id=item_id)
+
+
+def get_virtual_occurrence(item_id: str) -> Optional[Event]:
+    """Returns the occurrence for the ID, saving it first if this is a write request"""
+
+    if not get_virtual_recurring_series_enabled() or parse_occurrence_id(item_id) is None:
+        return None
+
+    return save_virtual_occurrence(item_id) if is_write_request() else expand_virtual_occurrence(item_id)
+
+
+def save_virtual_series(event: Event) -> List[Event]:
+    """Save all unsaved occurrences of the series the provided Event belongs to
+
+    This is used before actioning the series as a whole, so that the action applies to every occurrence.
+    Afterwards the series is no longer virtual.
+    """
+
+    recurrence_id = event.get("recurrence_id")
+    if not recurrence_id:
+        return []
+
+    master = event if is_virtual_series_master(event) else get_series_master(recurrence_id)
+    if master is None:
+        return []
+
+    occurrences = expand_virtual_series(master)
+    events_service = get_resource_service("events")
+    if occurrences:
+        bulk_insert(events_service.datasource, occurrences)
+        get_resource_service("events_history").on_item_created(occurrences)
+
+    bulk_update(events_service.datasource, [({"virtual_series": None}, master)])
+    event.pop("virtual_series", None)
+
+    logger.info("Saved {} occurrences of virtual series {}".format(len(occurrences), recurrence_id))
+    return occurrences
+
+
+def get_virtual_series_masters(recurrence_ids: List[str]) -> List[Event]:
+    if not recurrence_ids:
+        return []
+
+    return list(
+        get_resource_service("events").get_from_mongo(
+            req=None,
+            lookup={"recurrence_id": {"$in": recurrence_ids}, "virtual_series": {"$ne": None}},
+        )
+    )
+
+
+def get_virtual_occurrences_for_window(
+    masters: List[Event], start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> List[Event]:
+    """Expand the occurrences of the provided virtual series that fall within the date window"""
+
+    masters = [master for master in masters if is_virtual_series_master(master)]
+    if not masters:
+        return []
+
+    exclude_ids = get_saved_occurrence_ids([master["recurrence_id"] for master in masters])
+    return sorted(
+        itertools.chain.from_iterable(
+            expand_virtual_series(master, start=start or utcnow(), end=end, exclude_ids=exclude_ids)
+            for master in masters
+        ),
+        key=lambda occurrence: occurrence["dates"]["start"],
+    )
@@ -0,0 +1,258 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Events - Recurrence engine
+
+Expands the recurring rule of an Event (along with its ``ex_date``, ``ex_rule`` and ``r_date`` values)
+into the dates of the series, using ``dateutil.rrule.rruleset``.
+
+Bounded rules (using ``count`` or ``until``) are cached in an LRU cache keyed by the rule, the start date
+and the timezone, as the same series is usually expanded a number of times while processing a single request.
+"""
+
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable, Union
+import re
+import logging
+from datetime import datetime, date
+from functools import lru_cache
+
+import pytz
+from dateutil.rrule import rrule, rruleset, YEARLY, MONTHLY, WEEKLY, DAILY, MO, TU, WE, TH, FR, SA, SU
+
+from superdesk.utc import get_date
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES: Dict[str, Any] = {"DAILY": DAILY, "WEEKLY": WEEKLY, "MONTHLY": MONTHLY, "YEARLY": YEARLY}
+DAYS = {"MO": MO, "TU": TU, "WE": WE, "TH": TH, "FR": FR, "SA": SA, "SU": SU}
+
+#: The maximum number of expanded rules kept in the cache
+RECURRENCE_CACHE_SIZE = 512
+
+#: The attributes of ``dates.recurring_rule`` used to expand the series
+RULE_FIELDS = ("frequency", "interval", "endRepeatMode", "until", "byday", "count")
+
+RecurringDate = Union[datetime, date]
+
+
+def get_recurring_rule_params(dates: Dict[str, Any], rule: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns the keyword arguments for ``get_recurring_dates`` from the ``dates`` of an Event
+
+    :param dates: The ``dates`` attribute of the Event
+    :param rule: The recurring rule to use, defaults to ``dates.recurring_rule``
+    """
+
+    rule = rule if rule is not None else (dates.get("recurring_rule") or {})
+    params = {key: rule[key] for key in RULE_FIELDS if key in rule}
+    params["tz"] = pytz.timezone(dates["tz"]) if dates.get("tz") else None
+    params["ex_date"] = dates.get("ex_date")
+    params["ex_rule"] = dates.get("ex_rule")
+    params["r_date"] = dates.get("r_date")
+
+    return params
+
+
+def get_recurring_dates(
+    start: datetime,
+    frequency: str,
+    interval: int = 1,
+    endRepeatMode: str = "count",
+    until: Optional[datetime] = None,
+    byday: Optional[str] = None,
+    count: Optional[int] = 5,
+    tz: Optional[pytz.BaseTzInfo] = None,
+    date_only: bool = False,
+    ex_date: Optional[Iterable[datetime]] = None,
+    ex_rule: Optional[Dict[str, Any]] = None,
+    r_date: Optional[Iterable[datetime]] = None,
+) -> Iterator[RecurringDate]:
+    """Returns an iterator over the dates of the recurring rule
+
+    If a timezone is provided, the rule is applied in the local time of that timezone,
+    and the dates are returned as naive UTC datetimes.
+    """
+
+    # NOTE: rrule uses only naive datetime
+    if tz:
+        try:
+            # start can already be localized
+            start = pytz.UTC.localize(start)
+        except ValueError:
+            pass
+        start = start.astimezone(tz).replace(tzinfo=None)
+
+    args = (
+        frequency,
+        int(interval or 1),
+        _to_rule_date(until, tz, start),
+        byday,
+        count,
+        start,
+        tz.zone if tz else None,
+        date_only,
+        _to_rule_dates(ex_date, tz, start),
+        _get_ex_rule_key(ex_rule, tz, start),
+        _to_rule_dates(r_date, tz, start),
+    )
+
+    if until or count:
+        return iter(_expand_cached(*args))
+
+    # Rules without an end are only ever expanded lazily, and are not cached
+    return _expand(*args)
+
+
+@lru_cache(maxsize=RECURRENCE_CACHE_SIZE)
+def _expand_cached(*args) -> Tuple[RecurringDate, ...]:
+    return tuple(_expand(*args))
+
+
+def _expand(
+    frequency: str,
+    interval: int,
+    until: Optional[datetime],
+    byday: Optional[str],
+    count: Optional[int],
+    start: datetime,
+    tz_name: Optional[str],
+    date_only: bool,
+    ex_date: Tuple[datetime, ...],
+    ex_rule: Optional[Tuple[Any, ...]],
+    r_date: Tuple[datetime, ...],
+) -> Iterator[RecurringDate]:
+    if frequency == "DAILY":
+        byday = None
+
+    # Convert count of repeats to count of events
+    if count:
+        count = count * (len(byday.split()) if byday else 1)
+
+    series = rruleset()
+    series.rrule(
+        rrule(
+            FREQUENCIES[frequency],
+            dtstart=start,
+            until=until,
+            byweekday=_get_byweekday(byday),
+            count=count,
+            interval=interval,
+        )
+    )
+
+    for ex in ex_date:
+        series.exdate(ex)
+    for rd in r_date:
+        series.rdate(rd)
+    if ex_rule:
+        ex_frequency, ex_interval, ex_until, ex_byday, ex_count = ex_rule
+        series.exrule(
+            rrule(
+                FREQUENCIES[ex_frequency],
+                dtstart=start,
+                until=ex_until,
+                byweekday=_get_byweekday(None if ex_frequency == "DAILY" else ex_byday),
+                count=ex_count,
+                interval=ex_interval,
+            )
+        )
+
+    # if a timezone has been applied, returns UTC
+    tz = pytz.timezone(tz_name) if tz_name else None
+    for dt in series:
+        if tz:
+            dt = tz.localize(dt).astimezone(pytz.UTC).replace(tzinfo=None)
+        yield dt.date() if date_only else dt
+
+
+def _get_byweekday(byday: Optional[str]):
+    # check format of the recurring_rule byday value
+    if byday and re.match(r"^-?[1-5]+.*", byday):
+        # byday uses monthly or yearly frequency rule with day of week and
+        # preceding day of month integer by day value
+        # examples:
+        # 1FR - first friday of the month
+        # -2MON - second to last monday of the month
+        if byday[:1] == "-":
+            day_of_month = int(byday[:2])
+            day_of_week = byday[2:]
+        else:
+            day_of_month = int(byday[:1])
+            day_of_week = byday[1:]
+
+        return DAYS[day_of_week](day_of_month)
+
+    # byday uses DAYS constants
+    return byday and [DAYS.get(d) for d in byday.split()] or None
+
+
+def _to_rule_date(value: Optional[Any], tz: Optional[pytz.BaseTzInfo], start: datetime) -> Optional[datetime]:
+    """Convert the date to the (naive local) time used by the rule"""
+
+    if not value:
+        return None
+
+    value = get_date(value)
+    if tz:
+        return value.astimezone(tz).replace(tzinfo=None)
+    elif start.tzinfo is None and value.tzinfo is not None:
+        return value.astimezone(pytz.UTC).replace(tzinfo=None)
+
+    return value
+
+
+def _to_rule_dates(
+    values: Optional[Iterable[Any]], tz: Optional[pytz.BaseTzInfo], start: datetime
+) -> Tuple[datetime, ...]:
+    dates = (_to_rule_date(value, tz, start) for value in values or [])
+    return tuple(sorted(value for value in dates if value is not None))
+
+
+def _get_ex_rule_key(
+    ex_rule: Optional[Dict[str, Any]], tz: Optional[pytz.BaseTzInfo], start: datetime
+) -> Optional[Tuple[Any, ...]]:
+    if not ex_rule or not ex_rule.get("frequency"):
+        return None
+
+    return (
+        ex_rule["frequency"],
+        int(ex_rule.get("interval") or 1),
+        _to_rule_date(ex_rule.get("until"), tz, start),
+        ex_rule.get("byday"),
+        ex_rule.get("count"),
+    )
+
+
+def diff_recurring_dates(
+    original_dates: Iterable[RecurringDate], updated_dates: Iterable[RecurringDate]
+) -> Tuple[List[RecurringDate], List[RecurringDate]]:
+    """Compare the dates of two recurring rules
+
+    :param original_dates: The dates of the original rule
+    :param updated_dates: The dates of the updated rule
+    :return: A tuple of the dates removed from, and the dates added to, the series (in their original order)
+    """
+
+    original_dates = list(original_dates)
+    updated_dates = list(updated_dates)
+    original_set = set(original_dates)
+    updated_set = set(updated_dates)
+
+    return (
+        [dt for dt in original_dates if dt not in updated_set],
+        [dt for dt in updated_dates if dt not in original_set],
+    )
+
+
+def clear_recurrence_cache():
+    _expand_cached.cache_clear()
+
+
+def get_recurrence_cache_info():
+    return _expand_cached.cache_info()
@@ -8,6 +8,7 @@
 
 """Superdesk Files"""
 
+from contextlib import contextmanager
 from superdesk import Service
 from copy import deepcopy
 from flask import g
@@ -33,6 +34,12 @@ fields_to_remove = [
     "planning_ids",
     "_updates_schedule",
     "_planning_schedule",
+    "_combined_id",
+    "_schedule_days",
+    "_planning_schedule_min",
+    "_planning_schedule_max",
+    "_updates_schedule_min",
+    "_updates_schedule_max",
     "_planning_date",
     "_reschedule_from_schedule",
     "versioncreated",
@@ -42,6 +49,38 @@ fields_to_remove = [
 class HistoryService(Service):
     """Provide common methods for tracking history of Creation, Updates and Spiking to collections"""
 
+    @contextmanager
+    def batch(self):
+        """Buffer the history records saved inside this context, and insert them all at once on exit
+
+        Used when actioning many items at once (i.e. a series of recurring Events), so the history
+        is written in a single insert instead of one per item.
+        """
+
+        batch_key = "{}_history_batch".format(self.datasource)
+        if getattr(g, batch_key, None) is not None:
+            # Already batching, the outer context will save the records
+            yield
+            return
+
+        setattr(g, batch_key, [])
+        try:
+            yield
+            history = getattr(g, batch_key)
+        finally:
+            setattr(g, batch_key, None)
+
+        if history:
+            super().post(history)
+
+    def post(self, docs, **kwargs):
+        history_batch = getattr(g, "{}_history_batch".format(self.datasource), None)
+        if history_batch is not None:
+            history_batch.extend(docs)
+            return []
+
+        return super().post(docs, **kwargs)
+
     def on_item_created(self, items, operation=None):
         for item in items:
             if not item.get("duplicate_from"):
@@ -9,21 +9,91 @@
 # at https://www.sourcefabric.org/superdesk/license
 
 import logging
+from typing import Dict, Any, List, Optional, Tuple
+
 import superdesk
+from pymongo import ReturnDocument
 
 from superdesk.errors import SuperdeskApiError
 from superdesk.notification import push_notification
 from superdesk.users.services import current_user_has_privilege
 from superdesk.utc import utcnow
-from superdesk.lock import lock, unlock
 from eve.utils import config
+from eve.methods.common import resolve_document_etag
 from superdesk import get_resource_service, get_resource_privileges
 from apps.common.components.base_component import BaseComponent
 from apps.item_lock.components.item_lock import LOCK_USER, LOCK_SESSION, LOCK_ACTION, LOCK_TIME
 
+from planning.bulk import get_collection, mongotize, index_items, bulk_update
+
 
 logger = logging.getLogger(__name__)
 
+#: Fields used to validate the locks of related items
+RELATED_LOCK_FIELDS = ["type", "recurrence_id", "event_item", LOCK_USER, LOCK_SESSION, LOCK_ACTION, LOCK_TIME]
+
+
+def get_related_item_locks(item: Dict[str, Any], resource_name: str) -> List[Dict[str, Any]]:
+    """Returns the locked Events & Planning items related to the item, with only their lock fields
+
+    The related items are the other items in the recurring series, the associated Event
+    and the Event's Planning items. Uses at most one query per collection.
+    """
+
+    item_id = item[config.ID_FIELD]
+    recurrence_id = item.get("recurrence_id")
+    lookups: List[Tuple[str, Dict[str, Any]]] = []
+
+    if resource_name == "events":
+        if recurrence_id:
+            lookups = [("events", {"recurrence_id": recurrence_id}), ("planning", {"recurrence_id": recurrence_id})]
+        else:
+            lookups = [("planning", {"event_item": item_id})]
+    elif item.get("event_item"):
+        if recurrence_id:
+            lookups = [("events", {"recurrence_id": recurrence_id}), ("planning", {"recurrence_id": recurrence_id})]
+        else:
+            lookups = [
+                ("events", {config.ID_FIELD: item["event_item"]}),
+                ("planning", {"event_item": item["event_item"]}),
+            ]
+
+    locked_items: List[Dict[str, Any]] = []
+    for resource, lookup in lookups:
+        lookup.update({LOCK_SESSION: {"$ne": None}, LOCK_USER: {"$ne": None}})
+        locked_items.extend(
+            related_item
+            for related_item in get_collection(resource).find(lookup, projection=RELATED_LOCK_FIELDS)
+            if related_item[config.ID_FIELD] != item_id
+        )
+
+    return locked_items
+
+
+def get_relationship_lock_message(item: Dict[str, Any], resource_name: str, related_item: Dict[str, Any]) -> str:
+    """Returns the error message used when a related item is already locked"""
+
+    same_resource_conflict = False
+    item_name = "planning item"
+    associated_name = "event"
+    series_str = ""
+    if resource_name == "events":
+        item_name = "event"
+        associated_name = "planning item"
+        if related_item.get("type") == "event":
+            same_resource_conflict = True
+    else:
+        if related_item.get("type") != "event":
+            same_resource_conflict = True
+
+    if item.get("recurrence_id"):
+        series_str = "in this recurring series "
+
+    if same_resource_conflict:
+        return "Another {} {}is already locked.".format(item_name, series_str)
+
+    return "An associated {} {}is already locked.".format(associated_name, series_str)
+
 
 class LockService(BaseComponent):
     def __init__(self, app):
@@ -38,7 +108,14 @@ class LockService(BaseComponent):
     def name(cls):
         return "planning_item_lock"
 
-    def lock(self, item, user_id, session_id, action, resource):
+    def lock(self, item, user_id, session_id, action, resource, validate_relationships=False):
+        """Lock the item for the user, session and action
+
+        If ``validate_relationships`` is ``True``, the locks of the related items (see ``get_related_item_locks``)
+        are checked again once the item is locked. If a related item was locked by a concurrent request,
+        the lock acquired last is released, so only one item of a relationship can be locked at a time.
+        """
+
         if not item:
             raise SuperdeskApiError.notFoundError()
         elif self.existing_lock_is_unchanged(item, user_id, session_id, action):
@@ -46,68 +123,125 @@ class LockService(BaseComponent):
             # as it is already locked for such a purpose
             return item
 
-        item_service = get_resource_service(resource)
-        item_id = item.get(config.ID_FIELD)
+        can_user_lock, error_message = self.can_lock(item, user_id, session_id, resource)
+        if not can_user_lock:
+            raise SuperdeskApiError.forbiddenError(message=error_message)
 
-        # lock_id will be:
-        # 1 - Recurrence Id for items part of recurring series (event or planning)
-        # 2 - event_item for planning with associated event
-        # 3 - item's _id for all other cases
-        lock_id_field = config.ID_FIELD
-        if item.get("recurrence_id"):
-            lock_id_field = "recurrence_id"
-        elif item.get("type") != "event" and item.get("event_item"):
-            lock_id_field = "event_item"
-
-        # set the lock_id it per item
-        lock_id = "item_lock {}".format(item.get(lock_id_field))
-
-        # get the lock it not raise forbidden exception
-        if not lock(lock_id, expire=5):
+        # following line executes handlers attached to function:
+        # on_lock_'resource' - ex. on_lock_planning, on_lock_event
+        getattr(self.app, "on_lock_%s" % resource)(item, user_id)
+
+        updates = {
+            LOCK_USER: user_id,
+            LOCK_SESSION: session_id,
+            LOCK_TIME: utcnow(),
+        }
+        if action:
+            updates[LOCK_ACTION] = action
+
+        locked_item = self.set_item_lock(resource, item, updates)
+        if locked_item is None:
+            # The item was locked by another user/session since it was loaded
             raise SuperdeskApiError.forbiddenError(message="Item is locked by another user.")
 
-        try:
-            can_user_lock, error_message = self.can_lock(item, user_id, session_id, resource)
+        if validate_relationships:
+            related_item = self.get_earlier_related_lock(locked_item, resource)
+            if related_item is not None:
+                self.release_item_lock(resource, item, locked_item)
+                raise SuperdeskApiError.forbiddenError(
+                    message=get_relationship_lock_message(item, resource, related_item)
+                )
 
-            if can_user_lock:
-                # following line executes handlers attached to function:
-                # on_lock_'resource' - ex. on_lock_planning, on_lock_event
-                getattr(self.app, "on_lock_%s" % resource)(item, user_id)
+        push_notification(
+            resource + ":lock",
+            item=str(item.get(config.ID_FIELD)),
+            user=str(user_id),
+            lock_time=updates[LOCK_TIME],
+            lock_session=str(session_id),
+            lock_action=updates.get(LOCK_ACTION),
+            etag=locked_item[config.ETAG],
+            event_item=item.get("event_item"),
+            recurrence_id=item.get("recurrence_id") or None,
+            type=item.get("type"),
+        )
 
-                updates = {
-                    LOCK_USER: user_id,
-                    LOCK_SESSION: session_id,
-                    LOCK_TIME: utcnow(),
-                }
-                if action:
-                    updates[LOCK_ACTION] = action
-
-                item_service.update(item.get(config.ID_FIELD), updates, item)
-
-                push_notification(
-                    resource + ":lock",
-                    item=str(item.get(config.ID_FIELD)),
-                    user=str(user_id),
-                    lock_time=updates[LOCK_TIME],
-                    lock_session=str(session_id),
-                    lock_action=updates.get(LOCK_ACTION),
-                    etag=updates["_etag"],
-                    event_item=item.get("event_item"),
-                    recurrence_id=item.get("recurrence_id") or None,
-                    type=item.get("type"),
-                )
-            else:
-                raise SuperdeskApiError.forbiddenError(message=error_message)
+        # following line executes handlers attached to function:
+        # on_locked_'resource' - ex. on_locked_planning, on_locked_event
+        getattr(self.app, "on_locked_%s" % resource)(locked_item, user_id)
+        return locked_item
 
-            item = item_service.find_one(req=None, _id=item_id)
+    @staticmethod
+    def set_item_lock(resource: str, item: Dict[str, Any], updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Atomically lock the item, if it is not locked by another user or session
 
-            # following line executes handlers attached to function:
-            # on_locked_'resource' - ex. on_locked_planning, on_locked_event
-            getattr(self.app, "on_locked_%s" % resource)(item, user_id)
-            return item
-        finally:
-            # unlock the lock :)
-            unlock(lock_id, remove=True)
+        Uses a single conditional ``find_one_and_update``, so concurrent requests to lock the same item
+        cannot both succeed, without the need for a distributed lock.
+
+        :return: The locked item, or ``None`` if the item is locked by another user or session
+        """
+
+        updates = updates.copy()
+        updates[config.LAST_UPDATED] = utcnow()
+        # Same as the service layer, so ``etag_ignore_fields`` of the resource are applied
+        updated = item.copy()
+        updated.update(updates)
+        resolve_document_etag(updated, resource)
+        updates[config.ETAG] = updated[config.ETAG]
+
+        current_lock = mongotize(resource, {LOCK_USER: updates[LOCK_USER], LOCK_SESSION: updates[LOCK_SESSION]})
+        locked_item = get_collection(resource).find_one_and_update(
+            {
+                config.ID_FIELD: item[config.ID_FIELD],
+                "$or": [
+                    {LOCK_USER: None},
+                    {LOCK_USER: current_lock[LOCK_USER], LOCK_SESSION: current_lock[LOCK_SESSION]},
+                ],
+            },
+            {"$set": mongotize(resource, updates)},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if locked_item is not None:
+            index_items(resource, [locked_item])
+
+        return locked_item
+
+    @staticmethod
+    def get_earlier_related_lock(locked_item: Dict[str, Any], resource: str) -> Optional[Dict[str, Any]]:
+        """Returns a related item that was locked before the provided item, if any
+
+        Locks are ordered by their ``lock_time`` and then ID, so when two related items are locked
+        at the same time, only the one locked last finds a conflict.
+        """
+
+        lock_order = (locked_item[LOCK_TIME], str(locked_item[config.ID_FIELD]))
+        for related_item in get_related_item_locks(locked_item, resource):
+            if related_item.get(LOCK_TIME) is None or (
+                (related_item[LOCK_TIME], str(related_item[config.ID_FIELD])) < lock_order
+            ):
+                return related_item
+
+        return None
+
+    @staticmethod
+    def release_item_lock(resource: str, item: Dict[str, Any], locked_item: Dict[str, Any]):
+        """Restore the lock of the item to its state before ``set_item_lock``
+
+        The item is only updated if it is still locked by the same session.
+        """
+
+        restored = {
+            field: item.get(field)
+            for field in [LOCK_USER, LOCK_SESSION, LOCK_TIME, LOCK_ACTION, config.ETAG, config.LAST_UPDATED]
+        }
+        released_item = get_collection(resource).find_one_and_update(
+            {config.ID_FIELD: item[config.ID_FIELD], LOCK_SESSION: locked_item[LOCK_SESSION]},
+            {"$set": mongotize(resource, restored)},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if released_item is not None:
+            index_items(resource, [released_item])
 
     def existing_lock_is_unchanged(self, item, user_id, session_id, action):
         return (
@@ -171,11 +305,48 @@ class LockService(BaseComponent):
             item_service.delete_action(lookup={})
 
     def unlock_session_for_resource(self, user_id, session_id, is_last_session, resource):
+        """Unlock all items of the resource locked by the session (or user if this was their last session)
+
+        The items are unlocked using a single bulk write, and one ``<resource>:unlock`` notification
+        is sent with the list of unlocked ``items``, instead of one notification per item.
+        The ``on_unlock_<resource>`` and ``on_unlocked_<resource>`` hooks are still executed for each item.
+        """
+
         logger.info(f"planning:item_lock: Unlocking {resource} resources")
-        item_service = get_resource_service(resource)
-        term_filter = {LOCK_USER: str(user_id)} if is_last_session else {LOCK_SESSION: str(session_id)}
-        for item in item_service.search({"query": {"bool": {"filter": {"term": term_filter}}}}):
-            self.unlock(item, user_id, session_id, resource)
+        lookup = mongotize(resource, {LOCK_USER: user_id} if is_last_session else {LOCK_SESSION: session_id})
+        items = list(get_collection(resource).find(lookup))
+        if not items:
+            return
+
+        for item in items:
+            getattr(self.app, "on_unlock_%s" % resource)(item, user_id)
+
+        updates = bulk_update(
+            resource,
+            [({LOCK_USER: None, LOCK_SESSION: None, LOCK_TIME: None, LOCK_ACTION: None}, item) for item in items],
+        )
+
+        for item, item_updates in zip(items, updates):
+            getattr(self.app, "on_unlocked_%s" % resource)(dict(item, **item_updates), user_id)
+
+        push_notification(
+            resource + ":unlock",
+            items=[
+                {
+                    "item": str(item.get(config.ID_FIELD)),
+                    "user": str(user_id),
+                    "lock_session": str(session_id),
+                    "etag": item_updates[config.ETAG],
+                    "event_item": item.get("event_item") or None,
+                    "recurrence_id": item.get("recurrence_id") or None,
+                    "type": item.get("type"),
+                }
+                for item, item_updates in zip(items, updates)
+            ],
+            user=str(user_id),
+            lock_session=str(session_id),
+        )
+        logger.info(f"planning:item_lock: Unlocked {len(items)} {resource} items")
 
     def can_lock(self, item, user_id, session_id, resource):
         """
@@ -219,31 +390,9 @@ class LockService(BaseComponent):
         if not item:
             raise SuperdeskApiError.notFoundError()
 
-        all_items = get_resource_service(resource_name).get_all_items_in_relationship(item)
-        for related_item in all_items:
+        for related_item in get_related_item_locks(item, resource_name):
             if related_item[config.ID_FIELD] != item[config.ID_FIELD]:
                 if related_item.get(LOCK_USER) and related_item.get(LOCK_SESSION):
-                    # Frame appropriate error message string
-
-                    same_resource_conflict = False
-                    item_name = "planning item"
-                    associated_name = "event"
-                    series_str = ""
-                    if resource_name == "events":
-                        item_name = "event"
-                        associated_name = "planning item"
-                        if related_item.get("type") == "event":
-                            same_resource_conflict = True
-                    else:
-                        if related_item.get("type") != "event":
-                            same_resource_conflict = True
-
-                    if item.get("recurrence_id"):
-                        series_str = "in this recurring series "
-
-                    if same_resource_conflict:
-                        message = "Another {} {}is already locked.".format(item_name, series_str)
-                    else:
-                        message = "An associated {} {}is already locked.".format(associated_name, series_str)
-
-                    raise SuperdeskApiError.forbiddenError(message=message)
+                    raise SuperdeskApiError.forbiddenError(
+                        message=get_relationship_lock_message(item, resource_name, related_item)
+                    )
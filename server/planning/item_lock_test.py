@@ -0,0 +1,187 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from superdesk.errors import SuperdeskApiError
+from superdesk.utc import utcnow
+from planning.tests import TestCase
+from planning.bulk import get_collection
+
+from .item_lock import LockService, get_related_item_locks
+
+
+class ItemLockTestCase(TestCase):
+    def set_item_lock(self, item, user_id, session_id):
+        with self.app.app_context():
+            return LockService.set_item_lock(
+                "planning",
+                item,
+                {"lock_user": user_id, "lock_session": session_id, "lock_time": utcnow()},
+            )
+
+    def test_set_item_lock(self):
+        with self.app.app_context():
+            self.app.data.insert("planning", [{"_id": "plan1", "planning_date": utcnow()}])
+            item = self.app.data.find_one("planning", req=None, _id="plan1")
+
+        locked_item = self.set_item_lock(item, "user1", "session1")
+        self.assertEqual(locked_item["lock_session"], "session1")
+        self.assertNotEqual(locked_item["_etag"], item["_etag"])
+
+        # Can re-lock the item in the same session, but not from another user or session
+        self.assertIsNotNone(self.set_item_lock(item, "user1", "session1"))
+        self.assertIsNone(self.set_item_lock(item, "user1", "session2"))
+        self.assertIsNone(self.set_item_lock(item, "user2", "session3"))
+
+    def test_set_item_lock_under_contention(self):
+        with self.app.app_context():
+            self.app.data.insert("planning", [{"_id": "plan1", "planning_date": utcnow()}])
+            item = self.app.data.find_one("planning", req=None, _id="plan1")
+
+        sessions = ["session{}".format(index) for index in range(50)]
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(
+                executor.map(lambda session_id: self.set_item_lock(item, "user_" + session_id, session_id), sessions)
+            )
+
+        locked = [result for result in results if result is not None]
+        self.assertEqual(len(locked), 1)
+
+        with self.app.app_context():
+            item = self.app.data.find_one("planning", req=None, _id="plan1")
+        self.assertEqual(item["lock_session"], locked[0]["lock_session"])
+
+    @mock.patch("planning.item_lock.push_notification")
+    @mock.patch.object(LockService, "can_lock", return_value=(True, ""))
+    def test_lock_related_items_under_contention(self, can_lock, push_notification):
+        with self.app.app_context():
+            get_collection("events").insert_many(
+                [{"_id": "event{}".format(index), "type": "event", "recurrence_id": "series1"} for index in range(10)]
+                + [{"_id": "event10", "type": "event"}]
+            )
+            get_collection("planning").insert_many([{"_id": "plan1", "type": "planning", "event_item": "event10"}])
+
+        lock_service = LockService(self.app)
+
+        def lock(resource, item_id, session_id):
+            with self.app.app_context():
+                item = self.app.data.find_one(resource, req=None, _id=item_id)
+                try:
+                    return lock_service.lock(item, "user1", session_id, "edit", resource, validate_relationships=True)
+                except SuperdeskApiError:
+                    return None
+
+        # Only one Event in the series can be locked at a time
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(
+                executor.map(
+                    lambda index: lock("events", "event{}".format(index), "session{}".format(index)), range(10)
+                )
+            )
+
+        locked = [result for result in results if result is not None]
+        self.assertEqual(len(locked), 1)
+        with self.app.app_context():
+            self.assertEqual(
+                [item["_id"] for item in get_collection("events").find({"lock_session": {"$ne": None}})],
+                [locked[0]["_id"]],
+            )
+
+        # An Event and its Planning item cannot both be locked
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(
+                    lambda args: lock(*args), [("events", "event10", "session1"), ("planning", "plan1", "session2")]
+                )
+            )
+
+        self.assertEqual(len([result for result in results if result is not None]), 1)
+
+    @mock.patch("planning.item_lock.push_notification")
+    def test_unlock_session_for_resource(self, push_notification):
+        with self.app.app_context():
+            get_collection("events").insert_many(
+                [
+                    {"_id": "event1", "type": "event", "lock_user": "user1", "lock_session": "session1"},
+                    {"_id": "event2", "type": "event", "lock_user": "user1", "lock_session": "session1"},
+                    {"_id": "event3", "type": "event", "lock_user": "user1", "lock_session": "session2"},
+                ]
+            )
+
+            on_unlock = mock.Mock()
+            on_unlocked = mock.Mock()
+            self.app.on_unlock_events += on_unlock
+            self.app.on_unlocked_events += on_unlocked
+
+            LockService(self.app).unlock_session_for_resource("user1", "session1", False, "events")
+
+            # The unlock hooks are executed for each item
+            self.assertEqual([call[0][0]["_id"] for call in on_unlock.call_args_list], ["event1", "event2"])
+            self.assertEqual([call[0][0]["_id"] for call in on_unlocked.call_args_list], ["event1", "event2"])
+            self.assertEqual(on_unlock.call_args[0][0]["lock_session"], "session1")
+            self.assertIsNone(on_unlocked.call_args[0][0]["lock_session"])
+            self.assertEqual(on_unlocked.call_args[0][1], "user1")
+
+            self.assertEqual(
+                [item["_id"] for item in get_collection("events").find({"lock_session": {"$ne": None}})],
+                ["event3"],
+            )
+            self.assertEqual(push_notification.call_count, 1)
+            self.assertEqual(push_notification.call_args[0][0], "events:unlock")
+            self.assertEqual(
+                [item["item"] for item in push_notification.call_args[1]["items"]],
+                ["event1", "event2"],
+            )
+
+            # The last session of the user unlocks all of their items
+            LockService(self.app).unlock_session_for_resource("user1", "session2", True, "events")
+            self.assertEqual(get_collection("events").count_documents({"lock_user": {"$ne": None}}), 0)
+
+    def test_get_related_item_locks(self):
+        with self.app.app_context():
+            get_collection("events").insert_many(
+                [
+                    {"_id": "event1", "type": "event", "recurrence_id": "series1"},
+                    {
+                        "_id": "event2",
+                        "type": "event",
+                        "recurrence_id": "series1",
+                        "lock_user": "u",
+                        "lock_session": "s",
+                    },
+                    {"_id": "event3", "type": "event"},
+                ]
+            )
+            get_collection("planning").insert_many(
+                [
+                    {"_id": "plan1", "type": "planning", "event_item": "event1", "recurrence_id": "series1"},
+                    {"_id": "plan2", "type": "planning", "event_item": "event3", "lock_user": "u", "lock_session": "s"},
+                    {"_id": "plan3", "type": "planning", "event_item": "event3"},
+                ]
+            )
+
+            self.assertEqual(
+                [
+                    item["_id"]
+                    for item in get_related_item_locks({"_id": "event1", "recurrence_id": "series1"}, "events")
+                ],
+                ["event2"],
+            )
+            self.assertEqual(
+                [item["_id"] for item in get_related_item_locks({"_id": "event3"}, "events")],
+                ["plan2"],
+            )
+            self.assertEqual(get_related_item_locks({"_id": "plan2", "event_item": "event3"}, "planning"), [])
+
+            related = get_related_item_locks({"_id": "plan3", "event_item": "event3"}, "planning")
+            self.assertEqual([item["_id"] for item in related], ["plan2"])
+            self.assertNotIn("planning_date", related[0])
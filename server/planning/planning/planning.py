@@ -52,7 +52,10 @@ from planning.common import (
     get_planning_xmp_slugline_mapping,
     get_planning_use_xmp_for_pic_slugline,
     get_planning_use_xmp_for_pic_assignments,
-    sync_assignment_details_to_coverages,
+    sync_assignment_details_to_planning_items,
+    get_schedule_days,
+    get_schedule_range,
+    get_schedule_range_search_enabled,
     set_ingest_version_datetime,
     is_new_version,
     update_ingest_on_patch,
@@ -61,7 +64,9 @@ from planning.common import (
     UPDATE_FUTURE,
     UPDATE_ALL,
     POST_STATE,
+    get_recurring_bulk_writes_enabled,
 )
+from planning.bulk import bulk_update
 from superdesk.utc import utcnow
 from itertools import chain
 from planning.planning_notifications import PlanningNotifications
@@ -84,6 +89,33 @@ def get_coverage_by_id(
     )
 
 
+def get_coverage_map(planning_item: Planning, field: Optional[str] = "coverage_id") -> Dict[str, Coverage]:
+    """Returns the Coverages of the Planning item, indexed by the provided field
+
+    This is the equivalent of calling ``get_coverage_by_id`` for each Coverage, without the repeated scans
+    """
+
+    coverages: Dict[str, Coverage] = {}
+    for coverage in planning_item.get("coverages") or []:
+        if coverage.get(field) is not None:
+            coverages.setdefault(coverage[field], coverage)
+
+    return coverages
+
+
+#: Fields of Planning items only used internally for searching, removed when the items are fetched
+INTERNAL_SEARCH_FIELDS = [
+    "_planning_schedule",
+    "_updates_schedule",
+    "_combined_id",
+    "_schedule_days",
+    "_planning_schedule_min",
+    "_planning_schedule_max",
+    "_updates_schedule_min",
+    "_updates_schedule_max",
+]
+
+
 class PlanningService(superdesk.Service):
     """Service class for the planning model."""
 
@@ -122,9 +154,10 @@ class PlanningService(superdesk.Service):
 
     def generate_related_assignments(self, docs):
         for doc in docs:
-            doc.pop("_planning_schedule", None)
-            doc.pop("_updates_schedule", None)
-            sync_assignment_details_to_coverages(doc)
+            for field in INTERNAL_SEARCH_FIELDS:
+                doc.pop(field, None)
+
+        sync_assignment_details_to_planning_items(docs)
 
     def on_fetched(self, docs):
         self.generate_related_assignments(docs.get(config.ITEMS))
@@ -395,7 +428,9 @@ class PlanningService(superdesk.Service):
         items = []
 
         events_service = get_resource_service("events")
-        historic, past, future = events_service.get_recurring_timeline(event)
+        historic, past, future = events_service.get_recurring_timeline(
+            event, for_update=True, slices=["future"] if update_method == UPDATE_FUTURE else None
+        )
         event_series = future if update_method == UPDATE_FUTURE else historic + past + future
 
         for series_entry in event_series:
@@ -832,6 +867,14 @@ class PlanningService(superdesk.Service):
 
         updates["_planning_schedule"] = schedule
         updates["_updates_schedule"] = updates_schedule
+        updates["_schedule_days"] = get_schedule_days([(item["scheduled"], None) for item in schedule])
+        updates["_planning_schedule_min"], updates["_planning_schedule_max"] = get_schedule_range(schedule)
+        updates["_updates_schedule_min"], updates["_updates_schedule_max"] = get_schedule_range(updates_schedule)
+
+        item_id = updates.get(config.ID_FIELD) or (original or {}).get(config.ID_FIELD)
+        if item_id:
+            event_item = updates["event_item"] if "event_item" in updates else (original or {}).get("event_item")
+            updates["_combined_id"] = event_item or item_id
 
     def _create_update_assignment(
         self,
@@ -1298,12 +1341,15 @@ class PlanningService(superdesk.Service):
 
         Where planning_date is in the past
         """
-        nested_filter = {
-            "nested": {
-                "path": "_planning_schedule",
-                "filter": {"range": {"_planning_schedule.scheduled": {"gt": date_to_str(expiry_datetime)}}},
+        if get_schedule_range_search_enabled():
+            nested_filter = {"range": {"_planning_schedule_max": {"gt": date_to_str(expiry_datetime)}}}
+        else:
+            nested_filter = {
+                "nested": {
+                    "path": "_planning_schedule",
+                    "filter": {"range": {"_planning_schedule.scheduled": {"gt": date_to_str(expiry_datetime)}}},
+                }
             }
-        }
         range_filter = {"range": {"planning_date": {"gt": date_to_str(expiry_datetime)}}}
         query = {
             "query": {
@@ -1556,18 +1602,67 @@ class PlanningService(superdesk.Service):
             "firstcreated",
             "previous_status",
         }
-        for plan in self._iter_recurring_plannings_to_update(updates, original, update_method):
-            plan_updates = deepcopy(updates)
-            for field in SKIP_PLANNING_FIELDS:
-                plan_updates.pop(field, None)
+        plans = list(self._iter_recurring_plannings_to_update(updates, original, update_method))
+        if not plans:
+            return
+
+        bulk_writes = get_recurring_bulk_writes_enabled()
+        series_updates = deepcopy(
+            {field: value for field, value in updates.items() if field not in SKIP_PLANNING_FIELDS | {"coverages"}}
+        )
+
+        try:
+            planning_date_diff = updates["planning_date"] - original["planning_date"]
+        except KeyError:
+            planning_date_diff = None
+
+        # Index the Coverages of the updates & original, and compute the date shifts once for the entire series
+        coverage_updates = get_coverage_map(updates, "original_coverage_id")
+        original_coverages = get_coverage_map(original, "original_coverage_id")
+        original_coverage_ids = set(get_coverage_map(original))
+        scheduled_diffs = {}
+        for original_coverage_id, coverage in coverage_updates.items():
+            coverage_original = original_coverages.get(original_coverage_id)
+            if "planning" in coverage and coverage_original is not None:
+                scheduled_diffs[original_coverage_id] = (
+                    coverage["planning"]["scheduled"] - coverage_original["planning"]["scheduled"]
+                )
+
+        # Coverages that were added during this update request, along with their scheduled date
+        # relative to the planning date
+        new_coverages = []
+        for coverage in updates.get("coverages") or []:
+            if coverage["coverage_id"] in original_coverage_ids:
+                # Skip this one, as this Coverage exists in the original
+                continue
+
+            new_coverage = deepcopy(coverage)
+            for field in SKIP_COVERAGE_FIELDS:
+                new_coverage.pop(field, None)
 
+            # Remove the Assignment ID (if any)
             try:
-                planning_date_diff = updates["planning_date"] - original["planning_date"]
-                if planning_date_diff:
-                    plan_updates["planning_date"] = plan["planning_date"] + planning_date_diff
-            except KeyError:
+                new_coverage["assigned_to"].pop("assignment_id", None)
+            except (KeyError, TypeError):
                 pass
 
+            try:
+                scheduled_diff = coverage["planning"]["scheduled"] - (
+                    updates.get("planning_date") or original.get("planning_date")
+                )
+            except (KeyError, TypeError):
+                scheduled_diff = None
+
+            new_coverages.append((new_coverage, scheduled_diff))
+
+        items = []
+        for plan in plans:
+            # The bulk write doesn't modify the series updates, so only copy them when patching one at a time
+            plan_updates = series_updates.copy() if bulk_writes else deepcopy(series_updates)
+
+            if planning_date_diff:
+                plan_updates["planning_date"] = plan["planning_date"] + planning_date_diff
+
             if len(updates.get("coverages") or []) and len(plan.get("coverages") or []):
                 plan_updates["coverages"] = deepcopy(plan["coverages"])
                 for coverage in plan_updates["coverages"]:
@@ -1576,11 +1671,11 @@ class PlanningService(superdesk.Service):
                     except KeyError:
                         continue
 
-                    coverage_updates = get_coverage_by_id(updates, original_coverage_id, "original_coverage_id")
-                    if coverage_updates is None:
+                    coverage_update = coverage_updates.get(original_coverage_id)
+                    if coverage_update is None:
                         continue
 
-                    for field, value in coverage_updates.items():
+                    for field, value in coverage_update.items():
                         if field in SKIP_COVERAGE_FIELDS:
                             continue
                         elif field == "assigned_to":
@@ -1597,48 +1692,66 @@ class PlanningService(superdesk.Service):
                         elif field == "planning":
                             original_scheduled = (coverage.get("planning") or {}).get("scheduled")
                             coverage["planning"] = deepcopy(value)
-                            coverage_original = get_coverage_by_id(
-                                original, original_coverage_id, "original_coverage_id"
-                            )
-                            if coverage_original is not None:
-                                scheduled_diff = value["scheduled"] - coverage_original["planning"]["scheduled"]
-                                coverage["planning"]["scheduled"] = original_scheduled + scheduled_diff
+                            if original_coverage_id in scheduled_diffs:
+                                coverage["planning"]["scheduled"] = (
+                                    original_scheduled + scheduled_diffs[original_coverage_id]
+                                )
                             else:
                                 coverage["planning"]["scheduled"] = original_scheduled
                         else:
                             coverage[field] = deepcopy(value)
 
                 # Add new Coverages that were added during this update request
-                for coverage in updates["coverages"]:
-                    if get_coverage_by_id(original, coverage["coverage_id"]) is not None:
-                        # Skip this one, as this Coverage exists in the original
-                        continue
-
+                plan_date = plan_updates.get("planning_date") or plan["planning_date"]
+                for coverage, scheduled_diff in new_coverages:
                     new_coverage = deepcopy(coverage)
-                    for field in SKIP_COVERAGE_FIELDS:
-                        new_coverage.pop(field, None)
-
-                    # Remove the Assignment ID (if any)
-                    try:
-                        new_coverage["assigned_to"].pop("assignment_id", None)
-                    except (KeyError, TypeError):
-                        pass
 
                     # Set the new scheduled date, relative to the planning date
-                    try:
-                        plan_date = plan_updates.get("planning_date") or plan["planning_date"]
-                        if plan_date:
-                            scheduled_diff = coverage["planning"]["scheduled"] - (
-                                updates.get("planning_date") or original.get("planning_date")
-                            )
-                            new_coverage["planning"]["scheduled"] = plan_date + scheduled_diff
-                    except (KeyError, TypeError):
-                        pass
+                    if plan_date and scheduled_diff is not None:
+                        new_coverage["planning"]["scheduled"] = plan_date + scheduled_diff
 
                     plan_updates["coverages"].append(new_coverage)
+            elif "coverages" in updates:
+                plan_updates["coverages"] = deepcopy(updates["coverages"])
+
+            items.append((plan_updates, plan))
 
-            self.patch(plan["_id"], plan_updates)
-            app.on_updated_planning(plan_updates, {"_id": plan["_id"]})
+        if bulk_writes:
+            self._bulk_update_recurring_planning_items(items)
+        else:
+            for plan_updates, plan in items:
+                self.patch(plan["_id"], plan_updates)
+                app.on_updated_planning(plan_updates, {"_id": plan["_id"]})
+
+    def _bulk_update_recurring_planning_items(self, items):
+        """Apply the ``(updates, original)`` pairs of a Planning series using bulk Mongo/Elastic writes
+
+        Each Planning item is validated and processed the same as ``on_update`` and ``on_updated``
+        (including notifications and Coverage/Assignment hooks), with all items validated before any are written.
+        The items are written using a single bulk write, and the history of the Planning items and Assignments
+        are written using a single insert for each.
+        """
+
+        user = get_user()
+        for plan_updates, plan in items:
+            self.validate_on_update(plan_updates, plan, user)
+
+        planning_history = get_resource_service("planning_history")
+        assignments_history = get_resource_service("assignments_history")
+        with planning_history.batch(), assignments_history.batch():
+            now = utcnow()
+            for plan_updates, plan in items:
+                if user and user.get(config.ID_FIELD):
+                    plan_updates["version_creator"] = user[config.ID_FIELD]
+                plan_updates.setdefault("versioncreated", now)
+                self._set_coverage(plan_updates, plan)
+                self.set_planning_schedule(plan_updates, plan)
+
+            bulk_update(self.datasource, items)
+
+            for plan_updates, plan in items:
+                self.on_updated(plan_updates, plan)
+                app.on_updated_planning(plan_updates, {"_id": plan["_id"]})
 
     def _iter_recurring_plannings_to_update(self, updates, original, update_method):
         selected_start = updates.get("planning_date") or original.get("planning_date")
@@ -1914,6 +2027,12 @@ planning_schema = {
             },
         },
     },
+    # field to group the planning under its event in the combined view
+    # stores the event_item of the planning, or the planning _id if it has no event
+    "_combined_id": {"type": "string", "mapping": not_analyzed},
+    # field to search the common date filters using a terms query
+    # stores the local dates (in DEFAULT_TIMEZONE) of the _planning_schedule
+    "_schedule_days": {"type": "list", "mapping": not_analyzed},
     # field to sync coverage scheduled information
     # to be used for sorting/filtering on scheduled
     "_planning_schedule": {
@@ -1938,6 +2057,12 @@ planning_schema = {
             },
         },
     },
+    # fields storing the first/last dates of the _planning_schedule and _updates_schedule
+    # to be used for sorting/filtering on scheduled without a nested query
+    "_planning_schedule_min": {"type": "datetime", "nullable": True},
+    "_planning_schedule_max": {"type": "datetime", "nullable": True},
+    "_updates_schedule_min": {"type": "datetime", "nullable": True},
+    "_updates_schedule_max": {"type": "datetime", "nullable": True},
     "planning_date": {
         "type": "datetime",
         "nullable": False,
@@ -2014,6 +2139,8 @@ class PlanningResource(superdesk.Resource):
     mongo_indexes = {
         "event_item": ([("event_item", 1)], {"background": True}),
         "planning_recurrence_id": ([("planning_recurrence_id", 1)], {"background": True}),
+        "lock_session_1": ([("lock_session", 1)], {"background": True}),
+        "lock_time_1": ([("lock_time", 1)], {"background": True}),
     }
 
     merge_nested_documents = True
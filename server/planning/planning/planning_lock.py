@@ -50,10 +50,13 @@ class PlanningLockService(BaseService):
         lock_service = get_component(LockService)
         item = get_resource_service("planning").find_one(req=None, _id=item_id)
 
-        if item and item.get("event_item"):
+        validate_relationships = bool(item and item.get("event_item"))
+        if validate_relationships:
             lock_service.validate_relationship_locks(item, "planning")
 
-        updated_item = lock_service.lock(item, user_id, session_id, lock_action, "planning")
+        updated_item = lock_service.lock(
+            item, user_id, session_id, lock_action, "planning", validate_relationships=validate_relationships
+        )
         return update_returned_document(doc, updated_item, CUSTOM_HATEOAS_PLANNING)
 
 
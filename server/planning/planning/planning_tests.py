@@ -1,9 +1,11 @@
 from datetime import datetime
+from unittest import mock
 import pytz
 from planning.tests import TestCase
 from superdesk import get_resource_service
 from superdesk.errors import SuperdeskApiError
 from bson import ObjectId
+from planning.planning.planning import get_coverage_map
 
 USER_ID = ObjectId("5d385f31fe985ec67a0ca583")
 
@@ -113,3 +115,99 @@ class DuplicateCoverageTestCase(TestCase):
                 return
 
             self.assertFalse("Failed to raise an exception")
+
+
+class CoverageMapTestCase(TestCase):
+    def test_get_coverage_map(self):
+        plan = {
+            "coverages": [
+                {"coverage_id": "cov1", "original_coverage_id": "orig1"},
+                {"coverage_id": "cov2", "original_coverage_id": "orig1"},
+                {"coverage_id": "cov3"},
+            ]
+        }
+
+        self.assertEqual(["cov1", "cov2", "cov3"], list(get_coverage_map(plan)))
+
+        # The first Coverage is used if more than one has the same ID
+        coverages = get_coverage_map(plan, "original_coverage_id")
+        self.assertEqual(["orig1"], list(coverages))
+        self.assertEqual("cov1", coverages["orig1"]["coverage_id"])
+        self.assertEqual({}, get_coverage_map({}))
+
+
+class BulkUpdateRecurringPlanningTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            self.app.data.insert(
+                "agenda",
+                [
+                    {"_id": "a1", "name": "Agenda 1", "is_enabled": True},
+                    {"_id": "a2", "name": "Agenda 2", "is_enabled": True},
+                    {"_id": "a3", "name": "Agenda 3", "is_enabled": True},
+                    {"_id": "a4", "name": "Agenda 4", "is_enabled": False},
+                ],
+            )
+
+    @mock.patch("planning.planning.planning.push_notification")
+    def test_notifies_added_removed_agendas(self, push_notification):
+        with self.app.app_context():
+            self.app.data.insert(
+                "planning",
+                [
+                    {"_id": "plan1", "planning_date": datetime(2099, 11, 21, tzinfo=pytz.UTC), "agendas": ["a1"]},
+                    {"_id": "plan2", "planning_date": datetime(2099, 11, 22, tzinfo=pytz.UTC), "agendas": ["a2"]},
+                ],
+            )
+            service = get_resource_service("planning")
+            items = [
+                ({"agendas": ["a1", "a3"]}, service.find_one(req=None, _id="plan1")),
+                ({"agendas": []}, service.find_one(req=None, _id="plan2")),
+            ]
+            service._bulk_update_recurring_planning_items(items)
+
+        notifications = {
+            call[1]["item"]: (call[1]["added_agendas"], call[1]["removed_agendas"])
+            for call in push_notification.call_args_list
+            if call[0][0] == "planning:updated"
+        }
+        self.assertEqual({"plan1": (["a3"], []), "plan2": ([], ["a2"])}, notifications)
+
+    @mock.patch("planning.planning.planning.push_notification")
+    def test_validates_all_items_before_writing(self, push_notification):
+        with self.app.app_context():
+            self.app.data.insert(
+                "planning",
+                [
+                    {"_id": "plan1", "planning_date": datetime(2099, 11, 21, tzinfo=pytz.UTC), "agendas": ["a4"]},
+                    {"_id": "plan2", "planning_date": datetime(2099, 11, 22, tzinfo=pytz.UTC), "agendas": []},
+                ],
+            )
+            service = get_resource_service("planning")
+
+            # A disabled Agenda can only be kept on items that already had it
+            items = [
+                ({"agendas": ["a4", "a4", "a1"]}, service.find_one(req=None, _id="plan1")),
+                ({"agendas": ["a4"]}, service.find_one(req=None, _id="plan2")),
+            ]
+            with self.assertRaises(SuperdeskApiError):
+                service._bulk_update_recurring_planning_items(items)
+
+            self.assertEqual(["a4"], service.find_one(req=None, _id="plan1")["agendas"])
+            self.assertEqual([], service.find_one(req=None, _id="plan2")["agendas"])
+            push_notification.assert_not_called()
+
+            items = [
+                ({"agendas": ["a4", "a4", "a1"]}, service.find_one(req=None, _id="plan1")),
+                ({"agendas": ["a1"]}, service.find_one(req=None, _id="plan2")),
+            ]
+            service._bulk_update_recurring_planning_items(items)
+
+            for plan_updates, plan in items:
+                stored = service.find_one(req=None, _id=plan["_id"])
+                self.assertEqual(plan_updates["agendas"], stored["agendas"])
+                self.assertEqual(plan_updates["_etag"], stored["_etag"])
+
+            # Duplicate Agendas are removed, same as when updating a single item
+            self.assertEqual(["a4", "a1"], items[0][0]["agendas"])
@@ -9,15 +9,16 @@
 # at https://www.sourcefabric.org/superdesk/license
 
 
+from typing import Dict, Any, List
 from enum import Enum
-from flask import request, json
-from eve.utils import ParsedRequest
+from flask import request
+from eve.utils import document_etag
 from eve.render import send_response
 
-from superdesk import Resource, get_resource_service, Blueprint, blueprint
+from superdesk import Resource, Blueprint, blueprint
 from superdesk.auth.decorator import blueprint_auth
 
-from planning.search.queries.elastic import ElasticQuery, field_exists
+from planning.bulk import get_collection
 
 
 class PlanningLocksResource(Resource):
@@ -57,42 +58,51 @@ bp = Blueprint("planning_locks", __name__)
 @bp.route("/planning_locks", methods=["GET", "OPTIONS"])
 @blueprint_auth()
 def get_planning_locks():
-    resp = _get_planning_module_locks() if request.method == "GET" else None
-    return send_response(None, (resp, None, None, 200))
+    if request.method != "GET":
+        return send_response(None, (None, None, None, 200))
+
+    locks = _get_planning_module_locks()
+    etag = document_etag(locks)
+    if etag in request.if_none_match:
+        # The client already has the current locks
+        return send_response(None, ({}, None, etag, 304))
+
+    return send_response(None, (locks, None, etag, 200))
 
 
 def _get_planning_module_locks():
     repos = (request.args.get("repos") or DEFAULT_REPOS).split(",")
 
-    item_locks = []
-    locks = {}
+    locks: Dict[str, Any] = {}
     for repo in repos:
         if repo == PlanningLockRepos.EVENTS_AND_PLANNING.value:
             locks.update({"event": {}, "planning": {}, "recurring": {}})
-            item_locks.extend(list(_get_event_locks()))
-            item_locks.extend(list(_get_planning_locks()))
+            _add_item_locks(locks, _get_locked_items("events"), "event")
+            _add_item_locks(locks, _get_locked_items("planning"), "planning")
         elif repo == PlanningLockRepos.FEATURED_PLANNING.value:
             locks["featured"] = None
-            item_locks.extend(list(_get_planning_featured_lock()))
+            for item in _get_locked_items("planning_featured_lock"):
+                locks["featured"] = {
+                    "item_id": item.get("_id"),
+                    "item_type": "planning_featured_lock",
+                    "user": item.get("lock_user"),
+                    "session": item.get("lock_session"),
+                    "action": "featured",
+                    "time": item.get("lock_time"),
+                }
         elif repo == PlanningLockRepos.ASSIGNMENTS.value:
             locks["assignment"] = {}
-            item_locks.extend(list(_get_assignment_locks()))
-
-    for item in item_locks:
-        if item.get("_type") == "planning_featured_lock":
-            locks["featured"] = {
-                "item_id": item.get("_id"),
-                "item_type": item.get("_type"),
-                "user": item.get("lock_user"),
-                "session": item.get("lock_session"),
-                "action": "featured",
-                "time": item.get("lock_time"),
-            }
-            continue
+            _add_item_locks(locks, _get_locked_items("assignments"), "assignment")
+
+    return locks
 
+
+def _add_item_locks(locks: Dict[str, Any], items: List[Dict[str, Any]], item_type: str):
+    for item in items:
+        lock_type: str = item.get("type") or item_type
         lock = {
             "item_id": item.get("_id"),
-            "item_type": item.get("type"),
+            "item_type": lock_type,
             "user": item.get("lock_user"),
             "session": item.get("lock_session"),
             "action": item.get("lock_action"),
@@ -103,45 +113,21 @@ def _get_planning_module_locks():
         elif item.get("event_item"):
             locks["event"][item["event_item"]] = lock
         else:
-            locks[item["type"]][lock["item_id"]] = lock
-
-    return locks
-
-
-def _get_query():
-    query = ElasticQuery()
-    query.must.append(field_exists("lock_session"))
-    req = ParsedRequest()
-    req.args = {
-        "source": json.dumps(
-            {
-                "query": query.build(),
-                "size": 1000,
-                "from": 0,
-            },
-        ),
-        "projections": json.dumps(PROJECTED_FIELDS),
-    }
-    req.page = 1
-    req.max_results = 1000
-
-    return req
-
-
-def _get_event_locks():
-    return get_resource_service("events").get(req=_get_query(), lookup=None)
-
-
-def _get_planning_locks():
-    return get_resource_service("planning").get(req=_get_query(), lookup=None)
+            locks[lock_type][item["_id"]] = lock
 
 
-def _get_planning_featured_lock():
-    return get_resource_service("planning_featured_lock").get(req=_get_query(), lookup=None)
+def _get_locked_items(resource: str) -> List[Dict[str, Any]]:
+    """Returns all locked items of the resource from Mongo
 
+    Uses the ``lock_session`` index, so all locks are returned in one read regardless of their number
+    """
 
-def _get_assignment_locks():
-    return get_resource_service("assignments").get(req=_get_query(), lookup=None)
+    return list(
+        get_collection(resource).find(
+            {"lock_session": {"$ne": None}},
+            projection=PROJECTED_FIELDS,
+        )
+    )
 
 
 def init_app(app):
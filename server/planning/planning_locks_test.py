@@ -0,0 +1,46 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from planning.tests import TestCase
+from planning.bulk import get_collection
+
+from .planning_locks import _get_planning_module_locks
+
+
+class PlanningLocksTestCase(TestCase):
+    def test_get_planning_module_locks(self):
+        with self.app.test_request_context("/planning_locks"):
+            get_collection("events").insert_many(
+                [
+                    {"_id": "event1", "type": "event", "lock_session": "session1", "lock_user": "user1"},
+                    {"_id": "event2", "type": "event", "recurrence_id": "series1", "lock_session": "session1"},
+                    {"_id": "event3", "type": "event", "lock_session": None},
+                ]
+            )
+            get_collection("planning").insert_many(
+                [
+                    {"_id": "plan1", "type": "planning", "event_item": "event4", "lock_session": "session2"},
+                    # More locks than the page size of the previous Elastic query
+                    *[
+                        {"_id": "plan{}".format(index), "type": "planning", "lock_session": "s"}
+                        for index in range(2, 1100)
+                    ],
+                ]
+            )
+            get_collection("assignments").insert_one({"_id": "as1", "type": "assignment", "lock_session": "session1"})
+            locks = _get_planning_module_locks()
+
+        self.assertEqual(list(locks["event"].keys()), ["event1", "event4"])
+        self.assertEqual(locks["event"]["event1"]["user"], "user1")
+        self.assertEqual(locks["event"]["event4"]["item_id"], "plan1")
+        self.assertEqual(locks["recurring"]["series1"]["item_id"], "event2")
+        self.assertEqual(len(locks["planning"]), 1098)
+        self.assertEqual(locks["assignment"]["as1"]["item_type"], "assignment")
+        self.assertIsNone(locks["featured"])
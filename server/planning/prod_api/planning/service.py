@@ -12,7 +12,7 @@ from eve.utils import config
 
 from prod_api.service import ProdApiService
 
-from planning.common import sync_assignment_details_to_coverages
+from planning.common import sync_assignment_details_to_planning_items
 from planning.prod_api.common import excluded_lock_fields
 from planning.prod_api.assignments.utils import (
     get_assignment_ids_from_planning,
@@ -28,9 +28,16 @@ class PlanningService(ProdApiService):
         | excluded_lock_fields
     )
 
+    def on_fetched(self, result):
+        sync_assignment_details_to_planning_items(result["_items"])
+        super().on_fetched(result)
+
+    def on_fetched_item(self, doc):
+        sync_assignment_details_to_planning_items([doc])
+        super().on_fetched_item(doc)
+
     def _process_fetched_object(self, doc):
         super()._process_fetched_object(doc)
-        sync_assignment_details_to_coverages(doc)
 
         if doc.get(config.LINKS):
             if doc.get("event_item"):
@@ -16,6 +16,7 @@ from .eventsplanning_filters import (
     EventPlanningFiltersResource,
     EventPlanningFiltersService,
 )
+from .result_cache import on_resource_changed
 
 
 def init_app(app):
@@ -40,6 +41,11 @@ def init_app(app):
         _app=app,
     )
 
+    app.on_inserted += on_resource_changed
+    app.on_updated += on_resource_changed
+    app.on_replaced += on_resource_changed
+    app.on_deleted_item += on_resource_changed
+
     superdesk.privilege(
         name="planning_eventsplanning_filters_management",
         label=lazy_gettext("Planning - Events & Planning View Filters Management"),
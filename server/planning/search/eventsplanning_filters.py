@@ -25,6 +25,7 @@ from apps.auth import get_user_id
 
 from planning.common import set_original_creator, SPIKED_STATE
 from planning.search.queries.elastic import DATE_RANGE
+from planning.search.query_cache import invalidate_search_filter
 
 
 logger = logging.getLogger(__name__)
@@ -252,9 +253,14 @@ class EventPlanningFiltersService(Service):
             updates["version_creator"] = user_id
 
     def on_updated(self, updates, original):
+        invalidate_search_filter(original.get(config.ID_FIELD))
         self._push_notification(original.get(config.ID_FIELD), "event_planning_filters:updated")
 
+    def on_replaced(self, document, original):
+        invalidate_search_filter(original.get(config.ID_FIELD))
+
     def on_deleted(self, doc):
+        invalidate_search_filter(doc.get(config.ID_FIELD))
         self._push_notification(doc.get(config.ID_FIELD), "event_planning_filters:deleted")
 
     def set_schedule(self, updates):
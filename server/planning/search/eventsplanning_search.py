@@ -13,8 +13,11 @@
 import logging
 import json
 import math
-from typing import List, Dict, Any, Optional
-from copy import deepcopy
+from typing import List, Dict, Any, Optional, Tuple
+from copy import copy, deepcopy
+from datetime import datetime, timedelta, time
+
+import pytz
 
 from werkzeug.datastructures import MultiDict, ImmutableMultiDict
 from eve.utils import ParsedRequest
@@ -23,9 +26,20 @@ from flask import current_app as app
 from superdesk import Resource, Service, get_resource_service
 from superdesk.resource import build_custom_hateoas
 from superdesk.errors import SuperdeskApiError
-
+from superdesk.utc import utcnow
+from eve.utils import str_to_date
+from eve_elastic.elastic import RESOURCE_FIELD
+
+from planning.common import (
+    get_virtual_recurring_series_enabled,
+    get_max_recurrent_events,
+    get_start_of_next_week,
+    get_search_point_in_time_keep_alive,
+    get_combined_view_collapse_enabled,
+)
 from planning.planning.planning import planning_schema
 from planning.events.events_schema import events_schema
+from planning.events.events_virtual_series import get_virtual_series_masters, get_virtual_occurrences_for_window
 
 from .queries.planning import PLANNING_PARAMS, PLANNING_SEARCH_FILTERS
 from .queries.events import EVENT_PARAMS, EVENT_SEARCH_FILTERS
@@ -34,8 +48,19 @@ from .queries.combined import (
     COMBINED_SEARCH_FILTERS,
     construct_combined_view_data_query,
 )
-from .queries.common import construct_search_query
-from .queries.elastic import ElasticQuery, field_exists
+from .queries.common import (
+    construct_search_query,
+    get_date_params,
+    get_params_from_search_filter,
+    get_sort_field,
+    get_sort_order,
+    strtobool,
+)
+from .queries.elastic import ElasticQuery, field_exists, DATE_RANGE
+from .planning_search import PlanningSearchService, PlanningSearchCursor
+from .query_cache import get_cached_query
+
+DATE_PARAMS = ("date_filter", "start_date", "end_date", "only_future")
 
 
 logger = logging.getLogger(__name__)
@@ -64,11 +89,23 @@ class EventsPlanningService(Service):
         search_filter = self._get_search_filter(repo, params)
         self._check_for_unknown_params(params, search_filter, self._get_whitelist(repo))
         query = self._construct_search_query(repo, params, search_filter)
+        pagination = self._get_pagination(params)
+
+        if repo == "planning":
+            return self._search_planning(req, params, query, search_filter, pagination)
+
+        def get_docs(request):
+            return self._get_docs(repo, request, params, query, search_filter, pagination)
+
+        return self._add_virtual_occurrences(get_docs(req), req, params, search_filter, pagination, get_docs)
 
+    def _get_docs(self, repo, req, params, query, search_filter, pagination):
         if repo == "events" or repo == "event":
-            return self._search_events(req, params, query, search_filter)
-        elif repo == "planning":
-            return self._search_planning(req, params, query, search_filter)
+            return self._search_events(req, params, query, search_filter, pagination)
+        elif pagination is not None:
+            return self._get_combined_view_page(req, params, query, search_filter, pagination)
+        elif get_combined_view_collapse_enabled() and not strtobool(params.get("include_associated_planning", False)):
+            return self._get_combined_view_collapsed(req, params, query, search_filter)
         else:
             items = self._get_events_and_planning(req, query, search_filter)
             return self._get_combined_view_data(items, req, params, search_filter)
@@ -114,7 +151,7 @@ class EventsPlanningService(Service):
         return search_filter
 
     def _construct_search_query(
-        self, repo: str, params: Dict[str, Any], search_filter: Optional[Dict[str, Any]]
+        self, repo: str, params: Dict[str, Any], search_filter: Dict[str, Any]
     ) -> Dict[str, Any]:
         if repo == "events":
             filters = EVENT_SEARCH_FILTERS
@@ -123,16 +160,19 @@ class EventsPlanningService(Service):
         else:
             filters = COMBINED_SEARCH_FILTERS
 
-        return construct_search_query(repo, filters, params, search_filter)
+        return get_cached_query(
+            repo, params, search_filter, lambda: construct_search_query(repo, filters, params, search_filter)
+        )
 
-    def _get_combined_view_data(self, items, request, params, search_filter):
+    def _get_combined_view_data(self, items, request, params, search_filter, on_fetched=True):
         """Get list of event and planning for the combined view
 
         :param items:
         :param request: object representing the HTTP request
+        :param on_fetched: If ``False``, the first page is returned without calling ``on_fetched_resource``
         """
         query = construct_combined_view_data_query(params, search_filter, items)
-        page = request.page or 1
+        page = (request.page or 1) if on_fetched else 1
         page_size = self._get_page_size(request, search_filter)
         req = ParsedRequest()
         req.args = MultiDict()
@@ -144,12 +184,185 @@ class EventsPlanningService(Service):
                 "from": (page - 1) * page_size,
             }
         )
-        req.page = request.page or 1
+        req.page = page
         req.max_results = page_size
-        if params.get("projections"):
-            req.args["projections"] = params["projections"]
+        req.exec_on_fetched_resource = on_fetched
+        self._set_result_args(req, params)
         return get_resource_service("planning_search").get(req=req, lookup=None)
 
+    def _get_combined_view_collapsed(self, request, params, query, search_filter):
+        """Get the combined view using a single query, grouping Planning items under their Event
+
+        The matching Events and Planning items are collapsed on ``_combined_id``, which is the ID of
+        the Event (or of the Planning item if it has no Event), and the Event of each group is returned
+        using ``inner_hits``. The Events are only queried separately if none of them matched the query
+        themselves, i.e. only their Planning items did.
+        """
+
+        page = request.page or 1
+        page_size = self._get_page_size(request, search_filter)
+        inner_hits = {"name": "combined", "size": 1, "sort": [{"type": "asc"}]}
+        if params.get("projections"):
+            inner_hits["_source"] = json.loads(params["projections"]) + ["type", "event_item", RESOURCE_FIELD]
+
+        req = ParsedRequest()
+        req.args = MultiDict()
+        req.args["source"] = json.dumps(
+            {
+                "query": query["query"],
+                "sort": query["sort"] if query.get("sort") else self._get_sort(),
+                "size": page_size,
+                "from": (page - 1) * page_size,
+                "collapse": {"field": "_combined_id", "inner_hits": inner_hits},
+                "aggs": {"combined_total": {"cardinality": {"field": "_combined_id"}}},
+            }
+        )
+        req.page = page
+        req.max_results = page_size
+        req.exec_on_fetched_resource = False  # called once the Events have been added
+        self._set_result_args(req, params)
+
+        planning_search = get_resource_service("planning_search")
+        docs = planning_search.get(req=req, lookup=None)
+
+        items = []
+        for doc, hit in zip(docs.docs, docs.hits.get("hits", {}).get("hits", [])):
+            items.extend(planning_search.get_inner_hits(hit, "combined") or [doc])
+
+        # Load the Events of the groups where only the Planning items matched the query
+        linked_plans = [item for item in items if item["type"] == "planning" and item.get("event_item")]
+        if linked_plans:
+            events = {
+                event["_id"]: event
+                for event in self._get_combined_view_data(
+                    linked_plans, request, params, search_filter, on_fetched=False
+                )
+            }
+            linked_plan_ids = set(item["_id"] for item in linked_plans)
+            items = [
+                events.get(item["event_item"]) if item["_id"] in linked_plan_ids else item
+                for item in items
+                if item["_id"] not in linked_plan_ids or item["event_item"] in events
+            ]
+
+        aggregations = docs.hits.pop("aggregations", None) or {}
+        if aggregations.get("combined_total") and "hits" in docs.hits:
+            docs.hits["hits"]["total"] = {"value": aggregations["combined_total"]["value"], "relation": "eq"}
+
+        docs.docs = items
+        planning_search.on_fetched_docs(docs, PlanningSearchService.repos, planning_search.get_enrichment(params))
+        return docs
+
+    def _get_combined_view_page(self, request, params, query, search_filter, pagination):
+        """Get a page of the combined view, using ``search_after`` against a point in time
+
+        The items matching the query are walked in batches from the ``search_after`` position,
+        until there are enough Events and Planning items for the page. The position of the last
+        item used is returned for the next page, so each page costs the same regardless of its depth.
+
+        An Event and its Planning items are returned once, at the position of the first of them.
+        Groups whose first item sorts before the ``search_after`` position were returned on a previous page.
+        """
+
+        page_size = self._get_page_size(request, search_filter)
+        include_associated_planning = strtobool(params.get("include_associated_planning", False))
+        planning_search = get_resource_service("planning_search")
+        pit_id = pagination["pit_id"]
+        search_after = pagination.get("search_after")
+        is_first_page = not search_after
+
+        items = []
+        item_ids = set()
+        first_item_ids: Dict[str, str] = {}
+        exhausted = False
+        while len(items) < page_size and not exhausted:
+            req = ParsedRequest()
+            req.args = MultiDict()
+            source = {"query": query["query"], "sort": query["sort"] if query.get("sort") else self._get_sort()}
+            self._set_page(source, 1, page_size, {"pit_id": pit_id, "search_after": search_after})
+            req.args["source"] = json.dumps(source)
+            req.args["projections"] = json.dumps(["_id", "type", "event_item"])
+            req.exec_on_fetched_resource = False  # don't call on_fetched_resource
+            docs = planning_search.get(req=req, lookup=None)
+
+            pit_id = docs.pagination["pit_id"]
+            hits = docs.hits.get("hits", {}).get("hits", [])
+            exhausted = len(hits) < page_size
+
+            if not include_associated_planning and not is_first_page:
+                group_ids = set(doc.get("event_item") or doc["_id"] for doc in docs.docs) - item_ids
+                group_ids -= set(first_item_ids)
+                if group_ids:
+                    pit_id, first_items = self._get_first_group_items(query, pit_id, group_ids)
+                    first_item_ids.update(first_items)
+
+            for index, (doc, hit) in enumerate(zip(docs.docs, hits)):
+                search_after = hit["sort"]
+
+                # Combined search prioritises Events over Planning items (see ``construct_combined_view_data_query``)
+                item_id = doc["_id"] if include_associated_planning else (doc.get("event_item") or doc["_id"])
+                if item_id not in item_ids and first_item_ids.get(item_id, doc["_id"]) == doc["_id"]:
+                    item_ids.add(item_id)
+                    items.append(doc)
+
+                if len(items) >= page_size:
+                    exhausted = exhausted and index == len(hits) - 1
+                    break
+
+        query = construct_combined_view_data_query(params, search_filter, items)
+        req = ParsedRequest()
+        req.args = MultiDict()
+        req.args["source"] = json.dumps(
+            {
+                "query": query["query"],
+                "sort": query["sort"] if query.get("sort") else self._get_sort(),
+                "size": 2 * page_size if include_associated_planning else page_size,
+            }
+        )
+        req.page = 1
+        req.max_results = page_size
+        self._set_result_args(req, params)
+
+        docs = planning_search.get(req=req, lookup=None)
+        return self._set_next_page(
+            PlanningSearchCursor(docs.hits, docs.docs, {"pit_id": pit_id, "search_after": search_after}), exhausted
+        )
+
+    def _get_first_group_items(self, query, pit_id, group_ids):
+        """Get the ID of the first item of each group (an Event and its Planning items) in the sort order
+
+        :return: The ID of the point in time, and the first item ID keyed by the ``_combined_id`` of the group
+        """
+
+        req = ParsedRequest()
+        req.args = MultiDict()
+        source = {
+            "query": {"bool": {"must": [query["query"]], "filter": [{"terms": {"_combined_id": list(group_ids)}}]}},
+            "sort": query["sort"] if query.get("sort") else self._get_sort(),
+            "collapse": {"field": "_combined_id"},
+        }
+        self._set_page(source, 1, len(group_ids), {"pit_id": pit_id})
+        req.args["source"] = json.dumps(source)
+        req.args["projections"] = json.dumps(["_id"])
+        req.exec_on_fetched_resource = False  # don't call on_fetched_resource
+        docs = get_resource_service("planning_search").get(req=req, lookup=None)
+
+        first_items = {}
+        for hit in docs.hits.get("hits", {}).get("hits", []):
+            combined_id = (hit.get("fields") or {}).get("_combined_id")
+            if combined_id:
+                first_items[combined_id[0]] = hit["_id"]
+
+        return docs.pagination["pit_id"], first_items
+
+    @staticmethod
+    def _set_result_args(req, params):
+        """Pass the projections and enrichment level of the request on to ``planning_search``"""
+
+        for arg in ("projections", "enrichment"):
+            if params.get(arg):
+                req.args[arg] = params[arg]
+
     def _get_events_and_planning(self, request, query, search_filter):
         """Get list of event and planning based on the search criteria
 
@@ -174,47 +387,211 @@ class EventsPlanningService(Service):
         req.exec_on_fetched_resource = False  # don't call on_fetched_resource
         return get_resource_service("planning_search").get(req=req, lookup=None)
 
-    def _search_events(self, request, params, query, search_filter):
+    def _search_events(self, request, params, query, search_filter, pagination=None):
         page = request.page or 1
         page_size = self._get_page_size(request, search_filter)
         req = ParsedRequest()
         req.args = MultiDict()
-        req.args["source"] = json.dumps(
-            {
-                "query": query["query"],
-                "sort": query["sort"] if query.get("sort") else {"dates.start": {"order": "asc"}},
-                "size": page_size,
-                "from": (page - 1) * page_size,
-            }
-        )
+        source = {
+            "query": query["query"],
+            "sort": query["sort"] if query.get("sort") else {"dates.start": {"order": "asc"}},
+        }
+        self._set_page(source, page, page_size, pagination)
+        req.args["source"] = json.dumps(source)
         req.args["repos"] = "events"
         req.page = page
         req.max_results = page_size
-        if params.get("projections"):
-            req.args["projections"] = params["projections"]
-        return get_resource_service("planning_search").get(req=req, lookup=None)
+        self._set_result_args(req, params)
 
-    def _search_planning(self, request, params, query, search_filter):
+        docs = get_resource_service("planning_search").get(req=req, lookup=None)
+        return self._set_next_page(docs, len(docs.docs) < page_size) if pagination is not None else docs
+
+    def _search_planning(self, request, params, query, search_filter, pagination=None):
         # params = request.args or MultiDict()
         # query = construct_planning_search_query(params)
         page = request.page or 1
         page_size = self._get_page_size(request, search_filter)
         req = ParsedRequest()
         req.args = MultiDict()
-        req.args["source"] = json.dumps(
-            {
-                "query": query["query"],
-                "sort": query["sort"] if query.get("sort") else self._get_sort(),
-                "size": page_size,
-                "from": (page - 1) * page_size,
-            }
-        )
+        source = {
+            "query": query["query"],
+            "sort": query["sort"] if query.get("sort") else self._get_sort(),
+        }
+        self._set_page(source, page, page_size, pagination)
+        req.args["source"] = json.dumps(source)
         req.args["repos"] = "planning"
         req.page = page
         req.max_results = page_size
-        if params.get("projections"):
-            req.args["projections"] = params["projections"]
-        return get_resource_service("planning_search").get(req=req, lookup=None)
+        self._set_result_args(req, params)
+
+        docs = get_resource_service("planning_search").get(req=req, lookup=None)
+        return self._set_next_page(docs, len(docs.docs) < page_size) if pagination is not None else docs
+
+    def _get_pagination(self, params):
+        """Get the point in time and ``search_after`` values used to paginate the search
+
+        Returns ``None`` if the search is paginated using ``page`` and ``max_results``.
+        A new point in time is opened when ``point_in_time`` is requested without a ``pit_id``.
+        """
+
+        pit_id = params.get("pit_id")
+        if not pit_id:
+            if not strtobool(params.get("point_in_time", False)):
+                return None
+
+            pit_id = get_resource_service("planning_search").open_point_in_time(
+                PlanningSearchService.repos, get_search_point_in_time_keep_alive()
+            )
+
+        search_after = None
+        if params.get("search_after"):
+            try:
+                search_after = json.loads(params["search_after"])
+            except ValueError:
+                search_after = None
+
+            if not isinstance(search_after, list):
+                raise SuperdeskApiError.badRequestError(message="search_after must be a JSON list")
+
+        return {"pit_id": pit_id, "search_after": search_after}
+
+    def _set_page(self, source, page, page_size, pagination=None):
+        """Set the page to retrieve, either using ``from`` or ``search_after`` against a point in time"""
+
+        source["size"] = page_size
+        if pagination is None:
+            source["from"] = (page - 1) * page_size
+            return
+
+        source["pit"] = {"id": pagination["pit_id"], "keep_alive": get_search_point_in_time_keep_alive()}
+        if pagination.get("search_after"):
+            source["search_after"] = pagination["search_after"]
+
+    def _set_next_page(self, docs, exhausted):
+        """Close the point in time once there are no more pages"""
+
+        if exhausted:
+            get_resource_service("planning_search").close_point_in_time(
+                PlanningSearchService.repos, docs.pagination["pit_id"]
+            )
+            docs.pagination = {"pit_id": None, "search_after": None}
+
+        return docs
+
+    def _add_virtual_occurrences(self, docs, request, params, search_filter, pagination, get_docs):
+        """Add the unsaved occurrences of virtual recurring series to the search results
+
+        The occurrences share the metadata of their series, so the series that match the query
+        (ignoring the date filters) are expanded for the requested date window.
+
+        A page includes the occurrences scheduled after the last item of the previous page, up to the
+        last item of this page (or all remaining occurrences if this is the last page). When paginating
+        against a point in time, these bounds are the ``search_after`` values of the previous and current
+        page, otherwise the previous page is retrieved to get its last item. This way every occurrence is
+        returned exactly once, with the page containing more than ``max_results`` items when occurrences are added.
+        """
+
+        if not get_virtual_recurring_series_enabled():
+            return docs
+
+        window_params = get_params_from_search_filter(search_filter)
+        window_params.update(params)
+        if get_sort_field(window_params, "schedule") != "schedule":
+            # Virtual occurrences are only supported when sorting by schedule
+            return docs
+
+        start, end = get_date_window(window_params)
+        masters_query = self._get_virtual_series_query(params, search_filter, start, end)
+        req = ParsedRequest()
+        req.args = MultiDict()
+        req.args["source"] = json.dumps({"query": masters_query["query"], "size": get_max_recurrent_events()})
+        req.args["repos"] = "events"
+        req.args["projections"] = json.dumps(["_id", "recurrence_id"])
+        req.exec_on_fetched_resource = False
+        recurrence_ids = list(
+            set(master["recurrence_id"] for master in get_resource_service("planning_search").get(req=req, lookup=None))
+        )
+
+        occurrences = get_virtual_occurrences_for_window(get_virtual_series_masters(recurrence_ids), start, end)
+        if not occurrences:
+            return docs
+
+        descending = get_sort_order(window_params, "ascending") == "desc"
+        page_size = self._get_page_size(request, search_filter)
+
+        def get_sort_value(item):
+            schedule = (item.get("dates") or {}).get("start") or item.get("planning_date")
+            if schedule.tzinfo is None:
+                schedule = pytz.utc.localize(schedule)
+            return -schedule.timestamp() if descending else schedule.timestamp()
+
+        def get_cursor_value(search_after):
+            # The first ``search_after`` value is the schedule, in milliseconds since epoch
+            value = search_after[0] if search_after else None
+            if not isinstance(value, (int, float)):
+                return None
+            return -value / 1000 if descending else value / 1000
+
+        def get_last_value(page):
+            hits = page.hits.get("hits", {}).get("hits") or []
+            value = get_cursor_value(hits[-1].get("sort")) if hits else None
+            return value if value is not None else get_sort_value(page.docs[-1])
+
+        if pagination is not None:
+            lower = get_cursor_value(pagination.get("search_after"))
+            upper = get_cursor_value((getattr(docs, "pagination", None) or {}).get("search_after"))
+            include = pagination.get("search_after") is None or lower is not None
+        else:
+            lower = None
+            include = True
+            if (request.page or 1) > 1:
+                previous_request = copy(request)
+                previous_request.page = request.page - 1
+                previous = get_docs(previous_request)
+                if len(previous.docs) < page_size:
+                    # The previous page was the last one, which included all remaining occurrences
+                    include = False
+                else:
+                    lower = get_last_value(previous)
+            upper = get_last_value(docs) if len(docs.docs) >= page_size else None
+
+        if include:
+            for occurrence in occurrences:
+                value = get_sort_value(occurrence)
+                if (lower is None or value > lower) and (upper is None or value <= upper):
+                    occurrence["_type"] = "events"
+                    docs.docs.append(occurrence)
+
+            docs.docs.sort(key=get_sort_value)
+
+        # Every occurrence in the date window is returned on one of the pages
+        total = docs.hits.get("hits", {}).get("total")
+        if isinstance(total, dict):
+            total["value"] = total.get("value", 0) + len(occurrences)
+        elif "hits" in docs.hits:
+            docs.hits["hits"]["total"] = (total or 0) + len(occurrences)
+
+        return docs
+
+    def _get_virtual_series_query(self, params, search_filter, start, end):
+        """Query for the virtual series that match the search, and overlap the date window"""
+
+        master_params = {key: value for key, value in params.items() if key not in DATE_PARAMS}
+        master_params["exclude_dates"] = True
+        master_filter = deepcopy(search_filter)
+        master_filter["params"] = {
+            key: value for key, value in master_filter["params"].items() if key not in DATE_PARAMS
+        }
+
+        query = construct_search_query("events", EVENT_SEARCH_FILTERS, master_params, master_filter)
+        query_filter = query["query"].setdefault("bool", {}).setdefault("filter", [])
+        query_filter.append(field_exists("virtual_series.end"))
+        if start is not None:
+            query_filter.append({"range": {"virtual_series.end": {"gte": start.isoformat()}}})
+        if end is not None:
+            query_filter.append({"range": {"dates.start": {"lte": end.isoformat()}}})
+
+        return query
 
     def _get_whitelist(self, repo):
         if repo == "events":
@@ -279,7 +656,7 @@ class EventsPlanningService(Service):
         req.max_results = page_size or self.default_page_size
         return self.get(req=req, lookup=None)
 
-    def search_raw(self, repo, query, sort=None, page=1, page_size=None, projections=None):
+    def search_raw(self, repo, query, sort=None, page=1, page_size=None, projections=None, enrichment=None):
         """Send raw elasticsearch query to `planning_search` service
 
         :param repo: Comma separated list of repos to search, defaults to ``events,planning``
@@ -288,6 +665,7 @@ class EventsPlanningService(Service):
         :param page: The page to retrieve, defaults to ``1``
         :param page_size: The page size to use, defaults to ``100``
         :param projections: List of fields to retrieve, default to return all fields
+        :param enrichment: The enrichment level of the items (``none``, ``ids`` or ``full``), defaults to ``full``
         :rtype `eve_elastic.elastic.ElasticCursor`
         :return: A cursor containing the list of items from the Elasticsearch query
         """
@@ -313,6 +691,8 @@ class EventsPlanningService(Service):
         req.max_results = page_size
         if projections is not None:
             req.args["projections"] = json.dumps(projections)
+        if enrichment is not None:
+            req.args["enrichment"] = enrichment
 
         return get_resource_service("planning_search").get(req=req, lookup=None)
 
@@ -329,13 +709,14 @@ class EventsPlanningService(Service):
 
         return self.search_repos(search_filter["item_type"], args, page, page_size, projections)
 
-    def get_locked_items(self, repo=None, page=None, page_size=None, projections=None):
+    def get_locked_items(self, repo=None, page=None, page_size=None, projections=None, enrichment=None):
         """Return the list of locked items in the provided ``repo``
 
         :param repo: Comma separated list of repos to search, defaults to ``events,planning``
         :param page: The page to retrieve, defaults to ``1``
         :param page_size: The page size to use, defaults to ``1000``
         :param projections: List of fields to retrieve, default to return all fields
+        :param enrichment: The enrichment level of the items (``none``, ``ids`` or ``full``), defaults to ``full``
         :rtype `eve_elastic.elastic.ElasticCursor`
         :return: A cursor containing the list of locked items in the provided ``repo``
         """
@@ -354,9 +735,45 @@ class EventsPlanningService(Service):
                 }
             },
             projections=projections,
+            enrichment=enrichment,
         )
 
 
+def _to_utc(value: Optional[Any]) -> Optional[datetime]:
+    if not value:
+        return None
+
+    date = str_to_date(value) if isinstance(value, str) else value
+    return date.astimezone(pytz.utc) if date.tzinfo else pytz.utc.localize(date)
+
+
+def get_date_window(params: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Returns the UTC start/end of the date window requested in the search params"""
+
+    date_filter, start_date, end_date, time_zone = get_date_params(params)
+    tz = pytz.timezone(time_zone or app.config["DEFAULT_TIMEZONE"])
+    now = utcnow()
+    today = tz.localize(datetime.combine(now.astimezone(tz).date(), time()))
+
+    if date_filter == DATE_RANGE.TODAY:
+        return today, today + timedelta(days=1)
+    elif date_filter == DATE_RANGE.TOMORROW:
+        return today + timedelta(days=1), today + timedelta(days=2)
+    elif date_filter == DATE_RANGE.LAST_24:
+        return now - timedelta(hours=24), now
+    elif date_filter in (DATE_RANGE.THIS_WEEK, DATE_RANGE.NEXT_WEEK):
+        start_of_next_week = get_start_of_next_week(today, int(params.get("start_of_week") or 0))
+        if date_filter == DATE_RANGE.THIS_WEEK:
+            return start_of_next_week - timedelta(days=7), start_of_next_week
+        return start_of_next_week, start_of_next_week + timedelta(days=7)
+    elif start_date or end_date:
+        return _to_utc(start_date), _to_utc(end_date)
+    elif strtobool(params.get("only_future", True)):
+        return today, None
+
+    return None, None
+
+
 class EventsPlanningResource(Resource):
     resource_methods = ["GET"]
     item_methods = []
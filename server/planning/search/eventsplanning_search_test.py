@@ -0,0 +1,173 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from datetime import datetime, timedelta
+
+import pytz
+from eve.utils import ParsedRequest
+from flask import json
+from werkzeug.datastructures import MultiDict
+
+from superdesk import get_resource_service
+from planning.tests import TestCase
+
+
+def get_event(item_id, start):
+    return {
+        "_id": item_id,
+        "guid": item_id,
+        "type": "event",
+        "state": "draft",
+        "_combined_id": item_id,
+        "dates": {"start": start, "end": start + timedelta(hours=1), "tz": "UTC"},
+        "_planning_schedule": [{"scheduled": start}],
+    }
+
+
+def get_planning(item_id, scheduled, event_item=None):
+    planning = {
+        "_id": item_id,
+        "guid": item_id,
+        "type": "planning",
+        "state": "draft",
+        "_combined_id": event_item or item_id,
+        "planning_date": scheduled,
+        "_planning_schedule": [{"scheduled": scheduled}],
+    }
+    if event_item:
+        planning["event_item"] = event_item
+    return planning
+
+
+class CombinedViewPaginationTestCase(TestCase):
+    def get_page(self, pagination=None):
+        req = ParsedRequest()
+        req.args = MultiDict({"repo": "combined", "point_in_time": "true"})
+        if pagination:
+            req.args["pit_id"] = pagination["pit_id"]
+            req.args["search_after"] = json.dumps(pagination["search_after"])
+        req.max_results = 2
+
+        docs = get_resource_service("events_planning_search").get(req=req, lookup=None)
+        return [doc["_id"] for doc in docs.docs], docs.pagination
+
+    def test_groups_are_not_repeated_across_pages(self):
+        with self.app.app_context():
+            start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+            self.app.data.insert(
+                "events",
+                [get_event("event1", start), get_event("event3", start + timedelta(days=4))],
+            )
+            self.app.data.insert(
+                "planning",
+                [
+                    get_planning("plan2", start + timedelta(days=1)),
+                    # Sorts before its Event, so the group is returned at the position of the Planning item
+                    get_planning("plan3", start + timedelta(days=2), "event3"),
+                    # Sorts after its Event, which was already returned on the first page
+                    get_planning("plan1", start + timedelta(days=3), "event1"),
+                ],
+            )
+
+            first_page, pagination = self.get_page()
+            self.assertEqual(["event1", "plan2"], first_page)
+
+            second_page, pagination = self.get_page(pagination)
+            self.assertEqual(["event3"], second_page)
+            self.assertIsNone(pagination["pit_id"])
+
+
+class VirtualOccurrencesPaginationTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            self.app.config["PLANNING_VIRTUAL_RECURRING_SERIES"] = True
+            start = datetime(2099, 11, 21, 12, 00, 00, tzinfo=pytz.UTC)
+            get_resource_service("events").post(
+                [
+                    {
+                        "guid": "series",
+                        "name": "Daily Club",
+                        "dates": {
+                            "start": start,
+                            "end": start + timedelta(hours=1),
+                            "tz": "UTC",
+                            "recurring_rule": {
+                                "frequency": "DAILY",
+                                "interval": 1,
+                                "count": 5,
+                                "endRepeatMode": "count",
+                            },
+                        },
+                    }
+                ]
+            )
+            self.app.data.insert(
+                "events",
+                [
+                    get_event("event1", start + timedelta(days=1, hours=6)),
+                    get_event("event2", start + timedelta(days=3, hours=6)),
+                    get_event("event3", start + timedelta(days=4, hours=6)),
+                ],
+            )
+
+            self.master = get_resource_service("events").find_one(req=None, guid="series")
+            self.expected = [
+                self.master["_id"],
+                self.get_occurrence_id(start + timedelta(days=1)),
+                "event1",
+                self.get_occurrence_id(start + timedelta(days=2)),
+                self.get_occurrence_id(start + timedelta(days=3)),
+                "event2",
+                self.get_occurrence_id(start + timedelta(days=4)),
+                "event3",
+            ]
+
+    def get_occurrence_id(self, start):
+        return "{}__{}".format(self.master["recurrence_id"], start.strftime("%Y%m%dT%H%M%S"))
+
+    def get_page(self, args):
+        req = ParsedRequest()
+        req.args = MultiDict(args)
+        req.max_results = 2
+        req.page = int(args.get("page", 1))
+
+        docs = get_resource_service("events_planning_search").get(req=req, lookup=None)
+        self.assertEqual(len(self.expected), docs.count())
+        return [doc["_id"] for doc in docs.docs], getattr(docs, "pagination", None)
+
+    def assert_series_not_saved(self):
+        self.assertEqual(1, self.app.data.find("events", None, {"recurrence_id": self.master["recurrence_id"]}).count())
+
+    def test_occurrences_are_returned_once_using_pages(self):
+        with self.app.app_context():
+            items = []
+            for page in range(1, 5):
+                page_items, _pagination = self.get_page({"repo": "events", "page": page})
+                items.extend(page_items)
+
+            self.assertEqual(self.expected, items)
+            self.assert_series_not_saved()
+
+    def test_occurrences_are_returned_once_using_point_in_time(self):
+        with self.app.app_context():
+            items, pagination = self.get_page({"repo": "events", "point_in_time": "true"})
+            while pagination["pit_id"]:
+                page_items, pagination = self.get_page(
+                    {
+                        "repo": "events",
+                        "pit_id": pagination["pit_id"],
+                        "search_after": json.dumps(pagination["search_after"]),
+                    }
+                )
+                items.extend(page_items)
+
+            self.assertEqual(self.expected, items)
+            self.assert_series_not_saved()
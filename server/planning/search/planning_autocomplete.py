@@ -1,9 +1,10 @@
-from typing import Dict, Any
-from datetime import timedelta
+from typing import Dict, Any, Callable
+from datetime import datetime, timedelta
 
-from flask import current_app as app
+from flask import json, current_app as app
 
-from superdesk.utc import utcnow
+from superdesk.cache import cache
+from superdesk.utc import utcnow, utc
 from apps.archive.autocomplete import (
     SETTING_LIMIT as AUTOCOMPLETE_LIMIT,
     SETTING_DAYS as AUTOCOMPLETE_DAYS,
@@ -11,7 +12,57 @@ from apps.archive.autocomplete import (
     register_autocomplete_suggestion_provider,
 )
 
-from planning.common import WORKFLOW_STATE, POST_STATE
+from planning.common import WORKFLOW_STATE, POST_STATE, get_autocomplete_cache_ttl
+
+#: Cached suggestions are recomputed at least this often, as older items leave the ``AUTOCOMPLETE_DAYS`` window
+MAX_CACHE_AGE = timedelta(hours=1)
+
+#: Writes are only searchable once the index has been refreshed (every second by default),
+#: so changes are checked from this long before the entry was last refreshed
+INDEX_REFRESH_MARGIN = timedelta(seconds=5)
+
+
+def get_cached_suggestions(
+    resource: str, field: str, language: str, get_suggestions: Callable[[str, str], Dict[str, int]]
+) -> Dict[str, int]:
+    """Returns the suggestions from the cache, if enabled with ``PLANNING_AUTOCOMPLETE_CACHE_TTL``
+
+    Once an entry is older than the TTL, it is renewed without running the aggregations again
+    if no items of the ``resource`` have been modified since it was last checked.
+    """
+
+    ttl = get_autocomplete_cache_ttl()
+    if not ttl:
+        return get_suggestions(field, language)
+
+    key = "planning_autocomplete:{}:{}:{}".format(resource, field, language)
+    now = utcnow().replace(microsecond=0)
+
+    # Stored as a JSON string, so the Superdesk cache does not convert the suggestions to dates or ObjectIds
+    cached = cache.backend.load(key)
+    entry = json.loads(cached) if cached is not None else None
+
+    if entry is not None:
+        refreshed = datetime.fromtimestamp(entry["refreshed"], utc)
+        computed = datetime.fromtimestamp(entry["computed"], utc)
+
+        if now - refreshed < timedelta(seconds=ttl):
+            return entry["suggestions"]
+        elif now - computed < MAX_CACHE_AGE and not _has_changes_since(resource, refreshed - INDEX_REFRESH_MARGIN):
+            entry["refreshed"] = int(now.timestamp())
+            cache.backend.save({key: json.dumps(entry)}, ttl=int(MAX_CACHE_AGE.total_seconds()))
+            return entry["suggestions"]
+
+    suggestions = get_suggestions(field, language)
+    entry = {"computed": int(now.timestamp()), "refreshed": int(now.timestamp()), "suggestions": suggestions}
+    cache.backend.save({key: json.dumps(entry)}, ttl=int(MAX_CACHE_AGE.total_seconds()))
+    return suggestions
+
+
+def _has_changes_since(resource: str, since: datetime) -> bool:
+    # Any modified item could add or remove suggestions (including items no longer matching the filters)
+    query = {"query": {"bool": {"filter": [{"range": {"_updated": {"gte": since}}}]}}, "terminate_after": 1}
+    return app.data.elastic.search(query, resource, params={"size": 0}).count() > 0
 
 
 def get_planning_suggestions(field: str, language: str) -> Dict[str, int]:
@@ -163,6 +214,14 @@ def _construct_aggs_query(field: str, language: str) -> Dict[str, Any]:
     }
 
 
+def get_cached_planning_suggestions(field: str, language: str) -> Dict[str, int]:
+    return get_cached_suggestions("planning", field, language, get_planning_suggestions)
+
+
+def get_cached_event_suggestions(field: str, language: str) -> Dict[str, int]:
+    return get_cached_suggestions("events", field, language, get_event_suggestions)
+
+
 def init_app(_app):
-    register_autocomplete_suggestion_provider("planning", get_planning_suggestions)
-    register_autocomplete_suggestion_provider("events", get_event_suggestions)
+    register_autocomplete_suggestion_provider("planning", get_cached_planning_suggestions)
+    register_autocomplete_suggestion_provider("events", get_cached_event_suggestions)
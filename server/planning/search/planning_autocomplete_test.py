@@ -0,0 +1,84 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from datetime import timedelta
+from unittest import mock
+
+from superdesk.cache import cache
+from superdesk.utc import utcnow
+from planning.tests import TestCase
+
+from .planning_autocomplete import get_cached_suggestions, INDEX_REFRESH_MARGIN
+
+
+class PlanningAutocompleteCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.computed = 0
+        with self.app.app_context():
+            for language in ("en", "de"):
+                cache.backend.delete("planning_autocomplete:planning:slugline:{}".format(language))
+
+    def get_suggestions(self, field, language):
+        self.computed += 1
+        return {"Slugline": 1}
+
+    def get_cached(self, language="en"):
+        return get_cached_suggestions("planning", "slugline", language, self.get_suggestions)
+
+    def test_suggestions_are_cached(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_AUTOCOMPLETE_CACHE_TTL"] = 60
+
+            self.assertEqual(self.get_cached(), {"Slugline": 1})
+            self.assertEqual(self.get_cached(), {"Slugline": 1})
+            self.assertEqual(self.computed, 1)
+
+            self.get_cached("de")
+            self.assertEqual(self.computed, 2)
+
+    def test_expired_suggestions_are_only_recomputed_after_changes(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_AUTOCOMPLETE_CACHE_TTL"] = 60
+            self.get_cached()
+            later = utcnow() + timedelta(minutes=5)
+
+            with mock.patch("planning.search.planning_autocomplete.utcnow", return_value=later):
+                with mock.patch("planning.search.planning_autocomplete._has_changes_since", return_value=False):
+                    self.get_cached()
+                    self.assertEqual(self.computed, 1)
+
+            with mock.patch("planning.search.planning_autocomplete.utcnow", return_value=later + timedelta(minutes=5)):
+                with mock.patch("planning.search.planning_autocomplete._has_changes_since", return_value=True):
+                    self.get_cached()
+                    self.assertEqual(self.computed, 2)
+
+    def test_changes_are_checked_before_the_index_refresh(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_AUTOCOMPLETE_CACHE_TTL"] = 60
+            now = utcnow().replace(microsecond=0)
+            with mock.patch("planning.search.planning_autocomplete.utcnow", return_value=now):
+                self.get_cached()
+
+            with mock.patch("planning.search.planning_autocomplete.utcnow", return_value=now + timedelta(minutes=5)):
+                with mock.patch(
+                    "planning.search.planning_autocomplete._has_changes_since", return_value=False
+                ) as has_changes_since:
+                    self.get_cached()
+
+            # Items written just before the suggestions were computed may not have been searchable yet
+            has_changes_since.assert_called_once_with("planning", now - INDEX_REFRESH_MARGIN)
+
+    def test_cache_disabled(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_AUTOCOMPLETE_CACHE_TTL"] = 0
+            self.get_cached()
+            self.get_cached()
+            self.assertEqual(self.computed, 2)
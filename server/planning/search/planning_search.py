@@ -10,22 +10,113 @@
 
 """Superdesk Planning Search."""
 import logging
+import arrow
+import ciso8601
+import pytz
+from datetime import datetime
 from flask import json, current_app as app
-from eve_elastic.elastic import parse_date, get_dates
+from eve_elastic.elastic import get_dates, fix_query, ElasticCursor
 from copy import deepcopy
 
 import superdesk
+from superdesk.errors import SuperdeskApiError
 from superdesk.metadata.utils import item_url
+from superdesk.timer import timer
 
-from planning.planning.planning import planning_schema
+from planning.bulk import get_collection
+from planning.planning.planning import planning_schema, INTERNAL_SEARCH_FIELDS
 from planning.events.events_schema import events_schema
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .result_cache import get_cached_result
 
 logger = logging.getLogger(__name__)
 
+DatePath = Tuple[str, ...]
+
+#: Levels of enrichment applied to the search results, using the ``enrichment`` request arg
+#: ``none``: The items are returned as stored in Elastic
+#: ``ids``: Only the IDs of related items are added (such as ``planning_ids`` of Events)
+#: ``full``: The ``on_fetched_resource`` callbacks of each resource are called (the default)
+ENRICHMENT_NONE = "none"
+ENRICHMENT_IDS = "ids"
+ENRICHMENT_FULL = "full"
+ENRICHMENT_LEVELS = (ENRICHMENT_NONE, ENRICHMENT_IDS, ENRICHMENT_FULL)
+
+#: Date fields of Events nested inside other fields, and therefore not returned by ``get_dates``
+EVENT_NESTED_DATE_PATHS: List[DatePath] = [
+    ("dates", "start"),
+    ("dates", "end"),
+    ("dates", "recurring_rule", "until"),
+]
+
+
+def parse_iso_date(value: str) -> Optional[datetime]:
+    """Parse an ISO-8601 date string, as returned by Elastic, into a UTC datetime
+
+    Strings without a time zone are treated as UTC, same as the ``parse_date`` function of ``eve_elastic``.
+    """
+
+    if not value:
+        return None
+
+    try:
+        date = ciso8601.parse_datetime(value)
+    except ValueError:
+        date = None
+
+    # Fall back to ``arrow`` for the formats not supported by ``ciso8601``
+    if date is None:
+        date = arrow.get(value).datetime
+
+    return pytz.utc.localize(date) if date.tzinfo is None else date.astimezone(pytz.utc)
+
+
+def parse_date_paths(doc: Dict[str, Any], paths: List[DatePath], parsed: Dict[str, Optional[datetime]]):
+    """Parse the date strings found at the provided paths of the doc, in place
+
+    ``parsed`` maps the strings already parsed in the current batch of docs to their date,
+    as the same dates are often repeated across docs (such as ``_updated`` of items actioned together,
+    or the ``recurring_rule`` of a series of Events).
+    """
+
+    for path in paths:
+        parent: Any = doc
+        for key in path[:-1]:
+            parent = parent.get(key)
+            if not isinstance(parent, dict):
+                break
+        else:
+            field = path[-1]
+            value = parent.get(field)
+            if isinstance(value, str):
+                date = parsed.get(value)
+                if date is None:
+                    date = parsed[value] = parse_iso_date(value)
+                parent[field] = date
+
+
+class PlanningSearchCursor(ElasticCursor):
+    """Search results cursor, including the values used to request the next page
+
+    Used when paginating using ``search_after`` against a point in time.
+    The ``pit_id`` and ``search_after`` values are returned in the ``_pagination``
+    attribute of the response.
+    """
+
+    def __init__(self, hits=None, docs=None, pagination=None):
+        super().__init__(hits, docs)
+        self.pagination = pagination
+
+    def extra(self, response):
+        super().extra(response)
+        if self.pagination is not None:
+            response["_pagination"] = self.pagination
+
 
 class PlanningSearchService(superdesk.Service):
     repos = ["events", "planning"]
+    _date_paths: Optional[Dict[str, List[DatePath]]] = None
 
     @property
     def elastic(self):
@@ -62,7 +153,11 @@ class PlanningSearchService(superdesk.Service):
 
             params["_source"] = fields
 
-        docs = self.elastic.search(query, types, params)
+        if query.get("pit"):
+            docs = self._search_point_in_time(query, types, params)
+        else:
+            hits = get_cached_result(query, types, params, lambda: self._search(query, types, params))
+            docs = self.elastic._parse_hits(hits, types[0])
         self._format_docs(docs)
 
         # to avoid call on_fetched_resource callback from some internal resource
@@ -73,18 +168,126 @@ class PlanningSearchService(superdesk.Service):
             pass
 
         if on_fetched_resource:
-            for resource in types:
-                response = {
-                    app.config["ITEMS"]: [
-                        doc
-                        for doc in docs
-                        if doc["type"] == resource or (resource == "events" and doc["type"] == "event")
-                    ]
-                }
+            self.on_fetched_docs(docs, types, self.get_enrichment(getattr(req, "args", {})))
+
+        return docs
+
+    def get_enrichment(self, args) -> str:
+        """Get the enrichment level requested, defaults to ``full``"""
+
+        enrichment = args.get("enrichment") or ENRICHMENT_FULL
+        if enrichment not in ENRICHMENT_LEVELS:
+            raise SuperdeskApiError.badRequestError(
+                "Invalid enrichment level {}, must be one of {}".format(enrichment, ", ".join(ENRICHMENT_LEVELS))
+            )
+
+        return enrichment
+
+    def on_fetched_docs(self, docs, types, enrichment=ENRICHMENT_FULL):
+        """Enrich the docs of each resource type, based on the requested enrichment level
+
+        With ``full`` enrichment, the ``on_fetched_resource`` callbacks are called for each resource type.
+        The time taken by each callback is logged.
+        """
+
+        if enrichment == ENRICHMENT_NONE:
+            return
+
+        for resource in types:
+            items = [
+                doc for doc in docs if doc["type"] == resource or (resource == "events" and doc["type"] == "event")
+            ]
+            if enrichment == ENRICHMENT_IDS:
+                with timer("planning_search:enrich_ids:{}".format(resource)):
+                    self._add_related_ids(resource, items)
+                continue
+
+            response = {app.config["ITEMS"]: items}
+            with timer("planning_search:on_fetched_resource:{}".format(resource)):
                 getattr(app, "on_fetched_resource")(resource, response)
+            with timer("planning_search:on_fetched_resource_{}".format(resource)):
                 getattr(app, "on_fetched_resource_%s" % resource)(response)
 
-        return docs
+    @staticmethod
+    def _add_related_ids(resource, items):
+        """Add the IDs of related items, using a single query per resource
+
+        The Assignment IDs of Planning items are already stored in their coverages,
+        so only the fields used internally for searching are removed.
+        """
+
+        if resource == "planning":
+            for item in items:
+                for field in INTERNAL_SEARCH_FIELDS:
+                    item.pop(field, None)
+            return
+
+        if not items:
+            return
+
+        planning_ids = {}
+        for plan in get_collection("planning").find(
+            {"event_item": {"$in": [item["_id"] for item in items]}}, projection={"event_item": 1}
+        ):
+            planning_ids.setdefault(plan["event_item"], []).append(plan["_id"])
+
+        for item in items:
+            if planning_ids.get(item["_id"]):
+                item["planning_ids"] = planning_ids[item["_id"]]
+
+    def get_inner_hits(self, hit, name):
+        """Returns the formatted docs of the named ``inner_hits`` of a search hit"""
+
+        inner_hits = (hit.get("inner_hits") or {}).get(name)
+        if not inner_hits:
+            return []
+
+        docs = self.elastic._parse_hits(inner_hits, self.repos[0])
+        self._format_docs(docs)
+        return docs.docs
+
+    def _search(self, query, types, params):
+        """Run the query against the indexes of the provided types, returning the raw Elastic response"""
+
+        search_params = self.elastic._get_default_search_params()
+        search_params.update(params)
+        index = [self.elastic._resource_index(resource) for resource in types]
+        return self.elastic.elastic(types[0]).search(body=fix_query(query), index=index, **search_params)
+
+    def _search_point_in_time(self, query, types, params):
+        """Run the query against a point in time
+
+        The index is part of the point in time, so the search is sent without one
+        """
+
+        search_params = self.elastic._get_default_search_params()
+        search_params.update(params)
+        hits = self.elastic.elastic(types[0]).search(body=query, **search_params)
+        docs = self.elastic._parse_hits(hits, types[0])
+        last_hit = (hits.get("hits", {}).get("hits") or [None])[-1]
+
+        return PlanningSearchCursor(
+            docs.hits,
+            docs.docs,
+            {
+                "pit_id": hits.get("pit_id") or query["pit"]["id"],
+                "search_after": last_hit.get("sort") if last_hit else None,
+            },
+        )
+
+    def open_point_in_time(self, repos, keep_alive):
+        """Open a point in time against the indexes of the provided repos, returning its ID"""
+
+        index = ",".join(self.elastic._resource_index(repo) for repo in repos)
+        response = self.elastic.elastic(repos[0]).open_point_in_time(index=index, keep_alive=keep_alive)
+        return response["id"]
+
+    def close_point_in_time(self, repos, pit_id):
+        try:
+            self.elastic.elastic(repos[0]).close_point_in_time(body={"id": pit_id})
+        except Exception:
+            # The point in time may have already expired
+            logger.warning("Failed to close point in time {}".format(pit_id))
 
     def _get_date_fields(self, resource: str):
         datasource = self.elastic.get_datasource(resource)
@@ -93,28 +296,30 @@ class PlanningSearchService(superdesk.Service):
         schema.update(app.config["DOMAIN"][resource].get("schema", {}))
         return get_dates(schema)
 
+    def _get_date_paths(self, resource: str) -> List[DatePath]:
+        """Returns the paths to the date fields of the resource
+
+        These are computed from the schema once, on first use, instead of for every search.
+        """
+
+        if self._date_paths is None:
+            self._date_paths = {}
+
+        paths = self._date_paths.get(resource)
+        if paths is None:
+            paths = [(field,) for field in dict.fromkeys(self._get_date_fields(resource))]
+            if resource == "events":
+                paths.extend(EVENT_NESTED_DATE_PATHS)
+            self._date_paths[resource] = paths
+
+        return paths
+
     def _format_docs(self, docs):
-        date_fields = {}
+        parsed: Dict[str, Optional[datetime]] = {}
 
         for doc in docs:
             resource = "events" if doc["type"] == "event" else doc["type"]
-
-            if not date_fields.get(resource):
-                date_fields[resource] = self._get_date_fields(resource)
-
-            # Format root level date types
-            for field in date_fields[resource]:
-                if isinstance(doc.get(field), str):
-                    doc[field] = parse_date(doc[field])
-
-            # Format nested date types
-            if resource == "events" and doc.get("dates"):
-                if doc["dates"].get("start"):
-                    doc["dates"]["start"] = parse_date(doc["dates"]["start"])
-                if doc["dates"].get("end"):
-                    doc["dates"]["end"] = parse_date(doc["dates"]["end"])
-                if (doc["dates"].get("recurring_rule") or {}).get("until"):
-                    doc["dates"]["recurring_rule"]["until"] = parse_date(doc["dates"]["recurring_rule"]["until"])
+            parse_date_paths(doc, self._get_date_paths(resource), parsed)
 
     def _get_projected_fields(self, req):
         """Get elastic projected fields."""
@@ -0,0 +1,105 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from datetime import datetime
+
+import pytz
+from superdesk import get_resource_service
+from superdesk.errors import SuperdeskApiError
+from planning.tests import TestCase
+
+from .planning_search import ENRICHMENT_NONE, ENRICHMENT_IDS, parse_iso_date
+
+
+class PlanningSearchServiceTestCase(TestCase):
+    def test_format_docs_parses_dates(self):
+        with self.app.app_context():
+            docs = [
+                {
+                    "_id": "event1",
+                    "type": "event",
+                    "_updated": "2024-03-01T10:00:00+0000",
+                    "dates": {
+                        "start": "2024-03-02T10:00:00+0000",
+                        "end": "2024-03-02T11:00:00+0000",
+                        "recurring_rule": {"until": "2024-03-10T00:00:00+0000"},
+                    },
+                },
+                {
+                    "_id": "plan1",
+                    "type": "planning",
+                    "_updated": "2024-03-01T10:00:00+0000",
+                    "planning_date": "2024-03-02T10:00:00+0000",
+                },
+                {"_id": "plan2", "type": "planning", "planning_date": ""},
+            ]
+
+            get_resource_service("planning_search")._format_docs(docs)
+
+            updated = datetime(2024, 3, 1, 10, tzinfo=pytz.utc)
+            self.assertEqual(docs[0]["_updated"], updated)
+            self.assertEqual(docs[0]["dates"]["start"], datetime(2024, 3, 2, 10, tzinfo=pytz.utc))
+            self.assertEqual(docs[0]["dates"]["end"], datetime(2024, 3, 2, 11, tzinfo=pytz.utc))
+            self.assertEqual(docs[0]["dates"]["recurring_rule"]["until"], datetime(2024, 3, 10, tzinfo=pytz.utc))
+            self.assertEqual(docs[1]["_updated"], updated)
+            self.assertEqual(docs[1]["planning_date"], datetime(2024, 3, 2, 10, tzinfo=pytz.utc))
+            self.assertIsNone(docs[2]["planning_date"])
+
+    def test_parse_iso_date(self):
+        expected = datetime(2024, 3, 2, 10, tzinfo=pytz.utc)
+        for value in [
+            "2024-03-02T10:00:00+0000",
+            "2024-03-02T10:00:00",
+            "2024-03-02T12:00:00+02:00",
+            "2024-03-02T10:00:00.000Z",
+        ]:
+            date = parse_iso_date(value)
+            self.assertEqual(date, expected)
+            self.assertEqual(date.utcoffset().total_seconds(), 0)
+
+        self.assertIsNone(parse_iso_date(""))
+
+    def test_enrichment_levels(self):
+        with self.app.app_context():
+            self.app.data.insert("planning", [{"_id": "plan1", "event_item": "event1"}])
+            service = get_resource_service("planning_search")
+
+            def get_docs():
+                return [
+                    {"_id": "event1", "type": "event"},
+                    {"_id": "event2", "type": "event"},
+                    {
+                        "_id": "plan1",
+                        "type": "planning",
+                        "_planning_schedule": [{"scheduled": "2024-03-02"}],
+                        "_combined_id": "plan1",
+                        "_schedule_days": ["2024-03-02"],
+                        "_planning_schedule_min": "2024-03-02",
+                        "_planning_schedule_max": "2024-03-02",
+                    },
+                ]
+
+            docs = get_docs()
+            service.on_fetched_docs(docs, ["events", "planning"], ENRICHMENT_NONE)
+            self.assertEqual(docs, get_docs())
+
+            docs = get_docs()
+            service.on_fetched_docs(docs, ["events", "planning"], ENRICHMENT_IDS)
+            self.assertEqual(docs[0]["planning_ids"], ["plan1"])
+            self.assertNotIn("planning_ids", docs[1])
+            self.assertNotIn("_planning_schedule", docs[2])
+            self.assertNotIn("_combined_id", docs[2])
+            self.assertNotIn("_schedule_days", docs[2])
+            self.assertNotIn("_planning_schedule_min", docs[2])
+            self.assertNotIn("_planning_schedule_max", docs[2])
+            self.assertNotIn("coverages", docs[2])
+
+            with self.assertRaises(SuperdeskApiError):
+                service.get_enrichment({"enrichment": "some"})
@@ -11,18 +11,26 @@
 from typing import Dict, Any, Optional, List, Callable, Union
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, time
+import pytz
+from flask import current_app as app
 from eve.utils import str_to_date as _str_to_date, date_to_str
 
 from superdesk import get_resource_service
 from superdesk.errors import SuperdeskApiError
 from superdesk.default_settings import strtobool as _strtobool
 from superdesk.users.services import current_user_has_privilege
+from superdesk.utc import utcnow
 
 from apps.auth import get_user_id
 
 from planning.search.queries import elastic
-from planning.common import POST_STATE, WORKFLOW_STATE
+from planning.common import (
+    POST_STATE,
+    WORKFLOW_STATE,
+    get_schedule_days_search_enabled,
+    get_start_of_next_week,
+)
 from planning.content_profiles.utils import get_multilingual_fields
 
 logger = logging.getLogger(__name__)
@@ -223,7 +231,9 @@ def search_locked(params: Dict[str, Any], query: elastic.ElasticQuery):
         ids = set()
         event_items = set()
         recurrence_ids = set()
-        locked_items = search_service.get_locked_items(projections=["_id", "type", "recurrence_id", "event_item"])
+        locked_items = search_service.get_locked_items(
+            projections=["_id", "type", "recurrence_id", "event_item"], enrichment="none"
+        )
 
         if not locked_items.count():
             # If there are no locked items there is no need to perform logic
@@ -314,6 +324,39 @@ def get_sort_order(params: Dict[str, Any], default: str) -> str:
     return "asc" if (params.get("sort_order") or default) == "ascending" else "desc"
 
 
+def search_schedule_days(params: Dict[str, Any], query: elastic.ElasticQuery) -> bool:
+    """Search the common date filters using the ``_schedule_days`` field
+
+    Returns ``False`` if the date filter cannot be searched this way, in which case the range queries are to be used.
+    The ``_schedule_days`` are stored in ``DEFAULT_TIMEZONE``, so this is only used for requests in that time zone.
+    """
+
+    date_filter, _start_date, _end_date, time_zone = get_date_params(params)
+    default_time_zone = app.config["DEFAULT_TIMEZONE"]
+
+    if (
+        date_filter not in SCHEDULE_DAYS_DATE_FILTERS
+        or (time_zone or default_time_zone) != default_time_zone
+        or not get_schedule_days_search_enabled()
+    ):
+        return False
+
+    today = utcnow().astimezone(pytz.timezone(default_time_zone)).date()
+    if date_filter == elastic.DATE_RANGE.TODAY:
+        days = [today]
+    elif date_filter == elastic.DATE_RANGE.TOMORROW:
+        days = [today + timedelta(days=1)]
+    else:
+        start_of_week = int(params.get("start_of_week") or 0)
+        start = get_start_of_next_week(datetime.combine(today, time()), start_of_week).date()
+        if date_filter == elastic.DATE_RANGE.THIS_WEEK:
+            start -= timedelta(days=7)
+        days = [start + timedelta(days=day) for day in range(7)]
+
+    query.filter.append(elastic.terms(field="_schedule_days", values=[day.isoformat() for day in days]))
+    return True
+
+
 def search_date_non_schedule(params: Dict[str, Any], query: elastic.ElasticQuery):
     field_name = get_sort_field(params, "created")
     if not field_name or field_name == "schedule":
@@ -465,6 +508,14 @@ def search_priority(params: Dict[str, Any], query: elastic.ElasticQuery):
         query.must.append(elastic.terms(field="priority", values=priorities))
 
 
+#: Date filters that can be searched using the ``_schedule_days`` field
+SCHEDULE_DAYS_DATE_FILTERS = (
+    elastic.DATE_RANGE.TODAY,
+    elastic.DATE_RANGE.TOMORROW,
+    elastic.DATE_RANGE.THIS_WEEK,
+    elastic.DATE_RANGE.NEXT_WEEK,
+)
+
 COMMON_SEARCH_FILTERS: List[Callable[[Dict[str, Any], elastic.ElasticQuery], None]] = [
     search_item_ids,
     search_name,
@@ -512,6 +563,10 @@ COMMON_PARAMS: List[str] = [
     "page",
     "filter_id",
     "projections",
+    "enrichment",
+    "point_in_time",
+    "pit_id",
+    "search_after",
     "sort_order",
     "sort_field",
     "original_creator",
@@ -18,6 +18,7 @@ from .common import (
     strtobool,
     str_to_array,
     search_date_non_schedule,
+    search_schedule_days,
     get_sort_field,
     get_sort_order,
     search_text_field,
@@ -306,11 +307,12 @@ def search_dates(params: Dict[str, Any], query: elastic.ElasticQuery):
     elif get_sort_field(params, "schedule") != "schedule":
         search_date_non_schedule(params, query)
     else:
-        search_date_today(params, query)
-        search_date_tomorrow(params, query)
+        if not search_schedule_days(params, query):
+            search_date_today(params, query)
+            search_date_tomorrow(params, query)
+            search_date_this_week(params, query)
+            search_date_next_week(params, query)
         search_date_last_24_hours(params, query)
-        search_date_this_week(params, query)
-        search_date_next_week(params, query)
         search_date_start(params, query)
         search_date_end(params, query)
         search_date_range(params, query)
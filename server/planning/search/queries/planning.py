@@ -13,7 +13,7 @@ from typing import Any, Dict, List, Callable
 from copy import deepcopy
 
 from planning.search.queries import elastic
-from planning.common import WORKFLOW_STATE
+from planning.common import WORKFLOW_STATE, get_schedule_range_search_enabled
 from .common import (
     get_date_params,
     COMMON_SEARCH_FILTERS,
@@ -22,6 +22,7 @@ from .common import (
     str_to_array,
     str_to_number,
     search_date_non_schedule,
+    search_schedule_days,
     get_sort_field,
     get_sort_order,
     search_text_field,
@@ -153,6 +154,48 @@ def search_by_events(params: Dict[str, Any], query: elastic.ElasticQuery):
         query.must.append(elastic.terms(field="event_item", values=event_ids))
 
 
+def schedule_range(path: str, bounds: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a query matching Planning items with any ``<path>.scheduled`` date within the ``bounds``
+
+    If enabled, the ``<path>_min`` and ``<path>_max`` fields are used, so a nested query is only required
+    when the range lies between the first and last scheduled dates of the item.
+    """
+
+    nested_query = elastic.nested(path=path, query={"bool": {"filter": {"range": {path + ".scheduled": bounds}}}})
+    if not get_schedule_range_search_enabled():
+        return nested_query
+
+    min_field = path + "_min"
+    max_field = path + "_max"
+    lower = {key: value for key, value in bounds.items() if key in ("gt", "gte")}
+    upper = {key: value for key, value in bounds.items() if key in ("lt", "lte")}
+    options = {key: value for key, value in bounds.items() if key not in ("gt", "gte", "lt", "lte")}
+
+    if not upper:
+        # Any date after the lower bound, i.e. the last date is after it
+        return {"range": {max_field: bounds}}
+    elif not lower:
+        # Any date before the upper bound, i.e. the first date is before it
+        return {"range": {min_field: bounds}}
+
+    before_lower = {"lt" if key == "gte" else "lte": value for key, value in lower.items()}
+    after_upper = {"gte" if key == "lt" else "gt": value for key, value in upper.items()}
+
+    return elastic.bool_or(
+        [
+            {"range": {min_field: bounds}},
+            {"range": {max_field: bounds}},
+            elastic.bool_and(
+                [
+                    {"range": {min_field: dict(options, **before_lower)}},
+                    {"range": {max_field: dict(options, **after_upper)}},
+                    nested_query,
+                ]
+            ),
+        ]
+    )
+
+
 def search_date(params: Dict[str, Any], query: elastic.ElasticQuery):
     date_filter, start_date, end_date, time_zone = get_date_params(params)
 
@@ -178,26 +221,14 @@ def search_date(params: Dict[str, Any], query: elastic.ElasticQuery):
             if not query_range["range"][field_name].get("gte") and not not query_range["range"][field_name].get("lte"):
                 query_range["range"][field_name]["gte"] = "now/d"
 
-        planning_schedule = {
-            "nested": {
-                "path": "_planning_schedule",
-                "query": {"bool": {"filter": query_range}},
-            }
-        }
+        planning_schedule = schedule_range("_planning_schedule", query_range["range"][field_name])
 
         if strtobool(params.get("include_scheduled_updates", False)):
-            updates_range = {"range": {"_updates_schedule.scheduled": deepcopy(query_range["range"][field_name])}}
-
             query.filter.append(
                 elastic.bool_or(
                     [
                         planning_schedule,
-                        {
-                            "nested": {
-                                "path": "_updates_schedule",
-                                "query": {"bool": {"filter": updates_range}},
-                            }
-                        },
+                        schedule_range("_updates_schedule", deepcopy(query_range["range"][field_name])),
                     ]
                 )
             )
@@ -206,7 +237,8 @@ def search_date(params: Dict[str, Any], query: elastic.ElasticQuery):
                 elastic.ElasticRangeParams(field=field_name, gte="now/d", time_zone=time_zone)
             )
         else:
-            query.filter.append(planning_schedule)
+            if not search_schedule_days(params, query):
+                query.filter.append(planning_schedule)
             query.extra["sort_filter"] = query_range
 
 
@@ -224,14 +256,7 @@ def search_date_default(params: Dict[str, Any], query: elastic.ElasticQuery):
             )
         )
 
-        query.filter.append(
-            {
-                "nested": {
-                    "path": "_planning_schedule",
-                    "query": {"bool": {"filter": query_range}},
-                }
-            }
-        )
+        query.filter.append(schedule_range("_planning_schedule", query_range["range"][field_name]))
 
 
 def search_dates(params: Dict[str, Any], query: elastic.ElasticQuery):
@@ -248,7 +273,10 @@ def set_search_sort(params: Dict[str, Any], query: elastic.ElasticQuery):
     field = get_sort_field(params, "schedule")
     order = get_sort_order(params, "ascending")
 
-    if field == "schedule":
+    if field == "schedule" and not query.extra.get("sort_filter") and get_schedule_range_search_enabled():
+        # Without a filter, the nested sort uses the first (or last if descending) scheduled date
+        query.sort.append({"_planning_schedule_min" if order == "asc" else "_planning_schedule_max": {"order": order}})
+    elif field == "schedule":
         query.sort.append(
             {
                 "_planning_schedule.scheduled": {
@@ -0,0 +1,144 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Planning Search - Cache of search queries built from saved filters
+
+Building the query of a saved filter runs every search filter function for the repo. As the same filters are
+polled by many users, the built queries are kept in an in-process LRU cache, keyed by the repo, the filter
+(along with its ``_etag``, so changes made in other processes are picked up), the request params,
+the time zone and current date (used by relative date ranges), and the user the items are restricted to.
+
+Same as the search result cache, the number of hits and misses is logged every ``STATS_LOG_INTERVAL`` lookups.
+"""
+
+from typing import Dict, Any, Optional, Tuple, Callable
+from collections import OrderedDict
+from copy import deepcopy
+import json
+import logging
+import threading
+import pytz
+
+from flask import current_app as app
+from eve.utils import config
+
+from superdesk.utc import utcnow
+from superdesk.users.services import current_user_has_privilege
+from apps.auth import get_user_id
+
+from planning.common import get_search_query_cache_size
+from .queries.common import strtobool
+from .result_cache import STATS_LOG_INTERVAL
+
+#: Request params that do not change the query
+IGNORED_PARAMS = ("page", "max_results", "projections", "enrichment", "point_in_time", "pit_id", "search_after")
+
+_cache = OrderedDict()  # type: OrderedDict[Tuple[Any, ...], Tuple[Dict[str, Any], Dict[str, Any]]]
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_key(repo: str, params: Dict[str, Any], search_filter: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Returns the cache key for the query, or ``None`` if the query cannot be cached"""
+
+    if not search_filter.get(config.ID_FIELD):
+        return None
+
+    for query_params in (params, search_filter.get("params") or {}):
+        # The locked items are searched for when building the query, so it depends on the data
+        if query_params.get("lock_state") and not strtobool(query_params.get("directly_locked", False)):
+            return None
+
+    user_id = get_user_id(required=False)
+    restricted_user = str(user_id) if user_id and not current_user_has_privilege("planning_global_filters") else None
+    now = utcnow()
+
+    return (
+        repo,
+        str(search_filter[config.ID_FIELD]),
+        search_filter.get(config.ETAG),
+        json.dumps(
+            {key: value for key, value in params.items() if key not in IGNORED_PARAMS}, sort_keys=True, default=str
+        ),
+        params.get("time_zone") or app.config.get("DEFAULT_TIMEZONE"),
+        now.date().isoformat(),
+        # The ``_schedule_days`` searched are based on the current date in the default time zone
+        now.astimezone(pytz.timezone(app.config["DEFAULT_TIMEZONE"])).date().isoformat(),
+        restricted_user,
+    )
+
+
+def get_cached_query(
+    repo: str,
+    params: Dict[str, Any],
+    search_filter: Dict[str, Any],
+    build_query: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Returns the query from the cache, building and storing it if not already cached
+
+    Building the query also sets params used later in the request (such as ``exclude_dates``),
+    so these are stored with the query and applied to the ``params`` provided when the cache is used.
+    """
+
+    max_size = get_search_query_cache_size()
+    key = get_cache_key(repo, params, search_filter) if max_size else None
+    if key is None:
+        return build_query()
+
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+        log_stats = (_stats["hits"] + _stats["misses"]) % STATS_LOG_INTERVAL == 0
+
+    if log_stats:
+        logger.info("planning:search: Query cache stats {}".format(get_query_cache_info()))
+
+    if cached is not None:
+        query, param_updates = cached
+        for name, value in param_updates.items():
+            params[name] = value
+        return deepcopy(query)
+
+    original_params = dict(params)
+    query = build_query()
+    param_updates = {name: value for name, value in params.items() if original_params.get(name) != value}
+
+    with _lock:
+        _cache[key] = (deepcopy(query), param_updates)
+        while len(_cache) > max_size:
+            _cache.popitem(last=False)
+
+    return query
+
+
+def invalidate_search_filter(filter_id: Any):
+    """Remove the cached queries of the provided filter"""
+
+    filter_id = str(filter_id)
+    with _lock:
+        for key in [key for key in _cache if key[1] == filter_id]:
+            _cache.pop(key, None)
+
+
+def clear_query_cache():
+    with _lock:
+        _cache.clear()
+        _stats["hits"] = _stats["misses"] = 0
+
+
+def get_query_cache_info() -> Dict[str, int]:
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_cache)}
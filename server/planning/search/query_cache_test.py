@@ -0,0 +1,83 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from unittest import mock
+
+from planning.tests import TestCase
+
+from .query_cache import get_cached_query, invalidate_search_filter, clear_query_cache, get_query_cache_info
+
+
+class SearchQueryCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        clear_query_cache()
+        self.builds = 0
+
+    def build_query(self, params):
+        self.builds += 1
+        params["exclude_dates"] = True
+        return {"query": {"bool": {"must": [{"term": {"calendars.qcode": "sport"}}]}}}
+
+    def get_query(self, params, search_filter):
+        return get_cached_query("events", params, search_filter, lambda: self.build_query(params))
+
+    def test_query_is_cached_per_filter_version(self):
+        with self.app.app_context():
+            search_filter = {"_id": "filter1", "_etag": "etag1", "params": {"calendars": ["sport"]}}
+
+            first = self.get_query({"max_results": 25}, search_filter)
+            params = {"max_results": 50, "page": 2}
+            second = self.get_query(params, search_filter)
+
+            self.assertEqual(self.builds, 1)
+            self.assertEqual(first, second)
+            self.assertTrue(params["exclude_dates"])
+            self.assertEqual(get_query_cache_info(), {"hits": 1, "misses": 1, "size": 1})
+
+            # Modifying the returned query does not modify the cached query
+            second["query"]["bool"]["must"].append({"term": {"state": "draft"}})
+            self.assertEqual(len(self.get_query({}, search_filter)["query"]["bool"]["must"]), 1)
+
+            # A new version of the filter or different params builds a new query
+            self.get_query({}, dict(search_filter, _etag="etag2"))
+            self.get_query({"time_zone": "Europe/Prague"}, search_filter)
+            self.assertEqual(self.builds, 3)
+
+    @mock.patch("planning.search.query_cache.STATS_LOG_INTERVAL", 2)
+    @mock.patch("planning.search.query_cache.logger")
+    def test_stats_are_logged(self, logger):
+        with self.app.app_context():
+            search_filter = {"_id": "filter1", "_etag": "etag1", "params": {"calendars": ["sport"]}}
+
+            self.get_query({}, search_filter)
+            logger.info.assert_not_called()
+
+            self.get_query({}, search_filter)
+            logger.info.assert_called_once_with(
+                "planning:search: Query cache stats {}".format({"hits": 1, "misses": 1, "size": 1})
+            )
+
+    def test_invalidate_search_filter(self):
+        with self.app.app_context():
+            search_filter = {"_id": "filter1", "_etag": "etag1", "params": {"calendars": ["sport"]}}
+            self.get_query({}, search_filter)
+            invalidate_search_filter("filter1")
+            self.get_query({}, search_filter)
+
+            self.assertEqual(self.builds, 2)
+
+    def test_queries_without_filter_are_not_cached(self):
+        with self.app.app_context():
+            self.get_query({}, {"params": {}})
+            self.get_query({}, {"params": {}})
+
+            self.assertEqual(self.builds, 2)
+            self.assertEqual(get_query_cache_info()["size"], 0)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Planning Search - Short lived cache of search results
+
+The Events & Planning lists are refreshed by every client whenever an ``events:*`` or ``planning:*``
+notification is received, so the same searches are sent to Elastic by many users at the same time.
+
+When ``PLANNING_SEARCH_RESULT_CACHE_TTL`` is set, the raw Elastic response is stored in the Superdesk cache
+(Redis if ``CACHE_URL`` is configured, otherwise in-process), keyed by the final Elastic body, the resources
+searched and the request params (such as projections). Documents are still formatted and passed
+through the ``on_fetched`` hooks on every request.
+
+The cache keys include a generation, which is renewed whenever an Event, Planning item or Assignment
+is written through the API (the same requests that send the notifications). Changes made outside of a
+request (such as ingest or expiry jobs) are picked up once the entries expire.
+
+The number of hits and misses of the process is logged every ``STATS_LOG_INTERVAL`` lookups.
+"""
+
+from typing import Dict, Any, List, Callable
+from uuid import uuid4
+import hashlib
+import logging
+import threading
+
+from flask import json, current_app as app
+
+from superdesk.cache import cache
+
+from planning.common import get_search_result_cache_ttl
+
+#: Resources that modify the search results when written
+WATCHED_RESOURCES = ("events", "planning", "assignments")
+
+GENERATION_KEY = "planning_search_results:generation"
+
+#: Number of lookups between logging the cache stats
+STATS_LOG_INTERVAL = 1000
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _get_generation() -> str:
+    generation = cache.backend.load(GENERATION_KEY)
+    if generation is None:
+        generation = invalidate_search_results()
+    return generation
+
+
+def get_cache_key(query: Dict[str, Any], types: List[str], params: Dict[str, Any]) -> str:
+    body = json.dumps({"query": query, "types": types, "params": params}, sort_keys=True, default=str)
+    return "planning_search_results:{}:{}".format(_get_generation(), hashlib.sha1(body.encode("utf-8")).hexdigest())
+
+
+def get_cached_result(
+    query: Dict[str, Any],
+    types: List[str],
+    params: Dict[str, Any],
+    search: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Returns the Elastic response from the cache, running the search and storing its response if not cached"""
+
+    ttl = get_search_result_cache_ttl()
+    if not ttl:
+        return search()
+
+    key = get_cache_key(query, types, params)
+
+    # Stored as a JSON string, so the Superdesk cache does not convert string values to dates or ObjectIds
+    cached = cache.backend.load(key)
+    with _lock:
+        _stats["hits" if cached is not None else "misses"] += 1
+        log_stats = (_stats["hits"] + _stats["misses"]) % STATS_LOG_INTERVAL == 0
+
+    if log_stats:
+        logger.info("planning:search: Result cache stats {}".format(get_result_cache_info()))
+
+    if cached is not None:
+        return json.loads(cached)
+
+    hits = search()
+    cache.backend.save({key: json.dumps(hits)}, ttl=ttl)
+    return hits
+
+
+def invalidate_search_results() -> str:
+    """Start a new generation of cached results, returning its ID
+
+    Entries of the previous generation are no longer used, and are removed once they expire.
+    """
+
+    generation = uuid4().hex
+    cache.backend.save({GENERATION_KEY: generation}, ttl=None)
+    return generation
+
+
+def on_resource_changed(resource: str, *args, **kwargs):
+    """Eve signal handler used to invalidate the cached results when an item is written"""
+
+    if not get_search_result_cache_ttl():
+        return
+
+    datasource = (app.config["DOMAIN"].get(resource) or {}).get("datasource") or {}
+    if (datasource.get("source") or resource) in WATCHED_RESOURCES:
+        invalidate_search_results()
+
+
+def clear_result_cache_info():
+    with _lock:
+        _stats["hits"] = _stats["misses"] = 0
+
+
+def get_result_cache_info() -> Dict[str, Any]:
+    with _lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "hit_rate": _stats["hits"] / total if total else 0.0,
+        }
@@ -0,0 +1,82 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+from unittest import mock
+
+from planning.tests import TestCase
+
+from .result_cache import get_cached_result, on_resource_changed, clear_result_cache_info, get_result_cache_info
+
+
+class SearchResultCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.config["PLANNING_SEARCH_RESULT_CACHE_TTL"] = 60
+        clear_result_cache_info()
+        self.searches = 0
+
+    def search(self):
+        self.searches += 1
+        return {"hits": {"total": 1, "hits": [{"_id": "event1", "_source": {"type": "event"}}]}}
+
+    def get_result(self, query, params=None):
+        return get_cached_result(query, ["events", "planning"], params or {}, self.search)
+
+    def test_results_are_cached_per_query(self):
+        with self.app.app_context():
+            query = {"query": {"bool": {"must": [{"term": {"type": "event"}}]}}}
+
+            first = self.get_result(query)
+            second = self.get_result(query)
+            self.assertEqual(self.searches, 1)
+            self.assertEqual(first, second)
+            self.assertEqual(get_result_cache_info(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+            # A different query or projection runs a new search
+            self.get_result({"query": {"bool": {"must": [{"term": {"type": "planning"}}]}}})
+            self.get_result(query, {"_source": "_id,type"})
+            self.assertEqual(self.searches, 3)
+
+    @mock.patch("planning.search.result_cache.STATS_LOG_INTERVAL", 2)
+    @mock.patch("planning.search.result_cache.logger")
+    def test_stats_are_logged(self, logger):
+        with self.app.app_context():
+            query = {"query": {"bool": {"must": []}}}
+
+            self.get_result(query)
+            logger.info.assert_not_called()
+
+            self.get_result(query)
+            logger.info.assert_called_once_with(
+                "planning:search: Result cache stats {}".format({"hits": 1, "misses": 1, "hit_rate": 0.5})
+            )
+
+    def test_results_are_invalidated_on_item_changes(self):
+        with self.app.app_context():
+            query = {"query": {"bool": {"must": []}}}
+
+            self.get_result(query)
+            on_resource_changed("users", {}, {})
+            self.get_result(query)
+            self.assertEqual(self.searches, 1)
+
+            # Changes made through action endpoints of the Events & Planning resources also invalidate the cache
+            on_resource_changed("events_lock", [{"_id": "event1"}])
+            self.get_result(query)
+            self.assertEqual(self.searches, 2)
+
+    def test_cache_disabled(self):
+        with self.app.app_context():
+            self.app.config["PLANNING_SEARCH_RESULT_CACHE_TTL"] = 0
+            self.get_result({})
+            self.get_result({})
+
+            self.assertEqual(self.searches, 2)
+            self.assertEqual(get_result_cache_info()["hits"], 0)
@@ -0,0 +1,22 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+"""Superdesk Planning - Benchmarks
+
+Development benchmarks comparing the current implementation against the previous one.
+These run against the test database, and are skipped unless ``PLANNING_BENCHMARKS`` is set::
+
+    $ PLANNING_BENCHMARKS=1 pytest --log-cli-level=INFO server/planning/tests/benchmarks
+"""
+
+import os
+from unittest import skipUnless
+
+benchmark = skipUnless(os.environ.get("PLANNING_BENCHMARKS"), "Set PLANNING_BENCHMARKS=1 to run the benchmarks")
@@ -0,0 +1,114 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+import copy
+import logging
+import timeit
+from datetime import timedelta
+
+from superdesk.metadata.item import GUID_NEWSML
+from superdesk.metadata.utils import generate_guid
+from superdesk.utc import utcnow
+
+from planning.tests import TestCase
+from planning.events.events import generate_recurring_events, generate_recurring_dates, set_planning_schedule
+
+from . import benchmark
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_recurring_events_with_deepcopy(event, count):
+    """The previous implementation of ``generate_recurring_events``, used as the baseline"""
+
+    generated_events = []
+    time_delta = event["dates"]["end"] - event["dates"]["start"]
+    recurrence_id = None
+    for date in generate_recurring_dates(start=event["dates"]["start"], frequency="DAILY", count=count):
+        new_event = copy.deepcopy(event)
+        for key in list(new_event.keys()):
+            if key.startswith("_") or key.startswith("lock_"):
+                new_event.pop(key)
+        new_event.pop("pubstatus", None)
+        new_event.pop("reschedule_from", None)
+        new_event["dates"]["start"] = date
+        new_event["dates"]["end"] = date + time_delta
+        new_event["guid"] = generate_guid(type=GUID_NEWSML)
+        new_event["_id"] = new_event["guid"]
+        recurrence_id = recurrence_id or new_event["guid"]
+        new_event["recurrence_id"] = recurrence_id
+        set_planning_schedule(new_event)
+        generated_events.append(new_event)
+
+    return generated_events
+
+
+#: The series lengths to benchmark
+LENGTHS = [10, 50, 100, 200, 500, 1000]
+
+#: The number of times to generate each series
+REPEAT = 10
+
+
+class RecurringEventsBenchmarkTestCase(TestCase):
+    """Benchmark generating a series of recurring Events, for different lengths of the series
+
+    Compares the current implementation of ``generate_recurring_events`` against copying
+    the entire Event for each occurrence in the series.
+    """
+
+    @benchmark
+    def test_generate_recurring_events(self):
+        logger.info("{:>8} {:>14} {:>14} {:>8}".format("length", "deepcopy (ms)", "template (ms)", "speedup"))
+
+        for length in LENGTHS:
+            with self.app.app_context():
+                self.app.config["MAX_RECURRENT_EVENTS"] = length
+                event = self._get_event(length)
+
+                baseline = timeit.timeit(lambda: _generate_recurring_events_with_deepcopy(event, length), number=REPEAT)
+                current = timeit.timeit(lambda: generate_recurring_events(copy.deepcopy(event)), number=REPEAT)
+
+            logger.info(
+                "{:>8} {:>14.2f} {:>14.2f} {:>7.1f}x".format(
+                    length,
+                    baseline * 1000 / REPEAT,
+                    current * 1000 / REPEAT,
+                    baseline / current if current else 0,
+                )
+            )
+
+    @staticmethod
+    def _get_event(length):
+        start = utcnow().replace(microsecond=0)
+        return {
+            "name": "Benchmark Event",
+            "slugline": "benchmark",
+            "definition_short": "Benchmark description " * 20,
+            "calendars": [{"qcode": "sport", "name": "Sport"}],
+            "subject": [{"qcode": "15000000", "name": "sport", "scheme": None} for _ in range(10)],
+            "location": [{"name": "Sydney", "address": {"country": "Australia", "line": ["Line 1"]}}],
+            "event_contact_info": ["contact_{}".format(i) for i in range(5)],
+            "dates": {
+                "start": start,
+                "end": start + timedelta(hours=1),
+                "tz": "UTC",
+                "recurring_rule": {
+                    "frequency": "DAILY",
+                    "interval": 1,
+                    "endRepeatMode": "count",
+                    "count": length,
+                },
+            },
+            "state": "draft",
+            "lock_user": "user",
+            "lock_session": "session",
+            "_planning_schedule": [{"scheduled": start}],
+        }
@@ -0,0 +1,119 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+import logging
+import timeit
+from datetime import timedelta
+
+from superdesk import get_resource_service
+from superdesk.utc import utcnow
+
+from planning.tests import TestCase
+from planning.common import WORKFLOW_STATE, get_max_recurrent_events
+from planning.bulk import get_collection
+
+from . import benchmark
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_RECURRENCE_ID = "planning-benchmark-recurring-timeline"
+
+
+def _get_recurring_timeline_paged(service, selected):
+    """The previous implementation of ``get_recurring_timeline``, used as the baseline
+
+    Pages through the entire series, splitting it into historic/past/future in Python
+    """
+
+    query = {
+        "$and": [
+            {"recurrence_id": selected["recurrence_id"]},
+            {"_id": {"$ne": selected["_id"]}},
+            {
+                "state": {
+                    "$nin": [
+                        WORKFLOW_STATE.SPIKED,
+                        WORKFLOW_STATE.RESCHEDULED,
+                        WORKFLOW_STATE.CANCELLED,
+                        WORKFLOW_STATE.POSTPONED,
+                    ]
+                }
+            },
+        ]
+    }
+    now = utcnow()
+    historic, past, future = [], [], []
+
+    for event in service.get_series(query, '[("dates.start", 1)]', get_max_recurrent_events()):
+        if event["dates"]["end"] < now:
+            historic.append(event)
+        elif event["dates"]["start"] < selected["dates"]["start"]:
+            past.append(event)
+        elif event["dates"]["start"] > selected["dates"]["start"]:
+            future.append(event)
+
+    return historic, past, future
+
+
+#: The number of Events in the series
+LENGTH = 1000
+
+#: The number of times to load each timeline
+REPEAT = 10
+
+
+class RecurringTimelineBenchmarkTestCase(TestCase):
+    """Benchmark loading the timeline of a series of recurring Events
+
+    Compares paging through the entire series against the indexed timeline query,
+    for the entire timeline as well as only the future Events.
+    """
+
+    @benchmark
+    def test_get_recurring_timeline(self):
+        with self.app.app_context():
+            service = get_resource_service("events_post")
+            events = self._get_events(LENGTH)
+            selected = events[LENGTH // 2]
+            get_collection("events").insert_many(events)
+
+            baseline = timeit.timeit(lambda: _get_recurring_timeline_paged(service, selected), number=REPEAT)
+            full = timeit.timeit(lambda: service.get_recurring_timeline(selected), number=REPEAT)
+            future = timeit.timeit(
+                lambda: service.get_recurring_timeline(
+                    selected, slices=["future"], projection={"name": 1, "pubstatus": 1}
+                ),
+                number=REPEAT,
+            )
+
+        logger.info("{:>24} {:>12}".format("timeline", "time (ms)"))
+        logger.info("{:>24} {:>12.2f}".format("paged (baseline)", baseline * 1000 / REPEAT))
+        logger.info("{:>24} {:>12.2f}".format("indexed", full * 1000 / REPEAT))
+        logger.info("{:>24} {:>12.2f}".format("indexed, future only", future * 1000 / REPEAT))
+
+    @staticmethod
+    def _get_events(length):
+        # Half of the series is in the past, the other half in the future
+        start = utcnow().replace(microsecond=0) - timedelta(days=length // 2)
+        return [
+            {
+                "_id": "{}-{}".format(BENCHMARK_RECURRENCE_ID, index),
+                "guid": "{}-{}".format(BENCHMARK_RECURRENCE_ID, index),
+                "recurrence_id": BENCHMARK_RECURRENCE_ID,
+                "name": "Benchmark Event",
+                "state": WORKFLOW_STATE.DRAFT,
+                "dates": {
+                    "start": start + timedelta(days=index),
+                    "end": start + timedelta(days=index, hours=1),
+                    "tz": "UTC",
+                },
+            }
+            for index in range(length)
+        ]
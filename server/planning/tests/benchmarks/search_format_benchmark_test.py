@@ -0,0 +1,122 @@
+# -*- coding: utf-8; -*-
+#
+# This file is part of Superdesk.
+#
+# Copyright 2024 Sourcefabric z.u. and contributors.
+#
+# For the full copyright and license information, please see the
+# AUTHORS and LICENSE files distributed with this source code, or
+# at https://www.sourcefabric.org/superdesk/license
+
+import logging
+import timeit
+from copy import deepcopy
+from datetime import timedelta
+
+from eve_elastic.elastic import parse_date
+from superdesk import get_resource_service
+from superdesk.utc import utcnow
+
+from planning.tests import TestCase
+
+from . import benchmark
+
+logger = logging.getLogger(__name__)
+
+ELASTIC_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S+0000"
+
+
+def _format_docs_per_field(service, docs):
+    """The previous implementation of ``PlanningSearchService._format_docs``, used as the baseline
+
+    Computes the date fields from the schema on every call, and parses each date field by field
+    """
+
+    date_fields = {}
+
+    for doc in docs:
+        resource = "events" if doc["type"] == "event" else doc["type"]
+
+        if not date_fields.get(resource):
+            date_fields[resource] = service._get_date_fields(resource)
+
+        for field in date_fields[resource]:
+            if isinstance(doc.get(field), str):
+                doc[field] = parse_date(doc[field])
+
+        if resource == "events" and doc.get("dates"):
+            if doc["dates"].get("start"):
+                doc["dates"]["start"] = parse_date(doc["dates"]["start"])
+            if doc["dates"].get("end"):
+                doc["dates"]["end"] = parse_date(doc["dates"]["end"])
+            if (doc["dates"].get("recurring_rule") or {}).get("until"):
+                doc["dates"]["recurring_rule"]["until"] = parse_date(doc["dates"]["recurring_rule"]["until"])
+
+
+#: The number of items in each page of results
+SIZE = 200
+
+#: The number of times to format each page of results
+REPEAT = 20
+
+
+class SearchFormatBenchmarkTestCase(TestCase):
+    """Benchmark formatting the dates of Events & Planning search results
+
+    Generates search results (as returned from Elastic), and compares parsing their dates field by field
+    against the precomputed date paths and batch parser used by ``planning_search``.
+    """
+
+    @benchmark
+    def test_format_docs(self):
+        with self.app.app_context():
+            service = get_resource_service("planning_search")
+            docs = self._get_docs(SIZE)
+
+            # Formatting modifies the docs in place, so each run formats its own copy
+            baseline_pages = [deepcopy(docs) for _ in range(REPEAT)]
+            batch_pages = [deepcopy(docs) for _ in range(REPEAT)]
+
+            baseline = timeit.timeit(lambda: _format_docs_per_field(service, baseline_pages.pop()), number=REPEAT)
+            batch = timeit.timeit(lambda: service._format_docs(batch_pages.pop()), number=REPEAT)
+
+        logger.info("{:>24} {:>12}".format("format", "time (ms)"))
+        logger.info("{:>24} {:>12.2f}".format("per field (baseline)", baseline * 1000 / REPEAT))
+        logger.info("{:>24} {:>12.2f}".format("date paths", batch * 1000 / REPEAT))
+
+    @staticmethod
+    def _get_docs(size):
+        # Half of the results are Events of a daily series, the other half are their Planning items
+        start = utcnow().replace(microsecond=0)
+        updated = start.strftime(ELASTIC_DATE_FORMAT)
+        until = (start + timedelta(days=size)).strftime(ELASTIC_DATE_FORMAT)
+        docs = []
+
+        for index in range(size // 2):
+            event_start = start + timedelta(days=index)
+            docs.append(
+                {
+                    "_id": "event{}".format(index),
+                    "type": "event",
+                    "_created": updated,
+                    "_updated": updated,
+                    "dates": {
+                        "start": event_start.strftime(ELASTIC_DATE_FORMAT),
+                        "end": (event_start + timedelta(hours=1)).strftime(ELASTIC_DATE_FORMAT),
+                        "tz": "UTC",
+                        "recurring_rule": {"frequency": "DAILY", "interval": 1, "until": until},
+                    },
+                }
+            )
+            docs.append(
+                {
+                    "_id": "plan{}".format(index),
+                    "type": "planning",
+                    "_created": updated,
+                    "_updated": updated,
+                    "planning_date": event_start.strftime(ELASTIC_DATE_FORMAT),
+                    "event_item": "event{}".format(index),
+                }
+            )
+
+        return docs
@@ -118,9 +118,12 @@ class PlanningValidateResource(Resource):
 
 class PlanningValidateService(Service):
     def create(self, docs, **kwargs):
+        # Validating a series of items will use the same validator for each item,
+        # so only load it once per item type for this request
+        validators = {}
         for doc in docs:
             test_doc = deepcopy(doc)
-            doc["errors"] = self._validate(test_doc)
+            doc["errors"] = self._validate(test_doc, validators)
 
         return [doc["errors"] for doc in docs]
 
@@ -141,8 +144,13 @@ class PlanningValidateService(Service):
             and field_schema.get("validate_on_post", False) == validate_on_post
         }
 
-    def _validate(self, doc):
-        validator = self._get_validator(doc)
+    def _validate(self, doc, validators=None):
+        if validators is None:
+            validator = self._get_validator(doc)
+        else:
+            if doc[ITEM_TYPE] not in validators:
+                validators[doc[ITEM_TYPE]] = self._get_validator(doc)
+            validator = validators[doc[ITEM_TYPE]]
 
         if validator is None:
             logger.warn("Validator was not found for type:{}".format(doc[ITEM_TYPE]))
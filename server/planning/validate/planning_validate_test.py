@@ -105,3 +105,31 @@ class PlanningValidateServiceTest(TestCase):
             )[0]
 
             self.assertEqual(errors, [])
+
+    def test_validate_multiple_items(self):
+        with self.app.app_context():
+            self.app.data.insert(
+                "planning_types",
+                [
+                    {
+                        "_id": "event",
+                        "name": "event",
+                        "schema": {
+                            "slugline": {
+                                "type": "string",
+                                "required": True,
+                                "validate_on_post": True,
+                            },
+                        },
+                    }
+                ],
+            )
+
+            errors = get_resource_service("planning_validator").post(
+                [
+                    {"validate_on_post": True, "type": "event", "validate": {"slugline": "Test slugger"}},
+                    {"validate_on_post": True, "type": "event", "validate": {"name": "Test Event"}},
+                ]
+            )
+
+            self.assertEqual(errors, [[], ["SLUGLINE is a required field"]])
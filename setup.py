@@ -25,7 +25,7 @@ setup(
     author="Edouard Richard",
     author_email="edouard.richard@sourcefabric.org",
     license="AGPLv3",
-    install_requires=["icalendar>=4.0.3,<5.1", "deepdiff"],
+    install_requires=["icalendar>=4.0.3,<5.1", "deepdiff", "ciso8601>=2.1,<3", "arrow"],
     url="https://github.com/superdesk/superdesk-planning",
     classifiers=[
         "Development Status :: 5 - Production/Stable",